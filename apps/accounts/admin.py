@@ -1,13 +1,20 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import User, GuestProfile, DriverProfile, Car, CarImage
+from .models import User, GuestProfile, DriverProfile, Car, CarImage, ImageBlob, OutgoingEmail, DriverLocation
 from django.contrib.auth.models import Group
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from .pagination import EstimatedCountPaginator
+
+
+class EstimatedCountAdminMixin:
+    """Большие таблицы: приблизительное количество строк вместо COUNT(*) на каждой странице"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(EstimatedCountAdminMixin, BaseUserAdmin):
     list_display = [
         'email',
         'full_name',
@@ -104,6 +111,7 @@ class GuestProfileAdmin(admin.ModelAdmin):
         'has_avatar',
         'created_at'
     ]
+    list_select_related = ['user']
     search_fields = [
         'user__email',
         'user__first_name',
@@ -168,6 +176,7 @@ class CarAdmin(admin.ModelAdmin):
         'is_active_badge',
         'has_images_badge'
     ]
+    list_select_related = ['driver__user']
     search_fields = [
         'driver__user__email',
         'marka',
@@ -220,8 +229,11 @@ class CarAdmin(admin.ModelAdmin):
 
     is_active_badge.short_description = 'Статус'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_image_stats()
+
     def has_images_badge(self, obj):
-        count = obj.images.count()
+        count = obj.images_count
         if count > 0:
             return format_html(
                 '<span style="color: green;">✓ ({} шт.)</span>',
@@ -230,6 +242,7 @@ class CarAdmin(admin.ModelAdmin):
         return format_html('<span style="color: red;">✗ Нет</span>')
 
     has_images_badge.short_description = 'Фото'
+    has_images_badge.admin_order_field = 'images_count'
 
 
 @admin.register(DriverProfile)
@@ -243,6 +256,7 @@ class DriverProfileAdmin(admin.ModelAdmin):
         'verified_badge',
         'has_car_badge'
     ]
+    list_select_related = ['user', 'car']
     search_fields = [
         'user__email',
         'user__first_name',
@@ -255,7 +269,13 @@ class DriverProfileAdmin(admin.ModelAdmin):
         'experience_years',
         'created_at'
     ]
-    readonly_fields = ['created_at', 'updated_at', 'rating']
+    readonly_fields = [
+        'created_at',
+        'updated_at',
+        'rating',
+        'rating_count',
+        'rating_ewma'
+    ]
     date_hierarchy = 'created_at'
 
     fieldsets = (
@@ -274,7 +294,7 @@ class DriverProfileAdmin(admin.ModelAdmin):
             )
         }),
         ('Статистика', {
-            'fields': ('rating', 'total_trips', 'verified_driver')
+            'fields': ('rating', 'rating_count', 'rating_ewma', 'total_trips', 'verified_driver')
         }),
         ('Временные метки', {
             'fields': ('created_at', 'updated_at'),
@@ -326,7 +346,7 @@ class DriverProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(CarImage)
-class CarImageAdmin(admin.ModelAdmin):
+class CarImageAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = [
         'id',
         'car_info',
@@ -335,6 +355,7 @@ class CarImageAdmin(admin.ModelAdmin):
         'order',
         'created_at'
     ]
+    list_select_related = ['car']
     list_filter = ['is_primary', 'created_at']
     readonly_fields = ['created_at', 'image_preview']
     date_hierarchy = 'created_at'
@@ -374,6 +395,67 @@ class CarImageAdmin(admin.ModelAdmin):
 
     is_primary_badge.short_description = 'Тип'
 
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'subject',
+        'recipients',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'sent_at'
+    ]
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'to']
+    readonly_fields = [
+        'subject',
+        'body',
+        'from_email',
+        'to',
+        'attempts',
+        'last_error',
+        'locked_at',
+        'created_at',
+        'sent_at'
+    ]
+    date_hierarchy = 'created_at'
+
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+
+    recipients.short_description = 'Получатели'
+
+
+@admin.register(DriverLocation)
+class DriverLocationAdmin(admin.ModelAdmin):
+    list_display = [
+        'driver',
+        'latitude',
+        'longitude',
+        'speed',
+        'updated_at'
+    ]
+    list_select_related = ['driver__user']
+    search_fields = ['driver__user__email', 'driver__phone_number']
+    readonly_fields = ['updated_at']
+    raw_id_fields = ['driver']
+
+
+@admin.register(ImageBlob)
+class ImageBlobAdmin(admin.ModelAdmin):
+    list_display = [
+        'name',
+        'size',
+        'ref_count',
+        'created_at',
+        'updated_at'
+    ]
+    list_filter = ['created_at']
+    search_fields = ['name', 'sha256']
+    readonly_fields = ['name', 'sha256', 'size', 'ref_count', 'created_at', 'updated_at']
+
 admin.site.unregister(Group)
 admin.site.unregister(OutstandingToken)
 admin.site.unregister(BlacklistedToken)
@@ -0,0 +1,123 @@
+"""
+JWT без запроса пользователя на каждый запрос
+
+В токены записываются claims role, is_verified и profile_id. По ним
+ClaimsJWTAuthentication собирает ClaimsUser без обращения к БД, поэтому
+проверки прав по роли (IsDriver, IsGuest, IsAdmin) работают без запросов.
+Остальные поля пользователя подгружаются лениво, только если они нужны view.
+
+Роль обновляется в токене при обновлении через refresh, т.е. изменение
+вступает в силу не позже ACCESS_TOKEN_LIFETIME. Деактивация и удаление
+пользователя действуют сразу: сигналы помечают его в кэше (revoke_access),
+и уже выданные access-токены отклоняются. Кэш должен быть общим для
+процессов (Redis); с LocMemCache и при queryset.update(is_active=False)
+остаётся окно до истечения access-токена. Удалённый пользователь, которого
+нет в кэше, получает 401 при первой загрузке его полей из БД.
+"""
+from django.core.cache import cache
+from django.db import router
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import ClaimsUser
+from .utils.token_blacklist import blacklist_index
+
+ROLE_CLAIM = 'role'
+IS_VERIFIED_CLAIM = 'is_verified'
+PROFILE_ID_CLAIM = 'profile_id'
+
+REVOKED_KEY = 'auth:revoked:{user_id}'
+
+
+def revoke_access(user_id):
+    """Отклонять уже выданные access-токены пользователя до истечения их срока"""
+    cache.set(
+        REVOKED_KEY.format(user_id=user_id),
+        True,
+        api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    )
+
+
+def restore_access(user_id):
+    cache.delete(REVOKED_KEY.format(user_id=user_id))
+
+
+def is_access_revoked(user_id):
+    return bool(cache.get(REVOKED_KEY.format(user_id=user_id)))
+
+
+def get_profile_id(user):
+    """id профиля водителя или гостя, если он создан"""
+    for related_name in ('driver_profile', 'guest_profile'):
+        profile = getattr(user, related_name, None)
+        if profile is not None:
+            return profile.pk
+    return None
+
+
+class PorterRefreshToken(RefreshToken):
+    """
+    Refresh-токен с claims роли и профиля; access-токен наследует их.
+    Чёрный список проверяется через bloom-фильтр процесса.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.stamp_claims(user)
+        return token
+
+    def stamp_claims(self, user):
+        self[ROLE_CLAIM] = user.role
+        self[IS_VERIFIED_CLAIM] = user.is_verified
+        self[PROFILE_ID_CLAIM] = get_profile_id(user)
+
+    def check_blacklist(self):
+        if blacklist_index.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError('Токен в чёрном списке')
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по access-токену без SELECT пользователя.
+    Для старых токенов без claims пользователь загружается из БД как обычно.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token or IS_VERIFIED_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if is_access_revoked(user_id):
+            raise AuthenticationFailed('Пользователь неактивен или удалён', code='user_inactive')
+
+        known = {
+            api_settings.USER_ID_FIELD: user_id,
+            'role': validated_token[ROLE_CLAIM],
+            'is_verified': validated_token[IS_VERIFIED_CLAIM],
+            # Неактивных отсекает проверка выше, refresh им новых токенов не выдаёт
+            'is_active': True,
+        }
+        field_names = [
+            field.attname for field in ClaimsUser._meta.concrete_fields
+            if field.attname in known
+        ]
+        user = ClaimsUser.from_db(
+            router.db_for_read(ClaimsUser),
+            field_names,
+            [known[name] for name in field_names]
+        )
+        user.profile_id = validated_token.get(PROFILE_ID_CLAIM)
+        return user
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = ClaimsJWTAuthentication
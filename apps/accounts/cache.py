@@ -0,0 +1,107 @@
+"""
+Версионированный кэш сериализованных профилей
+
+У каждого пользователя есть номер версии в кэше. Ключ данных включает
+версию, поэтому инвалидация — это запись новой версии: старые ключи
+просто перестают читаться и вытесняются по таймауту. Работает с любым
+бэкендом Django (LocMemCache локально, Redis в продакшене).
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'profile:version:{user_id}'
+PAYLOAD_KEY = 'profile:{kind}:{user_id}:{version}:{variant}'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record(kind, outcome):
+    with _stats_lock:
+        _stats[(kind, outcome)] += 1
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def get_profile_version(user_id):
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # add не затрёт версию, записанную параллельной инвалидацией
+        version = _new_version()
+        if not cache.add(key, version, settings.PROFILE_CACHE_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump_versions(user_ids):
+    version = _new_version()
+    cache.set_many(
+        {VERSION_KEY.format(user_id=user_id): version for user_id in user_ids},
+        settings.PROFILE_CACHE_VERSION_TIMEOUT
+    )
+
+
+def invalidate_profile(*user_ids):
+    """
+    Сбросить закэшированные данные пользователей. Внутри транзакции версия
+    меняется ещё раз после коммита: чтение до коммита могло закэшировать
+    старые данные.
+    """
+    user_ids = [user_id for user_id in user_ids if user_id is not None]
+    if not user_ids:
+        return
+    _bump_versions(user_ids)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_versions(user_ids))
+
+
+def get_cached_profile(user_id, kind, build, variant=''):
+    """
+    Данные вида kind для пользователя из кэша или из build().
+    variant — то, от чего ещё зависят данные (например, хост в абсолютных URL).
+    Если build() вернул None, результат не кэшируется.
+    """
+    key = PAYLOAD_KEY.format(
+        kind=kind,
+        user_id=user_id,
+        version=get_profile_version(user_id),
+        variant=variant
+    )
+    payload = cache.get(key)
+    if payload is not None:
+        _record(kind, 'hits')
+        return payload
+
+    _record(kind, 'misses')
+    payload = build()
+    if payload is not None:
+        cache.set(key, payload, settings.PROFILE_CACHE_TIMEOUT)
+    return payload
+
+
+def get_profile_cache_stats():
+    """Попадания и промахи кэша в текущем процессе по видам данных"""
+    with _stats_lock:
+        kinds = sorted({kind for kind, _ in _stats})
+        stats = {}
+        for kind in kinds:
+            hits, misses = _stats[(kind, 'hits')], _stats[(kind, 'misses')]
+            stats[kind] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return stats
+
+
+def reset_profile_cache_stats():
+    with _stats_lock:
+        _stats.clear()
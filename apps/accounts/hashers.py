@@ -0,0 +1,58 @@
+"""
+Хешеры паролей с настраиваемой стоимостью
+
+Стоимость берётся из настроек окружения (PASSWORD_*). Django сам
+перехеширует пароль при успешном входе, если сохранённый хеш сделан
+другим алгоритмом или с другой стоимостью (must_update), поэтому смена
+PASSWORD_HASHER или параметров применяется к пользователям постепенно.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # scrypt использует ~128 * n * r * p байт; с запасом, иначе OpenSSL откажет
+        return 2 * 128 * self.work_factor * self.block_size * self.parallelism
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Требует пакет argon2-cffi"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
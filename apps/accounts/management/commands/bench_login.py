@@ -0,0 +1,83 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+PASSWORD = 'benchmark-password-123'
+
+
+def verify_many(algorithm, encoded, count):
+    """Проверить пароль count раз; возвращает затраченное время"""
+    hasher = get_hasher(algorithm)
+    started = time.perf_counter()
+    for _ in range(count):
+        hasher.verify(PASSWORD, encoded)
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк проверки паролей: хешей в секунду на ядро для подбора числа воркеров gunicorn'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher',
+            choices=list(settings.PASSWORD_HASHER_CLASSES),
+            action='append',
+            help='Алгоритм (можно несколько). По умолчанию — PASSWORD_HASHER'
+        )
+        parser.add_argument('--count', type=int, default=20, help='Проверок на процесс')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Процессов для замера на всех ядрах'
+        )
+        parser.add_argument(
+            '--target-rps',
+            type=float,
+            help='Целевое количество входов в секунду'
+        )
+
+    def handle(self, *args, **options):
+        for name in options['hasher'] or [settings.PASSWORD_HASHER]:
+            self.bench(name, options)
+
+    def bench(self, name, options):
+        hasher = import_string(settings.PASSWORD_HASHER_CLASSES[name])()
+        try:
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+        except ValueError as e:
+            # Например, не установлен argon2-cffi
+            raise CommandError(f"{name}: {e}")
+
+        algorithm = hasher.algorithm
+        count = options['count']
+        workers = options['workers']
+
+        single = verify_many(algorithm, encoded, count)
+        per_core = count / single
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            # Прогрев: запуск процессов и django.setup() не входят в замер
+            list(pool.map(verify_many, [algorithm] * workers, [encoded] * workers, [1] * workers))
+            started = time.perf_counter()
+            list(pool.map(verify_many, [algorithm] * workers, [encoded] * workers, [count] * workers))
+            total = workers * count / (time.perf_counter() - started)
+
+        self.stdout.write(f"{name} ({hasher.__class__.__name__})")
+        self.stdout.write(f"  одна проверка: {single / count * 1000:.1f} мс")
+        self.stdout.write(f"  на ядро: {per_core:.1f} хешей/с")
+        self.stdout.write(f"  {workers} процессов: {total:.1f} хешей/с")
+
+        if options['target_rps']:
+            needed = math.ceil(options['target_rps'] / per_core)
+            self.stdout.write(
+                f"  для {options['target_rps']:.0f} входов/с нужно ядер (воркеров gunicorn): {needed}"
+            )
+
@@ -0,0 +1,104 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.utils.geo import DriverSpatialIndex, haversine_km
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк поиска ближайших водителей на синтетических данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drivers', type=int, default=100000, help='Количество водителей')
+        parser.add_argument('--queries', type=int, default=1000, help='Количество запросов')
+        parser.add_argument('--k', type=int, default=5, help='Сколько ближайших искать')
+        parser.add_argument(
+            '--cell-size',
+            type=float,
+            default=settings.DRIVER_INDEX_CELL_SIZE,
+            help='Размер ячейки сетки (градусы)'
+        )
+        parser.add_argument(
+            '--radius',
+            type=float,
+            default=settings.DRIVER_SEARCH_RADIUS_KM,
+            help='Радиус поиска (км)'
+        )
+        parser.add_argument(
+            '--verify',
+            type=int,
+            default=20,
+            help='Сколько запросов сверить с полным перебором'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Прямоугольник вокруг Бишкека
+        lat_min, lat_max, lon_min, lon_max = 42.75, 42.95, 74.45, 74.75
+
+        drivers = [
+            (
+                driver_id,
+                rng.uniform(lat_min, lat_max),
+                rng.uniform(lon_min, lon_max),
+                rng.randint(1, 8),
+                rng.random() > 0.2,
+            )
+            for driver_id in range(1, options['drivers'] + 1)
+        ]
+
+        index = DriverSpatialIndex(cell_size=options['cell_size'])
+        started = time.perf_counter()
+        for driver_id, lat, lon, capacity, available in drivers:
+            index.upsert(driver_id, lat, lon, capacity, available)
+        build_time = time.perf_counter() - started
+
+        queries = [
+            (rng.uniform(lat_min, lat_max), rng.uniform(lon_min, lon_max), rng.randint(1, 4))
+            for _ in range(options['queries'])
+        ]
+
+        timings = []
+        results = []
+        for lat, lon, passengers in queries:
+            started = time.perf_counter()
+            results.append(index.nearest(
+                lat,
+                lon,
+                k=options['k'],
+                min_capacity=passengers,
+                max_distance_km=options['radius'],
+            ))
+            timings.append(time.perf_counter() - started)
+
+        timings.sort()
+        self.stdout.write(f"Водителей: {len(index)}, построение индекса: {build_time:.3f} с")
+        self.stdout.write(
+            f"Запросов: {len(timings)}, "
+            f"среднее: {statistics.mean(timings) * 1000:.3f} мс, "
+            f"p50: {timings[len(timings) // 2] * 1000:.3f} мс, "
+            f"p99: {timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000:.3f} мс"
+        )
+
+        mismatches = 0
+        for (lat, lon, passengers), found in list(zip(queries, results))[:options['verify']]:
+            expected = sorted(
+                (haversine_km(lat, lon, d_lat, d_lon), driver_id)
+                for driver_id, d_lat, d_lon, capacity, available in drivers
+                if available and capacity >= passengers
+            )
+            expected = [
+                (distance, driver_id) for distance, driver_id in expected
+                if distance <= options['radius']
+            ][:options['k']]
+            if [driver_id for _, driver_id in found] != [driver_id for _, driver_id in expected]:
+                mismatches += 1
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"Расхождений с полным перебором: {mismatches}"))
+        elif options['verify']:
+            self.stdout.write(self.style.SUCCESS("Результаты совпадают с полным перебором"))
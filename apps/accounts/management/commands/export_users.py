@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import User
+from apps.accounts.utils.user_io import FORMATS, detect_format, export_columns, iter_export_rows, open_output, write_rows
+
+
+class Command(BaseCommand):
+    help = 'Потоковый экспорт пользователей с профилями и авто в CSV или JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл для записи ('-' — stdout)")
+        parser.add_argument('--format', choices=FORMATS, help='По умолчанию — по расширению файла')
+        parser.add_argument('--role', help='Только пользователи с этой ролью')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Сколько пользователей читать из БД за раз'
+        )
+        parser.add_argument(
+            '--include-password-hashes',
+            action='store_true',
+            help='Выгрузить хеши паролей (для переноса между окружениями)'
+        )
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or detect_format(options['path'])
+        queryset = User.objects.all()
+        if options['role']:
+            queryset = queryset.filter(role=options['role'])
+
+        rows = iter_export_rows(
+            queryset,
+            chunk_size=options['chunk_size'],
+            include_password_hashes=options['include_password_hashes']
+        )
+        started = time.monotonic()
+        stream = open_output(options['path'])
+        try:
+            count = write_rows(rows, stream, fmt, export_columns(options['include_password_hashes']))
+        finally:
+            if options['path'] != '-':
+                stream.close()
+        elapsed = time.monotonic() - started
+
+        rate = count / elapsed if elapsed else 0.0
+        self.stderr.write(f"Выгружено пользователей: {count} за {elapsed:.2f} с ({rate:.0f} строк/с)")
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.management.commands.purge_expired_tokens import positive_int
+from apps.accounts.utils.user_io import FORMATS, UserImporter, detect_format, open_input, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Массовый импорт пользователей с профилями и авто из CSV или JSONL без писем и по одному INSERT на пачку'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл для чтения ('-' — stdin)")
+        parser.add_argument('--format', choices=FORMATS, help='По умолчанию — по расширению файла')
+        parser.add_argument(
+            '--batch-size',
+            type=positive_int,
+            default=1000,
+            help='Строк в одной транзакции'
+        )
+        parser.add_argument(
+            '--hash-workers',
+            type=int,
+            default=0,
+            help='Процессов для хеширования паролей (0 — в текущем процессе)'
+        )
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or detect_format(options['path'])
+        verbose = options['verbosity'] > 1
+
+        def progress(stats, elapsed):
+            if verbose:
+                self.stdout.write(f"  создано {stats['created']} за {elapsed:.1f} с")
+
+        importer = UserImporter(
+            batch_size=options['batch_size'],
+            hash_workers=options['hash_workers'],
+            progress=progress
+        )
+        stream = open_input(options['path'])
+        try:
+            stats, elapsed = importer.run(read_rows(stream, fmt))
+        finally:
+            if options['path'] != '-':
+                stream.close()
+
+        for error in importer.errors:
+            self.stderr.write(error)
+
+        rate = stats['created'] / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f"Создано пользователей: {stats['created']} "
+            f"(водителей: {stats['drivers']}, авто: {stats['cars']}), "
+            f"пропущено существующих: {stats['skipped']}, ошибок: {stats['invalid']} "
+            f"за {elapsed:.2f} с ({rate:.0f} строк/с)"
+        )
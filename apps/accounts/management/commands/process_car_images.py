@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import CarImage
+from apps.accounts.utils.images import process_car_image
+
+
+class Command(BaseCommand):
+    help = 'Создать WebP-производные для изображений автомобилей, у которых их ещё нет'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать производные для всех изображений (после смены CAR_IMAGE_VARIANTS)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = CarImage.objects.order_by('pk')
+        if not options['all']:
+            queryset = queryset.filter(width__isnull=True)
+
+        processed = failed = 0
+        started = time.monotonic()
+        for image_id in queryset.values_list('pk', flat=True).iterator(chunk_size=500):
+            try:
+                process_car_image(image_id)
+                processed += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Изображение {image_id}: {e}")
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"Обработано изображений: {processed}, ошибок: {failed} за {elapsed:.2f} с "
+            f"(варианты: {', '.join(settings.CAR_IMAGE_VARIANTS)})"
+        )
@@ -0,0 +1,65 @@
+import argparse
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.utils.token_cleanup import purge_expired_tokens
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("должно быть не меньше 1")
+    return number
+
+
+class Command(BaseCommand):
+    help = 'Удаление истёкших refresh-токенов пачками по диапазону id'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=positive_int,
+            default=settings.TOKEN_PURGE_BATCH_SIZE,
+            help='Ширина окна id в одной транзакции'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.TOKEN_PURGE_SLEEP,
+            help='Пауза между пачками (сек.)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Запускать очистку периодически'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.TOKEN_PURGE_INTERVAL,
+            help='Пауза между запусками в режиме --loop (сек.)'
+        )
+
+    def handle(self, *args, **options):
+        verbose = options['verbosity'] > 1
+
+        def progress(deleted, elapsed):
+            if verbose:
+                self.stdout.write(f"  удалено {deleted} за {elapsed:.1f} с")
+
+        while True:
+            deleted, elapsed = purge_expired_tokens(
+                batch_size=options['batch_size'],
+                sleep=options['sleep'],
+                progress=progress
+            )
+            rate = deleted / elapsed if elapsed else 0.0
+            self.stdout.write(
+                f"Удалено истёкших токенов: {deleted} за {elapsed:.2f} с ({rate:.0f} строк/с)"
+            )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from apps.accounts.utils.email_queue import process_email_queue
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди OutgoingEmail'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help='Количество писем в одной пачке'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, опрашивая очередь'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_QUEUE_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди (сек.)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        connection = get_connection()
+
+        while True:
+            sent, failed = process_email_queue(batch_size, connection=connection)
+            if sent or failed:
+                self.stdout.write(f"Отправлено: {sent}, ошибок: {failed}")
+
+            if not options['loop']:
+                # Без --loop вычерпываем очередь до конца и выходим
+                if not (sent or failed):
+                    break
+                continue
+
+            if sent + failed < batch_size:
+                time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from apps.accounts.utils.blob_cleanup import sweep_image_blobs
+
+
+class Command(BaseCommand):
+    help = 'Удаление файлов изображений, на которые больше не ссылается ни одна запись'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-period',
+            type=int,
+            default=settings.IMAGE_BLOB_SWEEP_GRACE_PERIOD,
+            help='Не трогать файлы, потерявшие ссылки позже (сек.)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Файлов в одной транзакции'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать, ничего не удалять'
+        )
+
+    def handle(self, *args, **options):
+        verbose = options['verbosity'] > 1
+
+        def progress(deleted, freed, elapsed):
+            if verbose:
+                self.stdout.write(f"  {deleted} файлов, {filesizeformat(freed)} за {elapsed:.1f} с")
+
+        deleted, freed, elapsed = sweep_image_blobs(
+            grace_period=options['grace_period'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            progress=progress
+        )
+        action = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(
+            f"{action} файлов: {deleted}, освобождено {filesizeformat(freed)} за {elapsed:.2f} с"
+        )
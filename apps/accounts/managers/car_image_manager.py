@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.db import models, transaction
+
+
+class CarImageManager(models.Manager):
+    def bulk_upload(self, car, files, primary_index=None):
+        """
+        Добавить несколько фото авто одним INSERT.
+        bulk_create не вызывает save() и сигналы, поэтому счётчик фото,
+        главное фото и ссылки на файлы обновляются здесь.
+        primary_index — какое из новых фото сделать главным.
+        """
+        ImageBlob = apps.get_model('accounts', 'ImageBlob')
+
+        with transaction.atomic(using=self.db):
+            start = car.image_count
+            first = car.reserve_images(len(files))
+            if first:
+                primary_index = primary_index or 0
+
+            images = []
+            for i, file in enumerate(files):
+                image = self.model(car=car, order=start + i, is_primary=first and i == primary_index)
+                image.image.save(file.name, file, save=False)
+                images.append(image)
+            self.bulk_create(images)
+            ImageBlob.retain(*(image.image.name for image in images))
+
+            if primary_index is not None and not first:
+                images[primary_index].set_as_primary()
+        return images
+
+    def reorder(self, car, image_ids):
+        """
+        Задать порядок всех фото авто списком id одним UPDATE.
+        Список должен содержать каждое фото авто ровно один раз.
+        """
+        images = {image.pk: image for image in self.filter(car=car)}
+        if len(image_ids) != len(images) or set(image_ids) != set(images):
+            raise ValueError("Нужно перечислить все фото автомобиля ровно по одному разу")
+
+        changed = []
+        for order, pk in enumerate(image_ids):
+            image = images[pk]
+            if image.order != order:
+                image.order = order
+                changed.append(image)
+        if changed:
+            self.bulk_update(changed, ['order'])
+        return [images[pk] for pk in image_ids]
@@ -0,0 +1,30 @@
+from django.db import models
+from django.db.models import Count, Prefetch
+
+
+class CarQuerySet(models.QuerySet):
+    def _image_model(self):
+        return self.model._meta.get_field('images').related_model
+
+    def with_images(self):
+        """Все фото автомобиля одним дополнительным запросом"""
+        return self.prefetch_related('images')
+
+    def with_primary_image(self):
+        """Главное фото в атрибуте primary_images одним дополнительным запросом"""
+        image_model = self._image_model()
+        return self.prefetch_related(
+            Prefetch(
+                'images',
+                queryset=image_model.objects.filter(is_primary=True),
+                to_attr='primary_images'
+            )
+        )
+
+    def with_image_stats(self):
+        """Количество фото в аннотации images_count"""
+        return self.annotate(images_count=Count('images'))
+
+
+class CarManager(models.Manager.from_queryset(CarQuerySet)):
+    pass
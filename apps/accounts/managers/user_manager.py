@@ -1,4 +1,32 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import BaseUserManager
+from django.db import transaction
+
+
+def _init_hashing_worker():
+    django.setup()
+
+
+def hashing_pool(workers):
+    """Пул процессов для хеширования паролей"""
+    return ProcessPoolExecutor(workers, initializer=_init_hashing_worker)
+
+
+def hash_passwords(passwords, executor=None, workers=1):
+    """
+    Хеши паролей в том же порядке (None — непригодный пароль).
+    С executor хеширование запускается сразу, результат — ленивый итератор.
+    """
+    if executor is None:
+        return map(make_password, passwords)
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return executor.map(make_password, passwords, chunksize=chunksize)
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, first_name, last_name, password=None, **extra_fields):
@@ -21,3 +49,68 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault("is_superuser", True)
         extra_fields.setdefault("is_active", True)
         return self.create_user(email, first_name, last_name, password, **extra_fields)
+
+    def bulk_create_users(self, users, batch_size=1000, workers=None):
+        """
+        Массовое создание пользователей из словарей с полями create_user.
+        Пароли хешируются в пуле из workers процессов (по умолчанию — по числу
+        ядер, 1 — в текущем процессе), пока предыдущая пачка вставляется.
+        Уже существующие email пропускаются: одна проверка IN на пачку.
+        Сигналы post_save не отправляются. Возвращает созданных пользователей.
+        """
+        workers = workers or os.cpu_count() or 1
+        executor = hashing_pool(workers) if workers > 1 else None
+        created = []
+        try:
+            pending = None
+            users = iter(users)
+            while True:
+                batch = list(itertools.islice(users, batch_size))
+                if not batch:
+                    break
+                prepared = self._prepare_batch(batch, executor, workers, pending)
+                if pending is not None:
+                    created += self._insert_batch(*pending)
+                pending = prepared
+            if pending is not None:
+                created += self._insert_batch(*pending)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return created
+
+    def _prepare_batch(self, batch, executor, workers, pending):
+        values = []
+        for data in batch:
+            data = dict(data)
+            if not data.get('email'):
+                raise ValueError("Email обязателен")
+            data['email'] = self.normalize_email(data['email'])
+            values.append(data)
+
+        # Предыдущая пачка ещё не в БД — сверяемся и с ней
+        taken = set(
+            self.filter(email__in=[data['email'] for data in values])
+            .values_list('email', flat=True)
+        )
+        if pending is not None:
+            taken.update(data['email'] for data in pending[0])
+
+        fresh = []
+        for data in values:
+            if data['email'] not in taken:
+                taken.add(data['email'])
+                fresh.append(data)
+
+        passwords = [data.pop('password', None) for data in fresh]
+        return fresh, hash_passwords(passwords, executor, workers)
+
+    def _insert_batch(self, values, hashes):
+        users = [
+            self.model(password=encoded, **data)
+            for data, encoded in zip(values, hashes)
+        ]
+        if not users:
+            return []
+        with transaction.atomic(using=self.db):
+            return self.bulk_create(users)
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['is_active', 'fuel_type', 'max_passengers'], name='accounts_ca_is_acti_1b7e4f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='driverprofile',
+            index=models.Index(fields=['verified_driver', '-rating', '-id'], name='accounts_dr_verifie_c987f6_idx'),
+        ),
+    ]
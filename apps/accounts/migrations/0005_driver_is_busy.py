@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_driver_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driverprofile',
+            name='is_busy',
+            field=models.BooleanField(default=False, verbose_name='Выполняет поездку'),
+        ),
+    ]
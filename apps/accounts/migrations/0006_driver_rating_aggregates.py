@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_driver_is_busy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driverprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='driverprofile',
+            name='rating_ewma',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг с затуханием'),
+        ),
+        migrations.AddField(
+            model_name='driverprofile',
+            name='rating_sum',
+            field=models.FloatField(default=0.0, verbose_name='Сумма оценок'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_claims_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Высота'),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='medium',
+            field=models.ImageField(blank=True, null=True, upload_to='car_images/variants/', verbose_name='Среднее изображение'),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='car_images/variants/', verbose_name='Миниатюра'),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Ширина'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:23
+
+import apps.accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_car_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='carimage',
+            name='image',
+            field=models.ImageField(storage=apps.accounts.storage.image_storage, upload_to='car_images/%Y/%m/%d/', verbose_name='Изображение'),
+        ),
+        migrations.AlterField(
+            model_name='carimage',
+            name='medium',
+            field=models.ImageField(blank=True, null=True, storage=apps.accounts.storage.image_storage, upload_to='car_images/variants/', verbose_name='Среднее изображение'),
+        ),
+        migrations.AlterField(
+            model_name='carimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, storage=apps.accounts.storage.image_storage, upload_to='car_images/variants/', verbose_name='Миниатюра'),
+        ),
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Путь в хранилище')),
+                ('sha256', models.CharField(db_index=True, max_length=64, verbose_name='SHA-256')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Размер (байт)')),
+                ('ref_count', models.IntegerField(default=0, verbose_name='Количество ссылок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения ссылок')),
+            ],
+            options={
+                'verbose_name': 'Файл изображения',
+                'verbose_name_plural': 'Файлы изображений',
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='accounts_im_ref_cou_234a87_idx')],
+            },
+        ),
+    ]
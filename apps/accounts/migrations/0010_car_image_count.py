@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:26
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_image_counts(apps, schema_editor):
+    Car = apps.get_model('accounts', 'Car')
+    CarImage = apps.get_model('accounts', 'CarImage')
+
+    counts = (
+        CarImage.objects
+        .filter(car=OuterRef('pk'))
+        .order_by()
+        .values('car')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Car.objects.update(image_count=Coalesce(Subquery(counts), 0))
+
+    # Перед уникальным индексом оставляем у каждого авто одно главное фото
+    duplicates = (
+        CarImage.objects
+        .filter(is_primary=True)
+        .values('car')
+        .annotate(keep=Min('pk'), primaries=Count('pk'))
+        .filter(primaries__gt=1)
+    )
+    for row in duplicates:
+        CarImage.objects.filter(car_id=row['car'], is_primary=True).exclude(pk=row['keep']).update(
+            is_primary=False
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_image_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество фото'),
+        ),
+        migrations.RunPython(fill_image_counts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='carimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('car',), name='unique_primary_image_per_car'),
+        ),
+    ]
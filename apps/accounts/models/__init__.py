@@ -1,13 +1,21 @@
-from .user import User
+from .user import User, ClaimsUser
 from .guest_profile import GuestProfile
 from .driver_profile import DriverProfile
 from .car import Car
 from .car_images import CarImage
+from .image_blob import ImageBlob
+from .driver_location import DriverLocation
+from .outgoing_email import OutgoingEmail, EmailStatus
 
 __all__ = [
     'User',
+    'ClaimsUser',
     'GuestProfile',
     'DriverProfile',
     'Car',
     'CarImage',
+    'ImageBlob',
+    'DriverLocation',
+    'OutgoingEmail',
+    'EmailStatus',
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models import F
 from django.core.validators import MinValueValidator, MaxValueValidator
 from .driver_profile import DriverProfile
+from ..managers.car_manager import CarManager
 
 
 class FuelType(models.TextChoices):
@@ -71,6 +73,12 @@ class Car(models.Model):
         verbose_name='Описание'
     )
 
+    # Денормализованное количество фото, ведут CarImage.save и сигнал удаления
+    image_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество фото'
+    )
+
     is_active = models.BooleanField(
         default=True,
         verbose_name='Активен'
@@ -85,6 +93,8 @@ class Car(models.Model):
         verbose_name='Дата обновления'
     )
 
+    objects = CarManager()
+
     class Meta:
         verbose_name = 'Автомобиль'
         verbose_name_plural = 'Автомобили'
@@ -92,6 +102,7 @@ class Car(models.Model):
         indexes = [
             models.Index(fields=['number_plate']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['is_active', 'fuel_type', 'max_passengers']),
         ]
 
     def __str__(self):
@@ -103,7 +114,34 @@ class Car(models.Model):
 
     @property
     def has_images(self):
-        return self.images.exists()
+        if hasattr(self, 'images_count'):
+            return self.images_count > 0
+        return self.image_count > 0
+
+    @property
+    def primary_image(self):
+        if hasattr(self, 'primary_images'):
+            return self.primary_images[0] if self.primary_images else None
+
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('images')
+        if prefetched is not None:
+            return next((image for image in prefetched if image.is_primary), None)
+
+        return self.images.filter(is_primary=True).first()
+
+    def reserve_images(self, count=1):
+        """
+        Учесть count новых фото в image_count. True — фото у авто первые и
+        одно из них должно стать главным: счётчик «занимается» условным
+        UPDATE, поэтому параллельные загрузки не станут главными обе.
+        """
+        first = False
+        if self.image_count == 0:
+            first = Car.objects.filter(pk=self.pk, image_count=0).update(image_count=count) == 1
+        if not first:
+            Car.objects.filter(pk=self.pk).update(image_count=F('image_count') + count)
+        self.image_count = count if first else self.image_count + count
+        return first
 
     def deactivate(self):
         self.is_active = False
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from .car import Car
+from ..storage import image_storage
+from ..managers.car_image_manager import CarImageManager
 
 
 class CarImage(models.Model):
@@ -12,9 +15,39 @@ class CarImage(models.Model):
 
     image = models.ImageField(
         upload_to='car_images/%Y/%m/%d/',
+        storage=image_storage,
         verbose_name='Изображение'
     )
 
+    # Производные WebP без EXIF, создаются в фоне (utils/images.py)
+    thumbnail = models.ImageField(
+        upload_to='car_images/variants/',
+        storage=image_storage,
+        null=True,
+        blank=True,
+        verbose_name='Миниатюра'
+    )
+
+    medium = models.ImageField(
+        upload_to='car_images/variants/',
+        storage=image_storage,
+        null=True,
+        blank=True,
+        verbose_name='Среднее изображение'
+    )
+
+    width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Ширина'
+    )
+
+    height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Высота'
+    )
+
     is_primary = models.BooleanField(
         default=False,
         verbose_name='Главное изображение'
@@ -30,6 +63,8 @@ class CarImage(models.Model):
         verbose_name='Дата загрузки'
     )
 
+    objects = CarImageManager()
+
     class Meta:
         verbose_name = 'Изображение автомобиля'
         verbose_name_plural = 'Изображения автомобилей'
@@ -37,16 +72,47 @@ class CarImage(models.Model):
         indexes = [
             models.Index(fields=['car', 'is_primary']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['car'],
+                condition=Q(is_primary=True),
+                name='unique_primary_image_per_car'
+            ),
+        ]
 
     def __str__(self):
         return f"Изображение для {self.car}"
 
     def save(self, *args, **kwargs):
-        if not self.pk and not self.car.images.exists():
-            self.is_primary = True
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        make_primary = self.is_primary
+        with transaction.atomic():
+            # Первое фото авто становится главным
+            first = self.car.reserve_images()
+            self.is_primary = first
+            super().save(*args, **kwargs)
+            if make_primary and not first:
+                self.set_as_primary()
 
     def set_as_primary(self):
-        CarImage.objects.filter(car=self.car).update(is_primary=False)
+        """
+        Сделать фото главным. Меняются только две строки — прежнее главное
+        и это — в одной транзакции; одно главное фото на авто гарантирует
+        частичный уникальный индекс.
+        """
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    CarImage.objects.filter(car_id=self.car_id, is_primary=True).exclude(pk=self.pk).update(
+                        is_primary=False
+                    )
+                    CarImage.objects.filter(pk=self.pk).update(is_primary=True)
+                break
+            except IntegrityError:
+                # Параллельное переключение успело назначить другое фото — повторяем
+                if attempt:
+                    raise
         self.is_primary = True
-        self.save(update_fields=['is_primary'])
\ No newline at end of file
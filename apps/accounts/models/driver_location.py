@@ -0,0 +1,60 @@
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from .driver_profile import DriverProfile
+
+
+class DriverLocation(models.Model):
+    """Последняя известная позиция водителя (одна строка на водителя)"""
+    driver = models.OneToOneField(
+        DriverProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='location',
+        verbose_name='Водитель'
+    )
+
+    latitude = models.FloatField(
+        validators=[
+            MinValueValidator(-90.0),
+            MaxValueValidator(90.0)
+        ],
+        verbose_name='Широта'
+    )
+    longitude = models.FloatField(
+        validators=[
+            MinValueValidator(-180.0),
+            MaxValueValidator(180.0)
+        ],
+        verbose_name='Долгота'
+    )
+    heading = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[
+            MinValueValidator(0.0),
+            MaxValueValidator(360.0)
+        ],
+        verbose_name='Направление (градусы)'
+    )
+    speed = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0.0)],
+        verbose_name='Скорость (км/ч)'
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата обновления'
+    )
+
+    class Meta:
+        verbose_name = 'Местоположение водителя'
+        verbose_name_plural = 'Местоположения водителей'
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.driver_id}: {self.latitude:.5f}, {self.longitude:.5f}"
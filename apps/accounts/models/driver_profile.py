@@ -1,4 +1,8 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from ..cache import invalidate_profile
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
 from .user import User
 
@@ -35,6 +39,19 @@ class DriverProfile(models.Model):
         ],
         verbose_name='Рейтинг'
     )
+    rating_sum = models.FloatField(
+        default=0.0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    rating_ewma = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Рейтинг с затуханием'
+    )
     total_trips = models.PositiveIntegerField(
         default=0,
         verbose_name='Всего поездок'
@@ -48,6 +65,10 @@ class DriverProfile(models.Model):
         default=False,
         verbose_name='Верифицированный водитель'
     )
+    is_busy = models.BooleanField(
+        default=False,
+        verbose_name='Выполняет поездку'
+    )
 
     driver_license_number = models.CharField(
         max_length=50,
@@ -79,6 +100,7 @@ class DriverProfile(models.Model):
         indexes = [
             models.Index(fields=['rating']),
             models.Index(fields=['verified_driver']),
+            models.Index(fields=['verified_driver', '-rating', '-id']),
         ]
 
     def __str__(self):
@@ -94,10 +116,21 @@ class DriverProfile(models.Model):
         )
 
     def update_rating(self, new_rating):
-        total_trips = self.total_trips or 1
-        self.rating = (self.rating * total_trips + new_rating) / (total_trips + 1)
-        self.save(update_fields=['rating'])
+        """
+        Учесть новую оценку одним UPDATE: сумма и количество оценок,
+        средний рейтинг и экспоненциально сглаженный (свежие оценки весят больше).
+        """
+        alpha = settings.DRIVER_RATING_EWMA_ALPHA
+        DriverProfile.objects.filter(pk=self.pk).update(
+            rating_sum=F('rating_sum') + new_rating,
+            rating_count=F('rating_count') + 1,
+            rating=(F('rating_sum') + new_rating) / (F('rating_count') + 1.0),
+            rating_ewma=Coalesce(F('rating_ewma'), Value(new_rating)) * (1 - alpha) + new_rating * alpha,
+        )
+        self.refresh_from_db(fields=['rating', 'rating_sum', 'rating_count', 'rating_ewma'])
+        invalidate_profile(self.user_id)
 
     def increment_trips(self):
-        self.total_trips += 1
-        self.save(update_fields=['total_trips'])
\ No newline at end of file
+        DriverProfile.objects.filter(pk=self.pk).update(total_trips=F('total_trips') + 1)
+        self.refresh_from_db(fields=['total_trips'])
+        invalidate_profile(self.user_id)
@@ -0,0 +1,71 @@
+from collections import Counter, defaultdict
+
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class ImageBlob(models.Model):
+    """
+    Файл в контентно-адресуемом хранилище (см. storage.py).
+    ref_count — сколько полей моделей ссылаются на файл; файлы без ссылок
+    удаляет команда sweep_image_blobs.
+    """
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Путь в хранилище'
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name='SHA-256'
+    )
+    size = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Размер (байт)'
+    )
+    ref_count = models.IntegerField(
+        default=0,
+        verbose_name='Количество ссылок'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения ссылок'
+    )
+
+    class Meta:
+        verbose_name = 'Файл изображения'
+        verbose_name_plural = 'Файлы изображений'
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def retain(cls, *names):
+        """+1 ссылка на каждый файл; имена не из хранилища игнорируются"""
+        cls._add_refs(names, 1)
+
+    @classmethod
+    def release(cls, *names):
+        """-1 ссылка; файл без ссылок станет кандидатом на удаление"""
+        cls._add_refs(names, -1)
+
+    @classmethod
+    def _add_refs(cls, names, delta):
+        # Повторяющиеся имена (один файл в нескольких фото) — по UPDATE на кратность
+        by_count = defaultdict(list)
+        for name, count in Counter(name for name in names if name).items():
+            by_count[count].append(name)
+        for count, group in by_count.items():
+            cls.objects.filter(name__in=group).update(
+                ref_count=F('ref_count') + delta * count,
+                updated_at=timezone.now()
+            )
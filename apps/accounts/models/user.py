@@ -1,6 +1,7 @@
 
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from rest_framework.exceptions import AuthenticationFailed
 from ..managers.user_manager import UserManager
 
 
@@ -91,4 +92,25 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.role == UserRole.DRIVER
 
     def is_guest(self):
-        return self.role == UserRole.GUEST
\ No newline at end of file
+        return self.role == UserRole.GUEST
+
+
+class ClaimsUser(User):
+    """
+    Пользователь, восстановленный из claims access-токена без запроса к БД.
+    Остальные поля отложены и загружаются одним запросом при первом
+    обращении к любому из них.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.intersection(fields):
+            fields = deferred.union(fields)
+        try:
+            super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        except self.DoesNotExist:
+            # Токен ещё действителен, а пользователь удалён
+            raise AuthenticationFailed('Пользователь не найден', code='user_not_found')
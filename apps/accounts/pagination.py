@@ -0,0 +1,277 @@
+"""
+Пагинация списков API и админки
+
+KeysetPagination — страницы по ключу, без OFFSET и COUNT(*).
+EstimatedCountPagination / EstimatedCountPaginator — обычные номера
+страниц, но COUNT(*) на больших выборках заменён оценкой (см. estimated_count).
+"""
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import close_old_connections, connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset): следующая страница выбирается условием
+    «после последней записи» по полям сортировки, а не OFFSET и COUNT(*).
+    Стоимость любой страницы пропорциональна её размеру.
+
+    Последнее поле ordering должно быть уникальным (обычно id).
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ('-id',)
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_after_filter(position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_after_filter(self, position):
+        """(a, b, c) > (x, y, z) в терминах сортировки, собранное из Q"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_position(self, instance):
+        return [getattr(instance, field.lstrip('-')) for field in self.ordering]
+
+    def decode_cursor(self, request, model):
+        """Позиция из курсора; значения приводятся к типам полей сортировки"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Курсор приходит от клиента: без проверки значения попали бы прямо в фильтр
+        try:
+            return [
+                model._meta.get_field(field.lstrip('-')).clean(value, None)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Курсор следующей страницы',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Количество записей на странице',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class DriverKeysetPagination(KeysetPagination):
+    """Публичный список водителей: по рейтингу, затем по id"""
+    ordering = ('-rating', '-id')
+
+
+# --- Оценка количества строк ---
+
+COUNT_KEY = 'count:{digest}'
+COUNT_LOCK_KEY = 'count:refresh:{digest}'
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ESTIMATED_COUNT_WORKERS,
+                thread_name_prefix='estimated-count'
+            )
+        return _executor
+
+
+def _query_digest(queryset):
+    sql, params = queryset.query.sql_with_params()
+    return hashlib.sha256(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+
+
+def _store_count(digest, count):
+    cache.set(COUNT_KEY.format(digest=digest), (count, time.time()), settings.ESTIMATED_COUNT_TIMEOUT)
+    return count
+
+
+def _refresh_count(queryset, digest):
+    try:
+        _store_count(digest, queryset.count())
+    finally:
+        cache.delete(COUNT_LOCK_KEY.format(digest=digest))
+
+
+def _run(queryset, digest):
+    try:
+        _refresh_count(queryset, digest)
+    except Exception:
+        logger.exception('Не удалось пересчитать количество строк')
+    finally:
+        close_old_connections()
+
+
+def _schedule_refresh(queryset, digest):
+    # Один пересчёт на запрос, сколько бы страниц ни открывали одновременно
+    if not cache.add(COUNT_LOCK_KEY.format(digest=digest), 1, settings.ESTIMATED_COUNT_REFRESH):
+        return
+    if settings.ESTIMATED_COUNT_WORKERS <= 0:
+        _refresh_count(queryset, digest)
+    else:
+        _get_executor().submit(_run, queryset, digest)
+
+
+def _planner_estimate(queryset):
+    """Оценка строк планировщиком PostgreSQL по статистике таблиц или None"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset):
+    """
+    Количество строк выборки без полного COUNT(*) на больших таблицах.
+
+    До ESTIMATED_COUNT_THRESHOLD строк — точный счёт, ограниченный
+    LIMIT. Больше — оценка планировщика PostgreSQL, на других СУБД
+    закэшированный точный счёт: по истечении ESTIMATED_COUNT_REFRESH
+    отдаётся старое значение, а пересчёт идёт в фоне.
+    """
+    queryset = queryset.order_by()
+    try:
+        digest = _query_digest(queryset)
+    except EmptyResultSet:
+        return 0
+
+    cached = cache.get(COUNT_KEY.format(digest=digest))
+    if cached is not None:
+        count, computed_at = cached
+        if time.time() - computed_at >= settings.ESTIMATED_COUNT_REFRESH:
+            _schedule_refresh(queryset, digest)
+        return count
+
+    threshold = settings.ESTIMATED_COUNT_THRESHOLD
+    count = queryset.values('pk')[:threshold + 1].count()
+    if count <= threshold:
+        return count
+
+    estimate = _planner_estimate(queryset)
+    if estimate is not None:
+        return max(estimate, count)
+    return _store_count(digest, queryset.count())
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, у которого count — оценка для больших выборок"""
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return estimated_count(self.object_list)
+        return super().count
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """PageNumberPagination с приблизительным count на больших выборках"""
+    django_paginator_class = EstimatedCountPaginator
@@ -6,6 +6,7 @@ from .auth_serializers import (
     PasswordResetConfirmSerializer,
     EmailVerificationSerializer,
     TokenSerializer,
+    PorterTokenRefreshSerializer,
 )
 from .user_serializers import (
     UserSerializer,
@@ -16,13 +17,21 @@ from .profile_serializers import (
     GuestProfileDetailSerializer,
     DriverProfileSerializer,
     DriverProfileDetailSerializer,
+    DriverPublicSerializer,
+    DriverPublicFilterSerializer,
 )
 from .car_serializers import (
     CarSerializer,
     CarDetailSerializer,
     CarImageSerializer,
     CarCreateUpdateSerializer,
-    CarImageUploadSerializer
+    CarImageUploadSerializer,
+    CarImageBulkUploadSerializer,
+    CarImageReorderSerializer,
+)
+from .location_serializers import (
+    DriverLocationSerializer,
+    NearbyDriversQuerySerializer,
 )
 
 __all__ = [
@@ -34,6 +43,7 @@ __all__ = [
     'PasswordResetConfirmSerializer',
     'EmailVerificationSerializer',
     'TokenSerializer',
+    'PorterTokenRefreshSerializer',
 
     # User
     'UserSerializer',
@@ -44,6 +54,8 @@ __all__ = [
     'GuestProfileDetailSerializer',
     'DriverProfileSerializer',
     'DriverProfileDetailSerializer',
+    'DriverPublicSerializer',
+    'DriverPublicFilterSerializer',
 
     # Car
     'CarSerializer',
@@ -51,4 +63,10 @@ __all__ = [
     'CarImageSerializer',
     'CarCreateUpdateSerializer',
     'CarImageUploadSerializer',
+    'CarImageBulkUploadSerializer',
+    'CarImageReorderSerializer',
+
+    # Location
+    'DriverLocationSerializer',
+    'NearbyDriversQuerySerializer',
 ]
\ No newline at end of file
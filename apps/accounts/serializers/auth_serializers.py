@@ -2,8 +2,12 @@
 Сериализаторы для аутентификации
 """
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from ..authentication import PorterRefreshToken
 from ..models import GuestProfile, DriverProfile
 from .user_serializers import UserSerializer
 
@@ -134,4 +138,36 @@ class EmailVerificationSerializer(serializers.Serializer):
 class TokenSerializer(serializers.Serializer):
     access = serializers.CharField(help_text="Access token")
     refresh = serializers.CharField(help_text="Refresh token")
-    user = UserSerializer(help_text="Данные пользователя")
\ No newline at end of file
+    user = UserSerializer(help_text="Данные пользователя")
+
+
+class PorterTokenRefreshSerializer(TokenRefreshSerializer):
+    """Обновление токенов с перезаписью claims роли и профиля из БД"""
+    token_class = PorterRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user = (
+            User.objects
+            .select_related('driver_profile', 'guest_profile')
+            .filter(**{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]})
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('Пользователь не найден или деактивирован')
+
+        refresh.stamp_claims(user)
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
@@ -1,5 +1,7 @@
+from django.conf import settings
 from rest_framework import serializers
 from ..models import Car, CarImage
+from .fields import ValidatedImageField
 from datetime import datetime
 
 
@@ -9,11 +11,15 @@ class CarImageSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'image',
+            'thumbnail',
+            'medium',
+            'width',
+            'height',
             'is_primary',
             'order',
             'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'thumbnail', 'medium', 'width', 'height', 'created_at']
 
     def validate_image(self, value):
         """Валидация размера изображения"""
@@ -49,7 +55,7 @@ class CarSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
     def get_primary_image(self, obj):
-        primary = obj.images.filter(is_primary=True).first()
+        primary = obj.primary_image
         if primary:
             return CarImageSerializer(primary).data
         return None
@@ -139,20 +145,33 @@ class CarCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class CarImageUploadSerializer(serializers.Serializer):
-    image = serializers.ImageField(required=True)
+    image = ValidatedImageField(required=True)
     is_primary = serializers.BooleanField(default=False)
     order = serializers.IntegerField(default=0)
 
-    def validate_image(self, value):
-        if value.size > 5 * 1024 * 1024:  # 5MB
-            raise serializers.ValidationError(
-                "Размер изображения не должен превышать 5MB"
-            )
 
-        allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/webp']
-        if value.content_type not in allowed_types:
+class CarImageBulkUploadSerializer(serializers.Serializer):
+    images = serializers.ListField(child=ValidatedImageField(), allow_empty=False)
+    primary_index = serializers.IntegerField(required=False, min_value=0)
+
+    def validate_images(self, value):
+        if len(value) > settings.CAR_IMAGE_BATCH_MAX_FILES:
             raise serializers.ValidationError(
-                "Поддерживаются только форматы: JPEG, PNG, WebP"
+                f"За один запрос можно загрузить не больше {settings.CAR_IMAGE_BATCH_MAX_FILES} изображений"
             )
+        return value
+
+    def validate(self, attrs):
+        primary_index = attrs.get('primary_index')
+        if primary_index is not None and primary_index >= len(attrs['images']):
+            raise serializers.ValidationError({'primary_index': "Нет изображения с таким номером"})
+        return attrs
+
+
+class CarImageReorderSerializer(serializers.Serializer):
+    image_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
 
+    def validate_image_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Изображения не должны повторяться")
         return value
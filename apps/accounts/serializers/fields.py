@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework import serializers
+from ..uploads import SIGNATURE_LENGTH, UNSUPPORTED_TYPE_MESSAGE, detect_image_type, max_size_message
+
+
+class ValidatedImageField(serializers.ImageField):
+    """
+    Изображение с проверкой размера и формата по содержимому.
+    Файлы из ImageUploadHandler уже проверены при загрузке; остальные
+    (загрузки без обработчика, тесты) проверяются здесь по первым байтам.
+    Content-Type клиента заменяется определённым по сигнатуре.
+    """
+
+    def __init__(self, *args, max_size=None, **kwargs):
+        self.max_size = max_size
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        max_size = self.max_size or settings.IMAGE_UPLOAD_MAX_SIZE
+        size = getattr(data, 'size', None)
+        if size is not None and size > max_size:
+            raise serializers.ValidationError(max_size_message(max_size))
+
+        if getattr(data, 'sha256', None) is None and hasattr(data, 'read'):
+            data.seek(0)
+            content_type = detect_image_type(data.read(SIGNATURE_LENGTH))
+            data.seek(0)
+            if content_type is None:
+                raise serializers.ValidationError(UNSUPPORTED_TYPE_MESSAGE)
+            data.content_type = content_type
+
+        return super().to_internal_value(data)
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from ..models import DriverLocation
+
+
+class DriverLocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DriverLocation
+        fields = [
+            'latitude',
+            'longitude',
+            'heading',
+            'speed',
+            'updated_at'
+        ]
+        read_only_fields = ['updated_at']
+
+
+class NearbyDriversQuerySerializer(serializers.Serializer):
+    """Параметры поиска ближайших водителей"""
+    latitude = serializers.FloatField(
+        min_value=-90.0,
+        max_value=90.0
+    )
+    longitude = serializers.FloatField(
+        min_value=-180.0,
+        max_value=180.0
+    )
+    passengers = serializers.IntegerField(
+        default=1,
+        min_value=1,
+        max_value=20
+    )
+    limit = serializers.IntegerField(
+        default=5,
+        min_value=1,
+        max_value=50
+    )
+    radius_km = serializers.FloatField(
+        required=False,
+        min_value=0.1,
+        max_value=50.0
+    )
@@ -1,11 +1,14 @@
 from rest_framework import serializers
 from ..models import GuestProfile, DriverProfile
+from ..models.car import FuelType
 from .user_serializers import UserSerializer, UserMinimalSerializer
 from .car_serializers import CarDetailSerializer
+from .fields import ValidatedImageField
 
 
 class GuestProfileSerializer(serializers.ModelSerializer):
     user = UserMinimalSerializer(read_only=True)
+    avatar = ValidatedImageField(required=False, allow_null=True)
 
     class Meta:
         model = GuestProfile
@@ -152,9 +155,39 @@ class DriverPublicSerializer(serializers.ModelSerializer):
             'user',
             'bio',
             'rating',
+            'rating_count',
             'total_trips',
             'experience_years',
             'verified_driver',
             'car'
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+
+class DriverPublicFilterSerializer(serializers.Serializer):
+    """Параметры фильтрации публичного списка водителей"""
+    verified = serializers.BooleanField(
+        required=False,
+        allow_null=True,
+        default=None
+    )
+    min_rating = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=100.0
+    )
+    fuel_type = serializers.ChoiceField(
+        choices=FuelType.choices,
+        required=False
+    )
+    passengers = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=20,
+        help_text="Минимальная вместимость автомобиля"
+    )
+    car_active = serializers.BooleanField(
+        required=False,
+        allow_null=True,
+        default=None
+    )
@@ -0,0 +1,95 @@
+"""Инвалидация кэша профилей, отзыв access-токенов и счётчики ссылок на файлы при изменении моделей"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import restore_access, revoke_access
+from .cache import invalidate_profile
+from .models import User, ClaimsUser, GuestProfile, DriverProfile, Car, CarImage, ImageBlob
+
+CAR_IMAGE_FILE_FIELDS = ('image', 'thumbnail', 'medium')
+
+
+def _car_owner_id(car):
+    try:
+        return car.driver.user_id
+    except ObjectDoesNotExist:
+        # Водитель уже удалён каскадом — его кэш сброшен обработчиком профиля
+        return None
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+def sync_user_access(sender, instance, **kwargs):
+    if instance.is_active:
+        restore_access(instance.pk)
+    else:
+        revoke_access(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=ClaimsUser)
+def revoke_deleted_user_access(sender, instance, **kwargs):
+    revoke_access(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=GuestProfile)
+@receiver([post_save, post_delete], sender=DriverProfile)
+def invalidate_profile_owner(sender, instance, **kwargs):
+    invalidate_profile(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Car)
+def invalidate_car_owner(sender, instance, **kwargs):
+    invalidate_profile(_car_owner_id(instance))
+
+
+@receiver([post_save, post_delete], sender=CarImage)
+def invalidate_car_image_owner(sender, instance, **kwargs):
+    try:
+        car = instance.car
+    except ObjectDoesNotExist:
+        return
+    invalidate_profile(_car_owner_id(car))
+
+
+def _file_names(instance):
+    return [getattr(instance, field).name for field in CAR_IMAGE_FILE_FIELDS]
+
+
+@receiver(pre_save, sender=CarImage)
+def remember_car_image_files(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CAR_IMAGE_FILE_FIELDS):
+        return
+    instance._previous_files = (
+        CarImage.objects.filter(pk=instance.pk).values_list(*CAR_IMAGE_FILE_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=CarImage)
+def count_car_image_refs(sender, instance, created, **kwargs):
+    if created:
+        ImageBlob.retain(*_file_names(instance))
+        return
+    previous = getattr(instance, '_previous_files', None)
+    if previous is None:
+        return
+    del instance._previous_files
+    for old, new in zip(previous, _file_names(instance)):
+        if old != new:
+            ImageBlob.retain(new)
+            ImageBlob.release(old)
+
+
+@receiver(post_delete, sender=CarImage)
+def release_car_image_files(sender, instance, **kwargs):
+    ImageBlob.release(*_file_names(instance))
+    Car.objects.filter(pk=instance.car_id, image_count__gt=0).update(image_count=F('image_count') - 1)
@@ -0,0 +1,64 @@
+"""
+Контентно-адресуемое хранилище изображений
+
+Имя файла — SHA-256 содержимого: blobs/ab/cd/abcd...ext. Повторная
+загрузка того же файла не пишет ничего на диск, в БД добавляется только
+строка модели. Хеш берётся у файла из ImageUploadHandler (посчитан при
+загрузке), иначе считается здесь потоково.
+
+Каждому файлу соответствует ImageBlob со счётчиком ссылок; счётчики
+ведут сигналы CarImage, а неиспользуемые файлы удаляет sweep_image_blobs.
+"""
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    prefix = 'blobs'
+
+    def blob_name(self, digest, ext):
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    @staticmethod
+    def hash_content(content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+        return sha256.hexdigest()
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            return super().save(name, content, max_length)
+
+        digest = getattr(content, 'sha256', None) or self.hash_content(content)
+        ext = os.path.splitext(name)[1].lower()
+        name = self.blob_name(digest, ext)
+        duplicate = self.exists(name)
+        if not duplicate:
+            # При гонке двух одинаковых загрузок вторая получит имя с суффиксом
+            name = super().save(name, content, max_length)
+
+        # Вставка или обновление updated_at одним запросом: у дубликата файла
+        # без ссылок grace-период отсчитывается заново, и sweep_image_blobs
+        # не удалит его между записью и retain
+        ImageBlob = apps.get_model('accounts', 'ImageBlob')
+        ImageBlob.objects.bulk_create(
+            [ImageBlob(name=name, sha256=digest, size=content.size)],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['updated_at']
+        )
+        if duplicate and not self.exists(name):
+            # Очистка успела удалить файл до обновления строки — записываем заново
+            name = super().save(name, content, max_length)
+        return name
+
+
+def image_storage():
+    return ContentAddressedStorage()
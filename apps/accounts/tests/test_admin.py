@@ -0,0 +1,106 @@
+import io
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from apps.accounts.models import DriverProfile, GuestProfile, Car, CarImage, DriverLocation, OutgoingEmail
+from apps.trips.models import Trip, TripStatus, TripReview
+
+User = get_user_model()
+
+# Сессия, пользователь, COUNT фильтра и общий COUNT, страница, date_hierarchy и запас
+CHANGELIST_QUERY_BUDGET = 10
+
+
+def make_image():
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile('car.png', buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT='/tmp/porterkg-test-media')
+class AdminChangelistQueryBudgetTest(TestCase):
+    """Страница списка любой модели в админке — фиксированное число запросов"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        self.created = 0
+
+    def create_rows(self, count):
+        for _ in range(count):
+            i = self.created = self.created + 1
+            guest = User.objects.create_user(
+                email=f'guest{i}@example.com',
+                first_name='Guest',
+                last_name=str(i),
+                password='testpass123',
+                role='guest'
+            )
+            GuestProfile.objects.create(user=guest, phone_number=f'+99655500{i:04d}')
+
+            driver_user = User.objects.create_user(
+                email=f'driver{i}@example.com',
+                first_name='Driver',
+                last_name=str(i),
+                password='testpass123',
+                role='driver'
+            )
+            driver = DriverProfile.objects.create(
+                user=driver_user,
+                phone_number=f'+99670000{i:04d}',
+                driver_license_number=f'LIC{i}',
+                driver_license_category='B'
+            )
+            car = Car.objects.create(
+                driver=driver,
+                marka='Toyota',
+                model='Camry',
+                color='Черный',
+                year=2020,
+                number_plate=f'01ABC{i:03d}'
+            )
+            CarImage.objects.create(car=car, image=make_image())
+            CarImage.objects.create(car=car, image=make_image(), order=1)
+            DriverLocation.objects.create(driver=driver, latitude=42.87, longitude=74.59)
+
+            trip = Trip.objects.create(
+                passenger=guest,
+                driver=driver,
+                status=TripStatus.COMPLETED,
+                pickup_latitude=42.87,
+                pickup_longitude=74.59
+            )
+            TripReview.objects.create(trip=trip, driver=driver, author=guest, score=90)
+            OutgoingEmail.objects.create(subject='Тема', body='Текст', to=[guest.email])
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_query_budget(self):
+        models = list(admin.site._registry)
+
+        self.create_rows(2)
+        baseline = {model: self.changelist_queries(model) for model in models}
+
+        self.create_rows(3)
+        for model in models:
+            with self.subTest(model=model._meta.label):
+                count = self.changelist_queries(model)
+                self.assertLessEqual(count, CHANGELIST_QUERY_BUDGET)
+                # Число запросов не зависит от количества строк на странице
+                self.assertEqual(count, baseline[model])
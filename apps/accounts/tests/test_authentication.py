@@ -0,0 +1,128 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from apps.accounts.authentication import PorterRefreshToken
+from apps.accounts.models import DriverProfile, ClaimsUser
+
+User = get_user_model()
+
+
+class ClaimsAuthenticationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        self.profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_tokens_carry_claims(self):
+        access = AccessToken(str(PorterRefreshToken.for_user(self.user).access_token))
+
+        self.assertEqual(access['role'], 'driver')
+        self.assertFalse(access['is_verified'])
+        self.assertEqual(access['profile_id'], self.profile.pk)
+
+    def test_role_permission_without_queries(self):
+        admin = User.objects.create_user(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='testpass123',
+            role='admin'
+        )
+        self.authenticate(PorterRefreshToken.for_user(admin).access_token)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/auth/cache-stats/')
+        self.assertEqual(response.status_code, 200)
+
+        self.authenticate(PorterRefreshToken.for_user(self.user).access_token)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/auth/cache-stats/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_model_fields_load_lazily_in_one_query(self):
+        self.authenticate(PorterRefreshToken.for_user(self.user).access_token)
+
+        # Промах кэша: недостающие поля пользователя одним запросом
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.data['email'], 'driver@example.com')
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/auth/me/')
+
+    def test_claims_user_works_with_orm(self):
+        self.authenticate(PorterRefreshToken.for_user(self.user).access_token)
+
+        response = self.client.get('/api/auth/profile/driver/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.profile.pk)
+
+    def test_legacy_token_loads_user(self):
+        self.authenticate(RefreshToken.for_user(self.user).access_token)
+
+        response = self.client.get('/api/auth/me/')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_restamps_claims(self):
+        refresh = PorterRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(role='guest', is_verified=True)
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['role'], 'guest')
+        self.assertTrue(access['is_verified'])
+
+    def test_refresh_rejects_inactive_user(self):
+        refresh = PorterRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivation_rejects_issued_tokens(self):
+        self.authenticate(PorterRefreshToken.for_user(self.user).access_token)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 200)
+
+    def test_deleted_user_gets_401(self):
+        self.authenticate(PorterRefreshToken.for_user(self.user).access_token)
+        self.user.delete()
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+        # Отметки в кэше нет (другой процесс, вытеснение) — 401 при загрузке полей
+        cache.clear()
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+    def test_claims_user_equals_model_user(self):
+        user = ClaimsUser.from_db('default', ['id', 'role'], [self.user.pk, 'driver'])
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.email, 'driver@example.com')
+        self.assertEqual(user.get_deferred_fields(), set())
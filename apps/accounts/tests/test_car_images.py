@@ -0,0 +1,76 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from PIL import Image
+from apps.accounts.models import DriverProfile, Car, CarImage
+
+User = get_user_model()
+
+
+def make_jpeg_with_exif(size=(2000, 1000)):
+    image = Image.new('RGB', size, 'blue')
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'  # Make
+    exif[0x0112] = 6  # Orientation: повернуть на 90°
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile('car.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT='/tmp/porterkg-test-media', CAR_IMAGE_WORKERS=0)
+class CarImageVariantsTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        Car.objects.create(
+            driver=profile,
+            marka='Toyota',
+            model='Camry',
+            color='Черный',
+            year=2020,
+            number_plate='01ABC123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_upload_creates_webp_variants_without_exif(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/auth/car/upload_image/',
+                {'image': make_jpeg_with_exif()},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 201)
+
+        car_image = CarImage.objects.get(pk=response.data['id'])
+        # Размеры с учётом ориентации из EXIF
+        self.assertEqual((car_image.width, car_image.height), (1000, 2000))
+
+        for field, limit in (('thumbnail', 320), ('medium', 1280)):
+            with getattr(car_image, field).open('rb') as f, Image.open(f) as variant:
+                self.assertEqual(variant.format, 'WEBP')
+                self.assertLessEqual(max(variant.size), limit)
+                self.assertFalse(variant.getexif())
+
+        with car_image.image.open('rb') as f, Image.open(f) as original:
+            self.assertFalse(original.getexif())
+            self.assertEqual(original.size, (1000, 2000))
+
+        response = self.client.get('/api/auth/car/')
+        image = response.data['images'][0]
+        self.assertTrue(image['thumbnail'].endswith('.webp'))
+        self.assertEqual(image['width'], 1000)
@@ -0,0 +1,234 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from PIL import Image
+from apps.accounts.models import DriverProfile, Car, CarImage, ImageBlob
+
+User = get_user_model()
+
+
+def make_image(name='car.png', size=(4, 4)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT='/tmp/porterkg-test-media')
+class CarViewSetQueryCountTest(APITestCase):
+    """Количество SQL запросов на каждое действие CarViewSet"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        self.profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_car(self):
+        return Car.objects.create(
+            driver=self.profile,
+            marka='Toyota',
+            model='Camry',
+            color='Черный',
+            year=2020,
+            number_plate='01ABC123'
+        )
+
+    def create_images(self, car, count=2):
+        return [
+            CarImage.objects.create(car=car, image=make_image(), order=i)
+            for i in range(count)
+        ]
+
+    def test_create(self):
+        data = {
+            'marka': 'Toyota',
+            'model': 'Camry',
+            'color': 'Черный',
+            'year': 2020,
+            'number_plate': '01ABC123',
+        }
+        # профиль, проверка уникальности номера, INSERT, фото нового авто
+        with self.assertNumQueries(4):
+            response = self.client.post('/api/auth/car/', data)
+        self.assertEqual(response.status_code, 201)
+
+    def test_list(self):
+        self.create_images(self.create_car())
+
+        # профиль + авто одним JOIN, фото одним prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/auth/car/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['images']), 2)
+
+    def test_update(self):
+        car = self.create_car()
+        data = {
+            'marka': 'Toyota',
+            'model': 'Corolla',
+            'color': 'Белый',
+            'year': 2021,
+            'number_plate': '01ABC123',
+        }
+        # профиль + авто, фото, проверка уникальности номера, UPDATE
+        with self.assertNumQueries(4):
+            response = self.client.put(f'/api/auth/car/{car.pk}/', data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_partial_update(self):
+        car = self.create_car()
+
+        with self.assertNumQueries(3):
+            response = self.client.patch(f'/api/auth/car/{car.pk}/', {'color': 'Белый'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_upload_image(self):
+        self.create_car()
+
+        # профиль + авто, savepoint, счётчик фото у авто, запись файла в хранилище,
+        # INSERT, ссылка на файл, release
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                '/api/auth/car/upload_image/',
+                {'image': make_image()},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_upload_images(self):
+        self.create_car()
+
+        # профиль + авто, savepoint, счётчик фото у авто, запись файла в хранилище
+        # на каждый из трёх файлов, один INSERT фото, ссылки на файлы, release
+        with self.assertNumQueries(9):
+            response = self.client.post(
+                '/api/auth/car/upload-images/',
+                {'images': [make_image(), make_image(), make_image()], 'primary_index': 1},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([image['is_primary'] for image in response.data], [False, True, False])
+
+        car = Car.objects.get()
+        self.assertEqual(car.image_count, 3)
+        self.assertEqual(ImageBlob.objects.get().ref_count, 3)
+
+    def test_reorder_images(self):
+        images = self.create_images(self.create_car(), count=3)
+        image_ids = [images[2].pk, images[0].pk, images[1].pk]
+
+        # профиль + авто, фото авто, один UPDATE
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                '/api/auth/car/reorder-images/',
+                {'image_ids': image_ids},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(CarImage.objects.order_by('order').values_list('pk', flat=True)),
+            image_ids
+        )
+
+        response = self.client.post(
+            '/api/auth/car/reorder-images/',
+            {'image_ids': image_ids[:2]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_delete_image(self):
+        image = self.create_images(self.create_car(), count=1)[0]
+
+        # фото + авто + профиль одним JOIN, DELETE, освобождение ссылки на файл,
+        # счётчик фото у авто
+        with self.assertNumQueries(4):
+            response = self.client.delete(f'/api/auth/car/delete-image/{image.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_set_primary_image(self):
+        images = self.create_images(self.create_car())
+
+        # фото + авто + профиль одним JOIN, savepoint, сброс флага, UPDATE, release
+        with self.assertNumQueries(5):
+            response = self.client.post(f'/api/auth/car/set-primary-image/{images[1].pk}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_activate(self):
+        self.create_car()
+
+        with self.assertNumQueries(2):
+            response = self.client.post('/api/auth/car/activate/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivate(self):
+        self.create_car()
+
+        with self.assertNumQueries(2):
+            response = self.client.post('/api/auth/car/deactivate/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_profile_is_forbidden(self):
+        self.profile.delete()
+
+        with self.assertNumQueries(1):
+            response = self.client.post('/api/auth/car/activate/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_foreign_image_not_found(self):
+        self.create_car()
+        other = User.objects.create_user(
+            email='other@example.com',
+            first_name='Other',
+            last_name='Driver',
+            password='testpass123',
+            role='driver'
+        )
+        other_profile = DriverProfile.objects.create(
+            user=other,
+            phone_number='+996555000000',
+            driver_license_number='XYZ',
+            driver_license_category='B'
+        )
+        other_car = Car.objects.create(
+            driver=other_profile,
+            marka='Honda',
+            model='Fit',
+            color='Синий',
+            year=2015,
+            number_plate='01XYZ999'
+        )
+        image = self.create_images(other_car, count=1)[0]
+
+        response = self.client.delete(f'/api/auth/car/delete-image/{image.pk}/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(CarImage.objects.filter(pk=image.pk).exists())
+
+    def test_single_primary_image_and_image_count(self):
+        car = self.create_car()
+        images = self.create_images(car, count=3)
+        self.assertTrue(images[0].is_primary)
+
+        images[2].set_as_primary()
+        images[1].set_as_primary()
+        self.assertEqual(
+            list(CarImage.objects.filter(car=car, is_primary=True).values_list('pk', flat=True)),
+            [images[1].pk]
+        )
+
+        images[0].delete()
+        car.refresh_from_db()
+        self.assertEqual(car.image_count, 2)
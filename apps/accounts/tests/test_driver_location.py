@@ -0,0 +1,187 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+from apps.accounts.models import DriverProfile, Car, DriverLocation
+from apps.accounts.utils.geo import DriverSpatialIndex, haversine_km
+from apps.accounts.utils.driver_locations import reset_index
+from apps.accounts.utils.location_buffer import LocationPingBuffer
+
+User = get_user_model()
+
+
+class DriverSpatialIndexTest(SimpleTestCase):
+
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(1)
+        index = DriverSpatialIndex(cell_size=0.01)
+        drivers = {}
+        for driver_id in range(500):
+            lat, lon = rng.uniform(42.8, 42.9), rng.uniform(74.5, 74.7)
+            capacity = rng.randint(0, 6)
+            drivers[driver_id] = (lat, lon, capacity)
+            index.upsert(driver_id, lat, lon, capacity)
+
+        for _ in range(50):
+            lat, lon = rng.uniform(42.75, 42.95), rng.uniform(74.45, 74.75)
+            expected = sorted(
+                (haversine_km(lat, lon, d_lat, d_lon), driver_id)
+                for driver_id, (d_lat, d_lon, capacity) in drivers.items()
+                if capacity >= 3
+            )[:5]
+            found = index.nearest(lat, lon, k=5, min_capacity=3)
+            self.assertEqual([d for _, d in found], [d for _, d in expected])
+
+    def test_move_and_filters(self):
+        index = DriverSpatialIndex(cell_size=0.01)
+        index.upsert(1, 42.87, 74.59, capacity=4)
+        index.upsert(2, 42.88, 74.60, capacity=4, available=False)
+        index.upsert(3, 42.87, 74.61, capacity=4, updated_at=0)
+
+        self.assertEqual([d for _, d in index.nearest(42.87, 74.59, max_age=60)], [1])
+
+        index.upsert(1, 43.50, 75.50, capacity=4)
+        self.assertEqual(index.nearest(42.87, 74.59, max_distance_km=10, max_age=60), [])
+        self.assertEqual(len(index), 3)
+
+
+def create_driver(i, max_passengers=4):
+    user = User.objects.create_user(
+        email=f'driver{i}@example.com',
+        first_name='Driver',
+        last_name=str(i),
+        password='testpass123',
+        role='driver'
+    )
+    profile = DriverProfile.objects.create(
+        user=user,
+        phone_number='+996555123456',
+        driver_license_number=f'ABC{i}',
+        driver_license_category='B',
+        verified_driver=True
+    )
+    Car.objects.create(
+        driver=profile,
+        marka='Toyota',
+        model='Camry',
+        color='Черный',
+        year=2020,
+        number_plate=f'01ABC{i}',
+        max_passengers=max_passengers,
+    )
+    return user
+
+
+class LocationPingBufferTest(TestCase):
+
+    def setUp(self):
+        self.profiles = [create_driver(i).driver_profile for i in range(2)]
+
+    def test_coalesces_pings_per_driver(self):
+        buffer = LocationPingBuffer(flush_interval_ms=1000, max_pings=100, background=False)
+        for step in range(10):
+            for profile in self.profiles:
+                buffer.add(profile.pk, 42.87 + step / 1000, 74.59)
+
+        self.assertEqual(DriverLocation.objects.count(), 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 2)
+
+        for location in DriverLocation.objects.all():
+            self.assertAlmostEqual(location.latitude, 42.879)
+        stats = buffer.stats()
+        self.assertEqual(stats['received'], 20)
+        self.assertEqual(stats['coalesced'], 18)
+        self.assertEqual(stats['flushes'], 1)
+
+    def test_flushes_after_max_pings(self):
+        buffer = LocationPingBuffer(flush_interval_ms=1000, max_pings=3, background=False)
+        profile = self.profiles[0]
+
+        buffer.add(profile.pk, 42.87, 74.59)
+        buffer.add(profile.pk, 42.88, 74.59)
+        self.assertFalse(DriverLocation.objects.exists())
+
+        buffer.add(profile.pk, 42.89, 74.59)
+        self.assertAlmostEqual(DriverLocation.objects.get().latitude, 42.89)
+        self.assertEqual(len(buffer), 0)
+
+
+
+class LocationPingBufferDeletedDriverTest(TransactionTestCase):
+    """Внешние ключи проверяются при коммите — нужен настоящий автокоммит"""
+
+    def test_deleted_driver_does_not_block_flush(self):
+        profiles = [create_driver(i).driver_profile for i in range(2)]
+        buffer = LocationPingBuffer(flush_interval_ms=1000, max_pings=100, background=False)
+        for profile in profiles:
+            buffer.add(profile.pk, 42.87, 74.59)
+
+        profiles[0].user.delete()
+
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(DriverLocation.objects.get().driver_id, profiles[1].pk)
+
+        buffer.add(profiles[1].pk, 42.88, 74.59)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertAlmostEqual(DriverLocation.objects.get().latitude, 42.88)
+
+@override_settings(DRIVER_LOCATION_FLUSH_INTERVAL_MS=0)
+class DriverLocationAPITest(APITestCase):
+
+    def setUp(self):
+        reset_index()
+        self.drivers = []
+        for i, (lat, lon) in enumerate([(42.870, 74.590), (42.875, 74.600), (42.950, 74.700)]):
+            user = create_driver(i, max_passengers=4 if i else 2)
+            self.drivers.append((user, lat, lon))
+
+    def tearDown(self):
+        reset_index()
+
+    def ping(self, user, lat, lon):
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/auth/location/', {'latitude': lat, 'longitude': lon})
+        self.client.force_authenticate(None)
+        return response
+
+    def test_ping_upserts_location(self):
+        user, lat, lon = self.drivers[0]
+
+        self.assertEqual(self.ping(user, lat, lon).status_code, 200)
+        self.assertEqual(self.ping(user, 42.871, 74.591).status_code, 200)
+
+        location = DriverLocation.objects.get(driver__user=user)
+        self.assertAlmostEqual(location.latitude, 42.871)
+        self.assertEqual(DriverLocation.objects.count(), 1)
+
+    def test_ping_validation(self):
+        user = self.drivers[0][0]
+        self.assertEqual(self.ping(user, 91, 74.59).status_code, 400)
+
+    def test_nearby(self):
+        for user, lat, lon in self.drivers:
+            self.ping(user, lat, lon)
+
+        response = self.client.get('/api/auth/drivers/nearby/', {
+            'latitude': 42.870,
+            'longitude': 74.590,
+            'passengers': 3,
+            'radius_km': 5,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['driver']['id'], self.drivers[1][0].driver_profile.pk)
+
+    def test_nearby_loads_other_workers_locations(self):
+        # Позиции, записанные другим процессом, видны только в таблице
+        user, lat, lon = self.drivers[1]
+        DriverLocation.objects.create(driver=user.driver_profile, latitude=lat, longitude=lon)
+
+        response = self.client.get('/api/auth/drivers/nearby/', {'latitude': lat, 'longitude': lon})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
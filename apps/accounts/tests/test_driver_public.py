@@ -0,0 +1,100 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from apps.accounts.models import DriverProfile, Car
+
+User = get_user_model()
+
+
+class DriverPublicListTest(APITestCase):
+    url = '/api/auth/drivers/'
+
+    def setUp(self):
+        # Половина водителей с одинаковым рейтингом, чтобы проверить курсор на дублях
+        for i in range(12):
+            user = User.objects.create_user(
+                email=f'driver{i}@example.com',
+                first_name='Driver',
+                last_name=str(i),
+                password='testpass123',
+                role='driver'
+            )
+            profile = DriverProfile.objects.create(
+                user=user,
+                phone_number='+996555123456',
+                driver_license_number=f'ABC{i}',
+                driver_license_category='B',
+                rating=90.0 if i % 2 else 50.0 + i,
+                verified_driver=i % 3 != 0
+            )
+            Car.objects.create(
+                driver=profile,
+                marka='Toyota',
+                model='Camry',
+                color='Черный',
+                year=2020,
+                number_plate=f'01ABC{i}',
+                fuel_type='diesel' if i < 6 else 'petrol',
+                max_passengers=i + 1,
+            )
+
+    def collect(self, params=None, page_size=5):
+        ids = []
+        url = self.url
+        params = dict(params or {}, page_size=page_size)
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(driver['id'] for driver in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_keyset_pages_cover_all_drivers_in_order(self):
+        ids = self.collect()
+
+        expected = list(
+            DriverProfile.objects.order_by('-rating', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_filters(self):
+        ids = self.collect({
+            'verified': 'true',
+            'min_rating': 55,
+            'fuel_type': 'petrol',
+            'passengers': 8,
+        })
+
+        expected = set(
+            DriverProfile.objects.filter(
+                verified_driver=True,
+                rating__gte=55,
+                car__fuel_type='petrol',
+                car__max_passengers__gte=8
+            ).values_list('id', flat=True)
+        )
+        self.assertTrue(expected)
+        self.assertEqual(set(ids), expected)
+
+    def test_page_query_count_is_constant(self):
+        response = self.client.get(self.url, {'page_size': 5})
+
+        # страница водителей с пользователем и авто + фото, без COUNT(*)
+        with self.assertNumQueries(2):
+            self.client.get(response.data['next'])
+
+    def test_invalid_filter(self):
+        response = self.client.get(self.url, {'min_rating': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_malformed_cursor(self):
+        for position in (['abc', 1], [None, None], [1, 'x'], [[1], {}], 'abc'):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            with self.subTest(position=position):
+                response = self.client.get(self.url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(self.url, {'cursor': 'not-base64!'})
+        self.assertEqual(response.status_code, 404)
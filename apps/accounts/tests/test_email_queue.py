@@ -0,0 +1,82 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from apps.accounts.models import OutgoingEmail, EmailStatus
+from apps.accounts.utils.email_queue import enqueue_email, process_email_queue
+
+
+class EmailQueueTest(TestCase):
+
+    def test_enqueue_does_not_send(self):
+        enqueue_email('Тема', 'Текст', ['user@example.com'])
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.filter(status=EmailStatus.PENDING).count(), 1)
+
+    def test_process_sends_batch(self):
+        for i in range(3):
+            enqueue_email('Тема', 'Текст', [f'user{i}@example.com'])
+
+        sent, failed = process_email_queue(batch_size=10)
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(OutgoingEmail.objects.filter(status=EmailStatus.SENT).count(), 3)
+
+    def test_failed_email_is_retried_with_backoff(self):
+        email = enqueue_email('Тема', 'Текст', ['user@example.com'])
+
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            sent, failed = process_email_queue()
+
+        self.assertEqual((sent, failed), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailStatus.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(process_email_queue(), (0, 0))
+
+        OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(process_email_queue(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_fails_after_max_attempts(self):
+        email = enqueue_email('Тема', 'Текст', ['user@example.com'])
+
+        with self.settings(EMAIL_QUEUE_MAX_ATTEMPTS=1):
+            with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+                process_email_queue()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailStatus.FAILED)
+
+    def test_stale_sending_email_is_released(self):
+        email = enqueue_email('Тема', 'Текст', ['user@example.com'])
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            status=EmailStatus.SENDING,
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(process_email_queue(), (1, 0))
+
+
+class RegisterEmailQueueTest(APITestCase):
+
+    def test_register_enqueues_verification_email(self):
+        response = self.client.post(reverse('accounts:register'), {
+            'email': 'new@example.com',
+            'first_name': 'New',
+            'last_name': 'User',
+            'password': 'Str0ngPass!23',
+            'password_confirm': 'Str0ngPass!23',
+            'role': 'guest',
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertTrue(OutgoingEmail.objects.filter(to=['new@example.com']).exists())
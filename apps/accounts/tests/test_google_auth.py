@@ -0,0 +1,141 @@
+import datetime
+import time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from google.auth import crypt, jwt
+from rest_framework.test import APITestCase
+from apps.accounts.utils.google_auth import GoogleCertCache, StaticKeySource, google_certs
+
+User = get_user_model()
+
+CLIENT_ID = 'porter-test.apps.googleusercontent.com'
+
+
+def make_keypair(kid):
+    """Локальный ключ Google: подписчик и PEM-сертификат для проверки"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'test')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(private_pem, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def make_token(signer, **claims):
+    now = int(time.time())
+    payload = {
+        'iss': 'https://accounts.google.com',
+        'aud': CLIENT_ID,
+        'iat': now,
+        'exp': now + 3600,
+        'email': 'google@example.com',
+        'given_name': 'Google',
+        'family_name': 'User',
+    }
+    payload.update(claims)
+    return jwt.encode(signer, payload).decode()
+
+
+class CountingSource(StaticKeySource):
+
+    def __init__(self, certs, max_age=None):
+        super().__init__(certs, max_age)
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return super().fetch()
+
+
+class GoogleCertCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.source = CountingSource({'k1': 'pem'}, max_age=300)
+        self.cache = GoogleCertCache(self.source)
+        self.cache.timer = lambda: self.now
+
+    def test_max_age_is_honored(self):
+        self.cache.get_certs('k1')
+        self.now += 299
+        self.cache.get_certs('k1')
+        self.assertEqual(self.source.fetches, 1)
+
+        self.now += 2
+        self.cache.get_certs('k1')
+        self.assertEqual(self.source.fetches, 2)
+
+    def test_unknown_kid_refetches_once_per_retry_interval(self):
+        self.cache.get_certs('k1')
+        self.source.certs = {'k2': 'pem'}
+
+        self.now += 61
+        self.assertIn('k2', self.cache.get_certs('k2'))
+        self.assertEqual(self.source.fetches, 2)
+
+        # Подделанный kid не заставляет ходить в сеть на каждый запрос
+        self.cache.get_certs('forged')
+        self.cache.get_certs('forged')
+        self.assertEqual(self.source.fetches, 2)
+
+
+@override_settings(GOOGLE_OAUTH2_CLIENT_ID=CLIENT_ID)
+class GoogleAuthAPITest(APITestCase):
+    url = '/api/auth/google/'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.signer, pem = make_keypair('local-key')
+        cls.other_signer, _ = make_keypair('local-key')
+        google_certs.set_source(StaticKeySource({'local-key': pem}))
+
+    @classmethod
+    def tearDownClass(cls):
+        google_certs.set_source(None)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_valid_token_creates_user(self):
+        response = self.client.post(self.url, {'token': make_token(self.signer)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['created'])
+        user = User.objects.get(email='google@example.com')
+        self.assertEqual(user.auth_type, 'google')
+        self.assertTrue(user.is_verified)
+
+    def test_invalid_tokens_are_rejected(self):
+        tokens = [
+            make_token(self.other_signer),
+            make_token(self.signer, aud='someone-else'),
+            make_token(self.signer, iss='https://evil.example.com'),
+            make_token(self.signer, exp=int(time.time()) - 3600),
+            'not-a-jwt',
+        ]
+        for token in tokens:
+            response = self.client.post(self.url, {'token': token})
+            self.assertEqual(response.status_code, 400, token)
+        self.assertFalse(User.objects.filter(email='google@example.com').exists())
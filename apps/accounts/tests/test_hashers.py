@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class PasswordRehashOnLoginTest(APITestCase):
+
+    def setUp(self):
+        # Счётчики лимита входа живут в кэше между тестами
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123',
+            role='guest'
+        )
+
+    def login(self):
+        return self.client.post('/api/auth/login/', {
+            'email': 'guest@example.com',
+            'password': 'testpass123'
+        })
+
+    def stored_hash(self):
+        return User.objects.values_list('password', flat=True).get(pk=self.user.pk)
+
+    def test_iterations_are_configurable(self):
+        iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+        self.assertEqual(self.stored_hash().split('$')[1], str(iterations))
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=12000)
+    def test_cost_change_rehashes_on_login(self):
+        self.assertEqual(self.login().status_code, 200)
+
+        self.assertTrue(self.stored_hash().startswith('pbkdf2_sha256$12000$'))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            'apps.accounts.hashers.TunableScryptPasswordHasher',
+            'apps.accounts.hashers.TunablePBKDF2PasswordHasher',
+        ],
+        PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10
+    )
+    def test_algorithm_change_rehashes_on_login(self):
+        self.assertEqual(self.login().status_code, 200)
+
+        self.assertTrue(self.stored_hash().startswith('scrypt$'))
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_wrong_password_does_not_rehash(self):
+        before = self.stored_hash()
+
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=12000):
+            response = self.client.post('/api/auth/login/', {
+                'email': 'guest@example.com',
+                'password': 'wrong-password'
+            })
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.stored_hash(), before)
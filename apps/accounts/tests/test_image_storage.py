@@ -0,0 +1,142 @@
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from PIL import Image
+from apps.accounts.models import DriverProfile, Car, CarImage, ImageBlob
+from apps.accounts.storage import image_storage
+from apps.accounts.utils.blob_cleanup import sweep_image_blobs
+
+User = get_user_model()
+
+
+def make_image(name='car.png', color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 400), color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ContentAddressedStorageTest(APITestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name, CAR_IMAGE_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        Car.objects.create(
+            driver=profile,
+            marka='Toyota',
+            model='Camry',
+            color='Черный',
+            year=2020,
+            number_plate='01ABC123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def upload(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/auth/car/upload_image/',
+                {'image': make_image(**kwargs)},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 201)
+        return CarImage.objects.get(pk=response.data['id'])
+
+    def test_duplicate_upload_shares_files(self):
+        first = self.upload()
+        second = self.upload(name='same-photo-again.png')
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        self.assertTrue(first.image.name.startswith('blobs/'))
+        # оригинал и два варианта, у каждого по две ссылки
+        self.assertEqual(ImageBlob.objects.count(), 3)
+        self.assertEqual(set(ImageBlob.objects.values_list('ref_count', flat=True)), {2})
+
+        self.upload(color='blue')
+        self.assertEqual(ImageBlob.objects.count(), 6)
+
+    def test_sweep_removes_only_unreferenced_files(self):
+        first = self.upload()
+        second = self.upload()
+        names = [first.image.name, first.thumbnail.name, first.medium.name]
+
+        self.client.delete(f'/api/auth/car/delete-image/{first.pk}/')
+        call_command('sweep_image_blobs', grace_period=0, stdout=io.StringIO())
+        self.assertTrue(all(image_storage().exists(name) for name in names))
+
+        self.client.delete(f'/api/auth/car/delete-image/{second.pk}/')
+        output = io.StringIO()
+        call_command('sweep_image_blobs', grace_period=0, stdout=output)
+
+        self.assertIn('Удалено файлов: 3', output.getvalue())
+        self.assertFalse(any(image_storage().exists(name) for name in names))
+        self.assertFalse(ImageBlob.objects.exists())
+
+    def test_grace_period_protects_recent_orphans(self):
+        image = self.upload()
+        image.delete()
+
+        call_command('sweep_image_blobs', grace_period=3600, stdout=io.StringIO())
+        self.assertEqual(ImageBlob.objects.count(), 3)
+        self.assertTrue(image_storage().exists(image.image.name))
+
+    def test_duplicate_of_old_orphan_survives_sweep_before_retain(self):
+        image = self.upload()
+        name = image.image.name
+        image.delete()
+        ImageBlob.objects.update(updated_at=timezone.now() - timedelta(days=7))
+
+        # Повторная загрузка того же файла: очистка между записью и retain
+        saved = image_storage().save('car.png', make_image())
+        call_command('sweep_image_blobs', grace_period=3600, stdout=io.StringIO())
+        ImageBlob.retain(saved)
+
+        self.assertEqual(saved, name)
+        self.assertTrue(image_storage().exists(name))
+        self.assertEqual(ImageBlob.objects.get(name=name).ref_count, 1)
+
+    def test_blob_referenced_during_sweep_keeps_file(self):
+        image = self.upload()
+        names = [image.image.name, image.thumbnail.name, image.medium.name]
+        image.delete()
+        ImageBlob.objects.update(updated_at=timezone.now() - timedelta(days=7))
+
+        # Загрузка того же файла между выборкой пачки и DELETE
+        filter_blobs = ImageBlob.objects.filter
+
+        def filter_after_retain(*args, **kwargs):
+            if 'ref_count__lte' in kwargs and 'pk__in' in kwargs:
+                ImageBlob.retain(names[0])
+            return filter_blobs(*args, **kwargs)
+
+        with mock.patch.object(ImageBlob.objects, 'filter', side_effect=filter_after_retain):
+            deleted, freed, _ = sweep_image_blobs(grace_period=3600)
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(ImageBlob.objects.get().name, names[0])
+        self.assertTrue(image_storage().exists(names[0]))
+        self.assertFalse(any(image_storage().exists(name) for name in names[1:]))
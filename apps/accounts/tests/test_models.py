@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from apps.accounts.models import GuestProfile, DriverProfile, Car, CarImage
+from apps.accounts.serializers import CarSerializer, CarDetailSerializer
 
 User = get_user_model()
 
@@ -80,11 +81,16 @@ class DriverProfileModelTest(TestCase):
         self.assertEqual(self.profile.total_trips, 0)
 
     def test_update_rating(self):
-        self.profile.total_trips = 10
         self.profile.update_rating(95.0)
+        self.profile.update_rating(85.0)
 
-        expected_rating = (100.0 * 10 + 95.0) / 11
-        self.assertAlmostEqual(self.profile.rating, expected_rating, places=2)
+        self.assertAlmostEqual(self.profile.rating, 90.0, places=2)
+        self.assertEqual(self.profile.rating_count, 2)
+        self.assertAlmostEqual(self.profile.rating_sum, 180.0)
+        self.assertEqual(self.profile.total_trips, 0)
+        # Сглаженный рейтинг ближе к последней оценке, чем обычный средний
+        self.assertLess(self.profile.rating_ewma, 95.0)
+        self.assertGreater(self.profile.rating_ewma, 85.0)
 
     def test_increment_trips(self):
         initial_trips = self.profile.total_trips
@@ -127,4 +133,55 @@ class CarModelTest(TestCase):
         self.assertFalse(self.car.is_active)
 
         self.car.activate()
-        self.assertTrue(self.car.is_active)
\ No newline at end of file
+        self.assertTrue(self.car.is_active)
+
+
+class CarQuerySetTest(TestCase):
+    def setUp(self):
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f'driver{i}@example.com',
+                first_name='Driver',
+                last_name=str(i),
+                password='testpass123',
+                role='driver'
+            )
+            profile = DriverProfile.objects.create(
+                user=user,
+                phone_number='+996555123456',
+                driver_license_number=f'ABC{i}',
+                driver_license_category='B'
+            )
+            car = Car.objects.create(
+                driver=profile,
+                marka='Toyota',
+                model='Camry',
+                color='Черный',
+                year=2020,
+                number_plate=f'01ABC{i}'
+            )
+            for order in range(i % 3):
+                CarImage.objects.create(car=car, image=f'car_images/{i}_{order}.png', order=order)
+
+    def test_primary_image_serialized_in_constant_queries(self):
+        # автомобили + главные фото
+        with self.assertNumQueries(2):
+            data = CarSerializer(Car.objects.with_primary_image(), many=True).data
+
+        with_primary = [car for car in data if car['primary_image']]
+        self.assertEqual(len(with_primary), 3)
+
+    def test_detail_serialized_in_constant_queries(self):
+        # автомобили + все фото, has_images берётся из prefetch
+        with self.assertNumQueries(2):
+            data = CarDetailSerializer(Car.objects.with_images(), many=True).data
+
+        for car in data:
+            self.assertEqual(car['has_images'], bool(car['images']))
+
+    def test_image_stats(self):
+        counts = dict(Car.objects.with_image_stats().values_list('number_plate', 'images_count'))
+
+        self.assertEqual(counts['01ABC2'], 2)
+        self.assertEqual(counts['01ABC0'], 0)
+        self.assertFalse(Car.objects.with_image_stats().get(number_plate='01ABC0').has_images)
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.accounts.pagination import EstimatedCountPaginator, estimated_count
+
+User = get_user_model()
+
+
+def create_users(start, count):
+    User.objects.bulk_create([
+        User(email=f'user{i}@example.com', first_name='User', last_name=str(i))
+        for i in range(start, start + count)
+    ])
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=3, ESTIMATED_COUNT_WORKERS=0)
+class EstimatedCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_small_queryset_counted_exactly(self):
+        create_users(0, 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(estimated_count(User.objects.all()), 2)
+        create_users(2, 1)
+        self.assertEqual(estimated_count(User.objects.all()), 3)
+
+    def test_large_queryset_cached_and_refreshed(self):
+        create_users(0, 5)
+        self.assertEqual(estimated_count(User.objects.all()), 5)
+
+        create_users(5, 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(estimated_count(User.objects.all()), 5)
+
+        # Срок истёк: отдаётся старое значение, пересчёт (здесь синхронный) обновляет кэш
+        with override_settings(ESTIMATED_COUNT_REFRESH=0):
+            self.assertEqual(estimated_count(User.objects.all()), 5)
+        self.assertEqual(estimated_count(User.objects.all()), 7)
+
+    def test_filters_counted_separately(self):
+        create_users(0, 5)
+
+        self.assertEqual(estimated_count(User.objects.all()), 5)
+        self.assertEqual(estimated_count(User.objects.filter(last_name='1')), 1)
+        self.assertEqual(estimated_count(User.objects.none()), 0)
+
+    def test_paginator(self):
+        create_users(0, 5)
+        paginator = EstimatedCountPaginator(User.objects.order_by('pk'), 2)
+
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(len(paginator.page(3)), 1)
+
+    def test_admin_changelist_skips_full_count(self):
+        admin = User.objects.create_superuser(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='testpass123'
+        )
+        self.client.force_login(admin)
+        create_users(0, 5)
+
+        response = self.client.get(reverse('admin:accounts_user_changelist'), {'q': 'user'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 6)
+        self.assertFalse(response.context['cl'].show_full_result_count)
@@ -0,0 +1,112 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.accounts.cache import get_profile_cache_stats, reset_profile_cache_stats
+from apps.accounts.models import DriverProfile, Car, CarImage
+from PIL import Image
+
+User = get_user_model()
+
+
+def make_image():
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile('car.png', buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT='/tmp/porterkg-test-media')
+class ProfileCacheTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        reset_profile_cache_stats()
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        self.profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        self.car = Car.objects.create(
+            driver=self.profile,
+            marka='Toyota',
+            model='Camry',
+            color='Черный',
+            year=2020,
+            number_plate='01ABC123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_second_read_hits_cache(self):
+        first = self.client.get('/api/auth/my-profile/')
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/auth/my-profile/')
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(get_profile_cache_stats()['driver'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_driver_list_urls_are_absolute_per_host(self):
+        CarImage.objects.create(car=self.car, image=make_image())
+        self.client.get('/api/auth/profile/driver/')
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/auth/profile/driver/')
+        self.assertEqual(response.data['car']['marka'], 'Toyota')
+        self.assertTrue(response.data['car']['images'][0]['image'].startswith('http://testserver/'))
+
+        # Другой хост не получает закэшированные URL первого
+        response = self.client.get('/api/auth/profile/driver/', HTTP_HOST='localhost')
+        self.assertTrue(response.data['car']['images'][0]['image'].startswith('http://localhost/'))
+
+    def test_profile_update_invalidates(self):
+        self.client.get('/api/auth/profile/driver/')
+
+        response = self.client.patch(f'/api/auth/profile/driver/{self.profile.pk}/', {'bio': 'Новое описание'})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/api/auth/profile/driver/')
+        self.assertEqual(response.data['bio'], 'Новое описание')
+
+    def test_related_models_invalidate(self):
+        self.client.get('/api/auth/my-profile/')
+        self.car.color = 'Белый'
+        self.car.save()
+        self.assertEqual(self.client.get('/api/auth/my-profile/').data['profile']['car']['color'], 'Белый')
+
+        CarImage.objects.create(car=self.car, image=make_image())
+        response = self.client.get('/api/auth/my-profile/')
+        self.assertEqual(len(response.data['profile']['car']['images']), 1)
+
+        self.user.first_name = 'Иван'
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/me/').data['first_name'], 'Иван')
+
+    def test_queryset_update_invalidates(self):
+        self.client.get('/api/auth/profile/driver/')
+
+        self.profile.increment_trips()
+
+        self.assertEqual(self.client.get('/api/auth/profile/driver/').data['total_trips'], 1)
+
+    def test_missing_profile_is_not_cached(self):
+        self.profile.delete()
+
+        self.assertEqual(self.client.get('/api/auth/profile/driver/').status_code, 404)
+        DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        self.assertEqual(self.client.get('/api/auth/profile/driver/').status_code, 200)
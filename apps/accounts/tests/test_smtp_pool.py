@@ -0,0 +1,106 @@
+import socketserver
+import threading
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+from apps.accounts.utils.smtp_pool import PooledEmailBackend, close_pools
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP сервер для тестов"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost ESMTP test')
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+
+            if command.startswith('EHLO'):
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages += 1
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Not implemented')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = 0
+
+
+class PooledEmailBackendTest(SimpleTestCase):
+
+    def setUp(self):
+        close_pools()
+        self.server = _SMTPServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        close_pools()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_backend(self, **kwargs):
+        return PooledEmailBackend(
+            host='127.0.0.1',
+            port=self.server.server_address[1],
+            username='',
+            password='',
+            use_tls=False,
+            **kwargs
+        )
+
+    def send(self, backend, count=1):
+        messages = [
+            EmailMessage('Тема', 'Текст', 'from@example.com', [f'to{i}@example.com'])
+            for i in range(count)
+        ]
+        return backend.send_messages(messages)
+
+    def test_connection_is_reused_between_sends(self):
+        for _ in range(5):
+            self.assertEqual(self.send(self.get_backend()), 1)
+
+        stats = self.get_backend().pool.stats()
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connections_reused'], 4)
+        self.assertEqual(stats['messages_per_connection'], 5)
+
+    def test_connection_recycled_after_max_messages(self):
+        backend = self.get_backend(max_messages=2)
+        for _ in range(3):
+            self.send(backend, count=2)
+
+        self.assertEqual(self.server.messages, 6)
+        self.assertEqual(backend.pool.stats()['connections_opened'], 3)
+
+    def test_idle_connection_is_not_reused(self):
+        backend = self.get_backend(idle_timeout=0.01)
+        self.send(backend)
+        backend.pool._idle[0].last_used_at -= 1
+        self.send(backend)
+
+        self.assertEqual(backend.pool.stats()['connections_opened'], 2)
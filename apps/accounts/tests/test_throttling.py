@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from apps.accounts.throttling import AuthIPThrottle, parse_rate
+
+User = get_user_model()
+
+REST_FRAMEWORK = dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES={
+    'login_ip': '5/m',
+    'login_email': '3/m',
+    'password_reset_email': '2/h',
+})
+
+
+class FakeView:
+    throttle_scope = 'login'
+
+
+class FakeRequest:
+    META = {'REMOTE_ADDR': '10.0.0.1'}
+
+
+class SlidingWindowTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def make_throttle(self, now):
+        throttle = AuthIPThrottle()
+        throttle.timer = lambda: now
+        throttle.get_rate = lambda view: '10/m'
+        return throttle
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/m'), (5, 60))
+        self.assertEqual(parse_rate('10/15m'), (10, 900))
+        self.assertEqual(parse_rate('100/day'), (100, 86400))
+
+    def test_previous_window_is_weighted(self):
+        # 10 запросов в конце предыдущего окна
+        for _ in range(10):
+            self.assertTrue(self.make_throttle(6000 + 59).allow_request(FakeRequest, FakeView))
+
+        # Через четверть нового окна вес предыдущего 0.75: места для 2 запросов
+        allowed = [
+            self.make_throttle(6060 + 15).allow_request(FakeRequest, FakeView)
+            for _ in range(3)
+        ]
+        self.assertEqual(allowed, [True, True, False])
+
+    def test_wait_until_next_allowed_request(self):
+        for _ in range(10):
+            self.make_throttle(6000 + 30).allow_request(FakeRequest, FakeView)
+        throttle = self.make_throttle(6000 + 30)
+        self.assertFalse(throttle.allow_request(FakeRequest, FakeView))
+
+        # Отклонённый запрос тоже учтён, лимит освободится уже в следующем окне
+        wait = throttle.wait()
+        self.assertGreater(wait, 30)
+        self.assertTrue(self.make_throttle(6030 + wait).allow_request(FakeRequest, FakeView))
+
+
+class AuthThrottleAPITest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123',
+            role='guest'
+        )
+
+    def login(self, email='guest@example.com', ip='10.0.0.1'):
+        return self.client.post('/api/auth/login/', {
+            'email': email,
+            'password': 'wrong'
+        }, REMOTE_ADDR=ip)
+
+    def test_login_limited_by_email_across_ips(self):
+        with self.settings(REST_FRAMEWORK=REST_FRAMEWORK):
+            for i in range(3):
+                self.assertEqual(self.login(ip=f'10.0.0.{i}').status_code, 401)
+
+            response = self.login(ip='10.0.0.9')
+            self.assertEqual(response.status_code, 429)
+            self.assertGreater(int(response['Retry-After']), 0)
+
+            # Другой аккаунт с того же адреса не затронут
+            self.assertEqual(self.login(email='other@example.com', ip='10.0.0.9').status_code, 401)
+
+    def test_login_limited_by_ip(self):
+        with self.settings(REST_FRAMEWORK=REST_FRAMEWORK):
+            for i in range(5):
+                self.assertEqual(self.login(email=f'user{i}@example.com').status_code, 401)
+
+            response = self.login(email='user9@example.com')
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+
+            self.assertEqual(self.login(email='user9@example.com', ip='10.0.0.2').status_code, 401)
+
+    def test_password_reset_limited_by_email(self):
+        with self.settings(REST_FRAMEWORK=REST_FRAMEWORK):
+            for _ in range(2):
+                self.client.post('/api/auth/password-reset/', {'email': 'Guest@Example.com '})
+
+            response = self.client.post('/api/auth/password-reset/', {'email': 'guest@example.com'})
+            self.assertEqual(response.status_code, 429)
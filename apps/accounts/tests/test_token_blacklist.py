@@ -0,0 +1,120 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.accounts.authentication import PorterRefreshToken
+from apps.accounts.utils.token_blacklist import BloomFilter, TokenBlacklistIndex, blacklist_index
+
+User = get_user_model()
+
+
+class BloomFilterTest(SimpleTestCase):
+
+    def test_no_false_negatives_and_low_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        added = [uuid.uuid4().hex for _ in range(1000)]
+        for item in added:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in added))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistIndexTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        blacklist_index.reset()
+        self.user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123',
+            role='guest'
+        )
+
+    def tearDown(self):
+        blacklist_index.reset()
+
+    def blacklist_queries(self, context):
+        return [q for q in context.captured_queries if 'token_blacklist_blacklistedtoken' in q['sql']]
+
+    def test_valid_refresh_skips_blacklist_query(self):
+        PorterRefreshToken.for_user(self.user).blacklist()
+        token = str(PorterRefreshToken.for_user(self.user))
+        PorterRefreshToken(token)  # первая проверка загружает фильтр
+
+        with CaptureQueriesContext(connection) as context:
+            PorterRefreshToken(token)
+        self.assertEqual(self.blacklist_queries(context), [])
+
+    def test_logout_blacklists_refresh_token(self):
+        refresh = PorterRefreshToken.for_user(self.user)
+        PorterRefreshToken(str(refresh))
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post('/api/auth/logout/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertRaises(TokenError):
+            PorterRefreshToken(str(refresh))
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
+
+    def test_rotated_token_cannot_be_reused(self):
+        refresh = str(PorterRefreshToken.for_user(self.user))
+
+        self.assertEqual(self.client.post('/api/auth/token/refresh/', {'refresh': refresh}).status_code, 200)
+        self.assertEqual(self.client.post('/api/auth/token/refresh/', {'refresh': refresh}).status_code, 401)
+
+    def test_rotations_run_no_blacklist_sync_queries(self):
+        refresh = str(PorterRefreshToken.for_user(self.user))
+        refresh = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}).data['refresh']
+
+        counts = []
+        for _ in range(3):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh})
+            self.assertEqual(response.status_code, 200)
+            refresh = response.data['refresh']
+            counts.append(len(context))
+            # Ни дозагрузки фильтра, ни проверки jti в БД — только запись в чёрный список
+            self.assertEqual(
+                [q for q in self.blacklist_queries(context) if 'outstandingtoken' in q['sql']],
+                []
+            )
+        self.assertEqual(len(set(counts)), 1)
+
+    def test_blacklisted_by_other_process_is_seen_via_cache(self):
+        refresh = PorterRefreshToken.for_user(self.user)
+        PorterRefreshToken(str(refresh))
+
+        # Другой воркер пишет в БД и публикует jti в общем кэше
+        outstanding = OutstandingToken.objects.get(jti=refresh['jti'])
+        BlacklistedToken.objects.create(token=outstanding)
+        TokenBlacklistIndex().add(refresh['jti'])
+
+        with CaptureQueriesContext(connection) as context:
+            with self.assertRaises(TokenError):
+                PorterRefreshToken(str(refresh))
+        # Фильтр пополнен из кэша, в БД только уточнение попадания
+        self.assertEqual(len(self.blacklist_queries(context)), 1)
+
+    def test_evicted_recent_jti_falls_back_to_database(self):
+        refresh = PorterRefreshToken.for_user(self.user)
+        PorterRefreshToken(str(refresh))
+
+        outstanding = OutstandingToken.objects.get(jti=refresh['jti'])
+        BlacklistedToken.objects.create(token=outstanding)
+        TokenBlacklistIndex().add(refresh['jti'])
+        cache.delete('jwt:blacklist:recent:1')
+
+        with self.assertRaises(TokenError):
+            PorterRefreshToken(str(refresh))
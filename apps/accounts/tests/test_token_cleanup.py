@@ -0,0 +1,66 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.accounts.utils.token_cleanup import purge_expired_tokens
+
+User = get_user_model()
+
+
+class PurgeExpiredTokensTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email='guest@example.com',
+            first_name='Guest',
+            last_name='User',
+            password='testpass123',
+            role='guest'
+        )
+        now = timezone.now()
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user=user,
+                jti=f'jti-{i}',
+                token='token',
+                expires_at=now + timedelta(days=1 if i % 3 == 0 else -1)
+            )
+            for i in range(25)
+        ])
+        BlacklistedToken.objects.bulk_create([
+            BlacklistedToken(token=token)
+            for token in OutstandingToken.objects.order_by('id')[:10]
+        ])
+
+    def test_deletes_only_expired_in_batches(self):
+        batches = []
+
+        deleted, _ = purge_expired_tokens(
+            batch_size=4,
+            progress=lambda count, elapsed: batches.append(count)
+        )
+
+        self.assertEqual(deleted, 16)
+        self.assertEqual(batches[-1], 16)
+        self.assertGreater(len(batches), 1)
+        self.assertFalse(OutstandingToken.objects.filter(expires_at__lt=timezone.now()).exists())
+        self.assertEqual(OutstandingToken.objects.count(), 9)
+        self.assertEqual(BlacklistedToken.objects.count(), 4)
+
+    def test_command_reports_rate(self):
+        out = StringIO()
+        call_command('purge_expired_tokens', '--batch-size=10', '--sleep=0', stdout=out)
+
+        self.assertIn('Удалено истёкших токенов: 16', out.getvalue())
+        self.assertIn('строк/с', out.getvalue())
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            purge_expired_tokens(batch_size=0)
+        with self.assertRaises(CommandError):
+            call_command('purge_expired_tokens', '--batch-size=0', stdout=StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 25)
@@ -0,0 +1,116 @@
+import hashlib
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from PIL import Image
+from apps.accounts.models import DriverProfile, Car, CarImage
+from apps.accounts.uploads import ImageUploadHandler
+
+User = get_user_model()
+
+
+def png_bytes(size=(4, 4)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class FakeRequest:
+    pass
+
+
+class ImageUploadHandlerTest(SimpleTestCase):
+
+    def stream(self, content, chunk_size=64, max_size=10000):
+        request = FakeRequest()
+        handler = ImageUploadHandler(request, max_size=max_size)
+        handler.new_file('image', 'car.png', 'image/png', None)
+        received = 0
+        try:
+            for start in range(0, len(content), chunk_size):
+                handler.receive_data_chunk(content[start:start + chunk_size], start)
+                received += 1
+        except StopUpload:
+            return None, request.upload_errors, received
+        return handler.file_complete(len(content)), request.upload_errors, received
+
+    def test_valid_image_is_hashed_in_one_pass(self):
+        content = png_bytes()
+        uploaded, errors, _ = self.stream(content)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(uploaded.content_type, 'image/png')
+        self.assertEqual(uploaded.sha256, hashlib.sha256(content).hexdigest())
+        uploaded.close()
+
+    def test_wrong_signature_aborts_on_first_chunk(self):
+        uploaded, errors, received = self.stream(b'MZ' + b'\x00' * 5000)
+
+        self.assertIsNone(uploaded)
+        self.assertIn('image', errors)
+        self.assertEqual(received, 0)
+
+    def test_size_limit_aborts_without_reading_the_rest(self):
+        content = png_bytes() + b'\x00' * 100000
+        uploaded, errors, received = self.stream(content, chunk_size=1000, max_size=5000)
+
+        self.assertIsNone(uploaded)
+        self.assertIn('не должен превышать', errors['image'][0])
+        self.assertEqual(received, 5)
+
+
+@override_settings(MEDIA_ROOT='/tmp/porterkg-test-media')
+class CarImageUploadValidationTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='driver@example.com',
+            first_name='Driver',
+            last_name='User',
+            password='testpass123',
+            role='driver'
+        )
+        profile = DriverProfile.objects.create(
+            user=self.user,
+            phone_number='+996555123456',
+            driver_license_number='ABC123456',
+            driver_license_category='B'
+        )
+        Car.objects.create(
+            driver=profile,
+            marka='Toyota',
+            model='Camry',
+            color='Черный',
+            year=2020,
+            number_plate='01ABC123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content, content_type='image/png'):
+        return self.client.post(
+            '/api/auth/car/upload_image/',
+            {'image': SimpleUploadedFile('car.png', content, content_type=content_type)},
+            format='multipart'
+        )
+
+    def test_client_content_type_is_not_trusted(self):
+        response = self.upload(b'<?php echo "hi"; ?>' + b'\x00' * 100)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image', response.data)
+        self.assertFalse(CarImage.objects.exists())
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=1024)
+    def test_oversized_upload_is_rejected(self):
+        response = self.upload(png_bytes() + b'\x00' * 4096)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CarImage.objects.exists())
+
+    def test_valid_upload_gets_detected_content_type(self):
+        response = self.upload(png_bytes(), content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 201)
@@ -0,0 +1,155 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from apps.accounts.models import DriverProfile, GuestProfile, Car
+from apps.accounts.utils.user_io import UserImporter
+
+User = get_user_model()
+
+CSV = """email,first_name,last_name,role,password,phone_number,driver_license_number,driver_license_category,verified_driver,car_marka,car_model,car_color,car_year,car_number_plate,car_max_passengers
+Driver1@Example.com,Driver,One,driver,secret123,+996555000001,LIC1,B,true,Toyota,Camry,Черный,2020,01KG001,4
+guest1@example.com,Guest,One,guest,secret123,+996555000002,,,,,,,,,
+driver2@example.com,Driver,Two,driver,,+996555000003,LIC2,B,false,Honda,Fit,Синий,2015,01KG001,4
+,No,Email,guest,,,,,,,,,,,
+guest2@example.com,Guest,Two,admiral,,,,,,,,,,,
+"""
+
+
+class UserImportExportTest(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def run_import(self, path, **options):
+        out = io.StringIO()
+        call_command('import_users', path, stdout=out, stderr=io.StringIO(), **options)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        output = self.run_import(self.write('users.csv', CSV), batch_size=2)
+
+        self.assertIn('Создано пользователей: 2', output)
+        self.assertIn('ошибок: 3', output)
+
+        driver = User.objects.get(email='Driver1@example.com')
+        self.assertTrue(driver.check_password('secret123'))
+        profile = DriverProfile.objects.select_related('car').get(user=driver)
+        self.assertTrue(profile.verified_driver)
+        self.assertEqual(profile.car.year, 2020)
+
+        guest = User.objects.get(email='guest1@example.com')
+        self.assertTrue(GuestProfile.objects.filter(user=guest).exists())
+
+        # Номер авто уже занят первой строкой — водитель не создан целиком
+        self.assertFalse(User.objects.filter(email='driver2@example.com').exists())
+
+    def test_batch_size_must_be_positive(self):
+        path = self.write('users.csv', CSV)
+        with self.assertRaises(ValueError):
+            UserImporter(batch_size=0)
+        with self.assertRaises(CommandError):
+            call_command('import_users', path, '--batch-size=0', stdout=io.StringIO())
+        self.assertFalse(User.objects.exists())
+
+    def test_incomplete_rows_are_reported_not_fatal(self):
+        content = (
+            "email,first_name,last_name,role,phone_number,driver_license_number,"
+            "driver_license_category,car_marka,car_model,car_color,car_year,car_number_plate\n"
+            "nocar-year@example.com,No,Year,driver,+996555000001,LIC1,B,Toyota,Camry,Черный,,01KG001\n"
+            "nolicense@example.com,No,License,driver,+996555000002,,,,,,,\n"
+            "driver@example.com,Driver,Ok,driver,+996555000003,LIC3,B,Honda,Fit,Синий,2015,01KG003\n"
+            "admin@example.com,Admin,User,admin,,,,,,,,\n"
+        )
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_users', self.write('users.csv', content), stdout=out, stderr=err)
+
+        self.assertIn('Создано пользователей: 2', out.getvalue())
+        self.assertIn('ошибок: 2', out.getvalue())
+        self.assertIn('car_year', err.getvalue())
+        self.assertIn('driver_license_number', err.getvalue())
+        self.assertEqual(Car.objects.get().driver.user.email, 'driver@example.com')
+
+        admin = User.objects.get(email='admin@example.com')
+        self.assertFalse(GuestProfile.objects.filter(user=admin).exists())
+        self.assertFalse(DriverProfile.objects.filter(user=admin).exists())
+
+    def test_existing_users_are_skipped(self):
+        path = self.write('users.csv', CSV)
+        self.run_import(path)
+
+        output = self.run_import(path)
+        self.assertIn('Создано пользователей: 0', output)
+        self.assertIn('пропущено существующих: 2', output)
+        self.assertEqual(Car.objects.count(), 1)
+
+    def test_export_import_roundtrip_with_hash_workers(self):
+        self.run_import(self.write('users.csv', CSV))
+        export_path = os.path.join(self.dir.name, 'users.jsonl')
+        call_command(
+            'export_users', export_path,
+            include_password_hashes=True,
+            stderr=io.StringIO()
+        )
+        with open(export_path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([row['email'] for row in rows], ['Driver1@example.com', 'guest1@example.com'])
+        self.assertEqual(rows[0]['car_number_plate'], '01KG001')
+
+        User.objects.all().delete()
+        # Новые пароли хешируются в пуле, выгруженные хеши переносятся как есть
+        lines = [
+            json.dumps({'email': f'new{i}@example.com', 'first_name': 'N', 'last_name': str(i), 'password': 'pw'})
+            for i in range(5)
+        ]
+        with open(export_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        output = self.run_import(export_path, hash_workers=2, batch_size=3)
+
+        self.assertIn('Создано пользователей: 7', output)
+        self.assertTrue(User.objects.get(email='Driver1@example.com').check_password('secret123'))
+        self.assertTrue(User.objects.get(email='new4@example.com').check_password('pw'))
+        self.assertEqual(Car.objects.get().driver.user.email, 'Driver1@example.com')
+
+
+class BulkCreateUsersTest(TestCase):
+
+    def test_bulk_create_users(self):
+        User.objects.create_user(
+            email='existing@example.com',
+            first_name='Existing',
+            last_name='User',
+            password='old'
+        )
+        data = [
+            {'email': f'user{i}@EXAMPLE.com', 'first_name': 'U', 'last_name': str(i), 'password': f'pw{i}'}
+            for i in range(7)
+        ]
+        data += [
+            {'email': 'existing@example.com', 'first_name': 'X', 'last_name': 'X', 'password': 'new'},
+            {'email': 'user0@example.com', 'first_name': 'Dup', 'last_name': 'Dup'},
+            {'email': 'nopassword@example.com', 'first_name': 'N', 'last_name': 'P', 'role': 'driver'},
+        ]
+
+        # На каждую из 4 пачек: один IN по email и один INSERT в своей транзакции
+        with self.assertNumQueries(4 * (1 + 3)):
+            created = User.objects.bulk_create_users(data, batch_size=3, workers=2)
+
+        self.assertEqual(len(created), 8)
+        self.assertEqual(User.objects.count(), 9)
+        self.assertTrue(User.objects.get(email='user3@example.com').check_password('pw3'))
+        self.assertTrue(User.objects.get(email='existing@example.com').check_password('old'))
+        nopassword = User.objects.get(email='nopassword@example.com')
+        self.assertFalse(nopassword.has_usable_password())
+        self.assertEqual(nopassword.role, 'driver')
@@ -0,0 +1,122 @@
+"""
+Ограничение частоты запросов к эндпоинтам аутентификации
+
+Скользящее окно приближается двумя счётчиками фиксированных окон:
+текущего и предыдущего, вес предыдущего убывает по мере прохождения
+текущего окна. На запрос — add + incr по текущему окну и get предыдущего,
+без списка отметок времени и без гонки read-modify-write, которая есть
+у SimpleRateThrottle: incr атомарен и в Redis, и в LocMemCache.
+
+Частоты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] под ключом
+'<throttle_scope вьюхи>_<ip|email>', например 'login_email': '5/m'.
+Период может содержать множитель: '10/15m' — 10 запросов за 15 минут.
+"""
+import hashlib
+import math
+import re
+import time
+
+from django.core.cache import cache as default_cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])\w*$')
+
+
+def parse_rate(rate):
+    """'10/15m' -> (10, 900)"""
+    match = RATE_RE.match(rate.strip())
+    if match is None:
+        raise ImproperlyConfigured(f'Неверный формат частоты: {rate!r}')
+    num, multiplier, unit = match.groups()
+    return int(num), int(multiplier or 1) * PERIODS[unit]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Базовый класс: ключ запроса задают наследники в get_ident_key"""
+    cache = default_cache
+    cache_prefix = 'throttle'
+    key_kind = None
+    timer = time.time
+
+    def get_rate(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return None
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}_{self.key_kind}')
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = self.get_rate(view)
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        self.num_requests, self.duration = parse_rate(rate)
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        base = f'{self.cache_prefix}:{view.throttle_scope}:{self.key_kind}:{ident}'
+        current_key = f'{base}:{window}'
+
+        # Окно хранится, пока нужно как «предыдущее» следующему
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            # Ключ вытеснили между add и incr
+            self.cache.set(current_key, 1, self.duration * 2)
+            self.current = 1
+        self.previous = self.cache.get(f'{base}:{window - 1}', 0)
+
+        self.elapsed = self.now - window * self.duration
+        weight = 1 - self.elapsed / self.duration
+        # Отклонённые попытки тоже считаются: перебор не должен пережидать лимит
+        return self.previous * weight + self.current <= self.num_requests
+
+    def wait(self):
+        """Секунды до момента, когда следующий запрос уложится в лимит"""
+        limit = self.num_requests
+        # Следующий запрос сам увеличит счётчик на единицу
+        next_window = self.duration - self.elapsed
+        if self.current:
+            next_window += self.duration * max(0, 1 - (limit - 1) / self.current)
+        if self.current >= limit or not self.previous:
+            needed = next_window
+        else:
+            # Хватит и того, что вес предыдущего окна упадёт в текущем
+            needed = min(
+                next_window,
+                self.duration * (1 - (limit - self.current - 1) / self.previous) - self.elapsed
+            )
+        return max(1, math.ceil(needed))
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Лимит по IP клиента (учитывает NUM_PROXIES для X-Forwarded-For)"""
+    key_kind = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class AuthEmailThrottle(SlidingWindowThrottle):
+    """
+    Лимит по email из тела запроса: перебор паролей одного аккаунта
+    с разных адресов. В ключ попадает хэш, а не сам email.
+    """
+    key_kind = 'email'
+
+    def get_ident_key(self, request, view):
+        try:
+            email = request.data.get('email')
+        except AttributeError:
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
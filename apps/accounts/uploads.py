@@ -0,0 +1,96 @@
+"""
+Потоковая проверка загружаемых изображений
+
+ImageUploadHandler пишет файл на диск кусками по chunk_size и на лету
+проверяет сигнатуру формата (по байтам, а не по Content-Type клиента),
+размер и считает SHA-256. При превышении лимита или чужой сигнатуре
+разбор запроса прерывается сразу, остаток тела не читается. В памяти
+на загрузку держится не больше одного куска, сколько бы их ни шло
+одновременно.
+
+Подключается через ImageUploadMixin (views/mixins.py), ошибки попадают
+в request.upload_errors и возвращаются клиенту как ошибки валидации.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+# Сигнатуры поддерживаемых форматов: (смещение, байты)
+IMAGE_SIGNATURES = {
+    'image/jpeg': [(0, b'\xff\xd8\xff')],
+    'image/png': [(0, b'\x89PNG\r\n\x1a\n')],
+    'image/webp': [(0, b'RIFF'), (8, b'WEBP')],
+}
+SIGNATURE_LENGTH = 12
+
+
+def detect_image_type(header):
+    """MIME-тип по первым байтам файла или None"""
+    for content_type, parts in IMAGE_SIGNATURES.items():
+        if all(header[offset:offset + len(magic)] == magic for offset, magic in parts):
+            return content_type
+    return None
+
+
+def max_size_message(max_size):
+    return f"Размер изображения не должен превышать {filesizeformat(max_size)}"
+
+
+UNSUPPORTED_TYPE_MESSAGE = "Поддерживаются только форматы: JPEG, PNG, WebP"
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Запись во временный файл с проверкой формата, размера и SHA-256 за один проход"""
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.chunk_size = settings.IMAGE_UPLOAD_CHUNK_SIZE
+        self.max_size = max_size or settings.IMAGE_UPLOAD_MAX_SIZE
+        if request is not None and not hasattr(request, 'upload_errors'):
+            request.upload_errors = {}
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        self.size = 0
+        self.header = b''
+        self.detected_type = None
+        self.sha256 = hashlib.sha256()
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        # Заявленная длина части известна заранее — можно отказать, не читая тело
+        if content_length and content_length > self.max_size:
+            self.reject(max_size_message(self.max_size))
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.reject(max_size_message(self.max_size))
+
+        if self.detected_type is None:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) >= SIGNATURE_LENGTH:
+                self.check_signature()
+
+        self.sha256.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.detected_type is None:
+            self.check_signature()
+        file = super().file_complete(file_size)
+        file.content_type = self.detected_type
+        file.sha256 = self.sha256.hexdigest()
+        return file
+
+    def check_signature(self):
+        self.detected_type = detect_image_type(self.header)
+        if self.detected_type is None:
+            self.reject(UNSUPPORTED_TYPE_MESSAGE)
+
+    def reject(self, message):
+        if self.request is not None:
+            self.request.upload_errors[self.field_name] = [message]
+        self.file.close()
+        # Прервать разбор без дочитывания оставшегося тела запроса
+        raise StopUpload(connection_reset=True)
@@ -12,8 +12,11 @@ from .views import (
     MeAPIView,
     GuestProfileViewSet,
     DriverProfileViewSet,
+    DriverPublicViewSet,
     CarViewSet,
     MyProfileAPIView,
+    DriverLocationAPIView,
+    ProfileCacheStatsAPIView,
 )
 
 app_name = 'accounts'
@@ -22,6 +25,7 @@ router = DefaultRouter()
 router.register(r'profile/guest', GuestProfileViewSet, basename='guest-profile')
 router.register(r'profile/driver', DriverProfileViewSet, basename='driver-profile')
 router.register(r'car', CarViewSet, basename='car')
+router.register(r'drivers', DriverPublicViewSet, basename='driver-public')
 
 urlpatterns = [
     # ===== Аутентификация =====
@@ -43,6 +47,10 @@ urlpatterns = [
     # ===== Текущий пользователь =====
     path('me/', MeAPIView.as_view(), name='me'),
     path('my-profile/', MyProfileAPIView.as_view(), name='my-profile'),
+    path('cache-stats/', ProfileCacheStatsAPIView.as_view(), name='cache-stats'),
+
+    # ===== Местоположение водителя =====
+    path('location/', DriverLocationAPIView.as_view(), name='driver-location'),
 
     # ===== Router URLs (профили и автомобили) =====
     path('', include(router.urls)),
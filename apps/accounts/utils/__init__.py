@@ -1,9 +1,12 @@
 from .email import send_verification_email, send_password_reset_email
+from .email_queue import enqueue_email, process_email_queue
 from .tokens import generate_verification_token, verify_token
 
 __all__ = [
     'send_verification_email',
     'send_password_reset_email',
+    'enqueue_email',
+    'process_email_queue',
     'generate_verification_token',
     'verify_token',
 ]
\ No newline at end of file
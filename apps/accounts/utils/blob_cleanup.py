@@ -0,0 +1,58 @@
+"""
+Удаление файлов изображений без ссылок
+
+Кандидаты — ImageBlob с ref_count <= 0, не менявшиеся дольше grace-периода:
+файл мог быть только что записан загрузкой, строка модели которой ещё
+не закоммичена. Строки удаляются пачками в короткой транзакции с повторной
+проверкой счётчика, файлы — после коммита.
+"""
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import ImageBlob
+from ..storage import image_storage
+
+
+def sweep_image_blobs(grace_period, batch_size=500, storage=None, dry_run=False, progress=None):
+    """
+    Удалить файлы без ссылок старше grace_period (секунд).
+    progress(deleted, freed_bytes, elapsed) вызывается после каждой пачки.
+    Возвращает (удалено файлов, освобождено байт, затраченное время).
+    """
+    storage = storage or image_storage()
+    cutoff = timezone.now() - timedelta(seconds=grace_period)
+    orphans = ImageBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff).order_by('pk')
+
+    deleted = freed = 0
+    started = time.monotonic()
+    last_pk = 0
+    while True:
+        batch = orphans.filter(pk__gt=last_pk).values_list('pk', 'name', 'size')[:batch_size]
+        if dry_run:
+            batch = removed = list(batch)
+        else:
+            with transaction.atomic():
+                batch = list(batch)
+                pks = [pk for pk, _, _ in batch]
+                ImageBlob.objects.filter(
+                    pk__in=pks, ref_count__lte=0, updated_at__lt=cutoff
+                ).delete()
+                # Строки, на которые успели сослаться, пережили DELETE — их файлы нужны
+                survivors = set(ImageBlob.objects.filter(pk__in=pks).values_list('pk', flat=True))
+            removed = [row for row in batch if row[0] not in survivors]
+        if not batch:
+            break
+
+        last_pk = batch[-1][0]
+        for _, name, size in removed:
+            if not dry_run:
+                storage.delete(name)
+            deleted += 1
+            freed += size
+        if progress is not None:
+            progress(deleted, freed, time.monotonic() - started)
+
+    return deleted, freed, time.monotonic() - started
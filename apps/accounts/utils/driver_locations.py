@@ -0,0 +1,146 @@
+"""
+Позиции водителей и поиск ближайших свободных
+
+Каждый процесс держит свой DriverSpatialIndex. Собственные пинги попадают
+в него сразу, а в таблицу DriverLocation пишутся пачками через буфер
+(см. location_buffer). Позиции из других воркеров дозагружаются из таблицы
+не чаще раза в DRIVER_INDEX_SYNC_INTERVAL секунд.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import DriverLocation, DriverProfile
+from .geo import DriverSpatialIndex
+from .location_buffer import location_buffer
+
+# Запас на транзакции, закоммиченные позже своего updated_at
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_index = DriverSpatialIndex(cell_size=settings.DRIVER_INDEX_CELL_SIZE)
+_sync_lock = threading.Lock()
+_synced_until = None
+_synced_at = 0.0
+
+
+def get_availability(profile):
+    """Вместимость и доступность водителя для подбора"""
+    car = getattr(profile, 'car', None)
+    capacity = car.max_passengers if car is not None and car.is_active else 0
+    available = profile.verified_driver and profile.user.is_active and not profile.is_busy
+    return capacity, available
+
+
+def record_location(profile, latitude, longitude, heading=None, speed=None):
+    """
+    Обновить индекс процесса и поставить позицию в буфер записи в БД.
+    profile должен быть загружен с select_related('user', 'car').
+    """
+    location_buffer.add(profile.pk, latitude, longitude, heading, speed)
+
+    capacity, available = get_availability(profile)
+    _index.upsert(profile.pk, latitude, longitude, capacity, available, time.time())
+
+
+def sync_index(force=False):
+    """Дозагрузить в индекс позиции, изменённые с прошлой синхронизации"""
+    global _synced_until, _synced_at
+
+    if not force and time.monotonic() - _synced_at < settings.DRIVER_INDEX_SYNC_INTERVAL:
+        return _index
+
+    with _sync_lock:
+        if not force and time.monotonic() - _synced_at < settings.DRIVER_INDEX_SYNC_INTERVAL:
+            return _index
+
+        now = timezone.now()
+        if _synced_until is None or force:
+            since = now - timedelta(seconds=settings.DRIVER_LOCATION_TTL)
+        else:
+            since = _synced_until - SYNC_OVERLAP
+
+        rows = (
+            DriverLocation.objects
+            .filter(updated_at__gt=since)
+            .values_list(
+                'driver_id',
+                'latitude',
+                'longitude',
+                'updated_at',
+                'driver__verified_driver',
+                'driver__is_busy',
+                'driver__user__is_active',
+                'driver__car__max_passengers',
+                'driver__car__is_active',
+            )
+            .iterator(chunk_size=2000)
+        )
+        for driver_id, lat, lon, updated_at, verified, busy, user_active, capacity, car_active in rows:
+            _index.upsert(
+                driver_id,
+                lat,
+                lon,
+                capacity=capacity if car_active else 0,
+                available=verified and user_active and not busy,
+                updated_at=updated_at.timestamp(),
+                # Пинги этого процесса могут быть свежее ещё не сброшенной строки
+                only_newer=True,
+            )
+
+        _synced_until = now
+        _synced_at = time.monotonic()
+
+    return _index
+
+
+def find_nearest_drivers(latitude, longitude, limit=5, passengers=1, radius_km=None, exclude=()):
+    """
+    Ближайшие свободные верифицированные водители.
+    Возвращает список (профиль, расстояние_км), отсортированный по расстоянию.
+    """
+    index = sync_index()
+    nearest = index.nearest(
+        latitude,
+        longitude,
+        k=limit,
+        min_capacity=passengers,
+        max_distance_km=radius_km or settings.DRIVER_SEARCH_RADIUS_KM,
+        max_age=settings.DRIVER_LOCATION_TTL,
+        exclude=exclude,
+    )
+    if not nearest:
+        return []
+
+    profiles = (
+        DriverProfile.objects
+        .select_related('user', 'car')
+        .prefetch_related('car__images')
+        .in_bulk([driver_id for _, driver_id in nearest])
+    )
+    return [
+        (profiles[driver_id], distance)
+        for distance, driver_id in nearest
+        if driver_id in profiles
+    ]
+
+
+def mark_driver_busy(driver_id):
+    """
+    Убрать назначенного водителя из подбора в индексе процесса.
+    Свободным он снова станет со следующим пингом.
+    """
+    _index.set_availability(driver_id, available=False)
+
+
+def reset_index():
+    """Очистить индекс процесса (для тестов и бенчмарков)"""
+    global _synced_until, _synced_at
+
+    with _sync_lock:
+        location_buffer.clear()
+        _index.clear()
+        _synced_until = None
+        _synced_at = 0.0
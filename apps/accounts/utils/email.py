@@ -1,9 +1,9 @@
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
 from django.template.loader import render_to_string
+from .email_queue import enqueue_email
 
 
 def send_verification_email(user, request):
@@ -30,12 +30,11 @@ def send_verification_email(user, request):
 Команда Porter Kg
     '''
 
-    send_mail(
+    enqueue_email(
         subject,
         message,
-        settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=False,
+        from_email=settings.EMAIL_HOST_USER,
     )
 
 
@@ -64,12 +63,11 @@ def send_password_reset_email(user, request):
 Команда Porter Kg
     '''
 
-    send_mail(
+    enqueue_email(
         subject,
         message,
-        settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=False,
+        from_email=settings.EMAIL_HOST_USER,
     )
 
 
@@ -91,12 +89,11 @@ def send_welcome_email(user):
 Команда Porter Kg
     '''
 
-    send_mail(
+    enqueue_email(
         subject,
         message,
-        settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=True,
+        from_email=settings.EMAIL_HOST_USER,
     )
 
 
@@ -120,10 +117,9 @@ def send_driver_verification_email(driver_profile):
 Команда Porter Kg
     '''
 
-    send_mail(
+    enqueue_email(
         subject,
         message,
-        settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=True,
+        from_email=settings.EMAIL_HOST_USER,
     )
\ No newline at end of file
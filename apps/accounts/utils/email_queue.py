@@ -0,0 +1,142 @@
+"""
+Очередь исходящих писем
+
+Письма сохраняются в таблицу OutgoingEmail на потоке запроса, а отправляются
+воркером (manage.py send_queued_emails) пачками через одно SMTP-соединение.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import OutgoingEmail, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None):
+    """Поставить письмо в очередь на отправку"""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or '',
+        to=list(recipient_list),
+    )
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой"""
+    base = settings.EMAIL_QUEUE_RETRY_DELAY
+    return min(base * 2 ** (attempts - 1), settings.EMAIL_QUEUE_MAX_RETRY_DELAY)
+
+
+def release_stale_emails():
+    """Вернуть в очередь письма, зависшие у упавшего воркера"""
+    deadline = timezone.now() - timedelta(seconds=settings.EMAIL_QUEUE_LOCK_TIMEOUT)
+    return OutgoingEmail.objects.filter(
+        status=EmailStatus.SENDING,
+        locked_at__lt=deadline
+    ).update(status=EmailStatus.PENDING, locked_at=None)
+
+
+def claim_emails(batch_size):
+    """
+    Забрать пачку писем, готовых к отправке.
+    Строки помечаются статусом SENDING, поэтому несколько воркеров
+    не отправят одно и то же письмо дважды.
+    """
+    claimed_at = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmailStatus.PENDING, next_attempt_at__lte=claimed_at)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+
+        OutgoingEmail.objects.filter(
+            id__in=ids,
+            status=EmailStatus.PENDING
+        ).update(status=EmailStatus.SENDING, locked_at=claimed_at)
+
+    return list(
+        OutgoingEmail.objects
+        .filter(id__in=ids, status=EmailStatus.SENDING, locked_at=claimed_at)
+        .order_by('next_attempt_at', 'id')
+    )
+
+
+def process_email_queue(batch_size=None, connection=None):
+    """
+    Отправить одну пачку писем из очереди.
+    Возвращает кортеж (отправлено, ошибок).
+    """
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    release_stale_emails()
+
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0, 0
+
+    connection = connection or get_connection()
+    sent_ids = []
+    failed = []
+
+    is_open = False
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email or None,
+                to=email.to,
+                connection=connection,
+            )
+            try:
+                if not is_open:
+                    connection.open()
+                    is_open = True
+                message.send(fail_silently=False)
+                sent_ids.append(email.id)
+            except Exception as e:
+                logger.warning("Ошибка отправки письма #%s: %s", email.id, e)
+                email.last_error = str(e)
+                failed.append(email)
+                # После ошибки SMTP соединение может быть разорвано
+                connection.close()
+                is_open = False
+    finally:
+        connection.close()
+
+    now = timezone.now()
+    if sent_ids:
+        OutgoingEmail.objects.filter(id__in=sent_ids).update(
+            status=EmailStatus.SENT,
+            sent_at=now,
+            locked_at=None,
+            last_error=''
+        )
+
+    for email in failed:
+        email.attempts += 1
+        email.locked_at = None
+        if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            email.status = EmailStatus.FAILED
+        else:
+            email.status = EmailStatus.PENDING
+            email.next_attempt_at = now + timedelta(seconds=get_retry_delay(email.attempts))
+
+    if failed:
+        OutgoingEmail.objects.bulk_update(
+            failed,
+            ['attempts', 'status', 'next_attempt_at', 'locked_at', 'last_error']
+        )
+
+    return len(sent_ids), len(failed)
@@ -0,0 +1,198 @@
+"""
+Геометрия и пространственный индекс водителей
+
+Индекс хранит последние координаты водителей в ячейках равномерной сетки
+(в градусах). Поиск k ближайших обходит кольца ячеек вокруг точки запроса,
+пока следующее кольцо гарантированно не может содержать более близких
+водителей. Работает без PostGIS, только на стандартной библиотеке.
+"""
+import heapq
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Расстояние по дуге большого круга в километрах"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndexedDriver:
+    """Запись индекса: позиция водителя и признаки доступности"""
+    __slots__ = ('driver_id', 'latitude', 'longitude', 'capacity', 'available', 'updated_at', 'cell')
+
+    def __init__(self, driver_id, latitude, longitude, capacity, available, updated_at, cell):
+        self.driver_id = driver_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.capacity = capacity
+        self.available = available
+        self.updated_at = updated_at
+        self.cell = cell
+
+
+class DriverSpatialIndex:
+    """Сеточный индекс позиций водителей в памяти процесса"""
+
+    def __init__(self, cell_size=0.01):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._drivers = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._drivers)
+
+    def __contains__(self, driver_id):
+        return driver_id in self._drivers
+
+    def cell_for(self, latitude, longitude):
+        return (
+            math.floor(latitude / self.cell_size),
+            math.floor(longitude / self.cell_size),
+        )
+
+    def upsert(self, driver_id, latitude, longitude, capacity=0, available=True, updated_at=None,
+               only_newer=False):
+        """
+        Добавить или переместить водителя.
+        only_newer — не затирать запись с более свежей отметкой времени.
+        """
+        cell = self.cell_for(latitude, longitude)
+        entry = IndexedDriver(
+            driver_id,
+            latitude,
+            longitude,
+            capacity,
+            available,
+            time.time() if updated_at is None else updated_at,
+            cell,
+        )
+
+        with self._lock:
+            previous = self._drivers.get(driver_id)
+            if only_newer and previous is not None and previous.updated_at > entry.updated_at:
+                previous.capacity = capacity
+                previous.available = available
+                return
+            if previous is not None and previous.cell != cell:
+                self._discard_from_cell(previous)
+            self._drivers[driver_id] = entry
+            self._cells.setdefault(cell, {})[driver_id] = entry
+
+    def set_availability(self, driver_id, capacity=None, available=None):
+        """Обновить признаки доступности без изменения позиции"""
+        with self._lock:
+            entry = self._drivers.get(driver_id)
+            if entry is None:
+                return
+            if capacity is not None:
+                entry.capacity = capacity
+            if available is not None:
+                entry.available = available
+
+    def remove(self, driver_id):
+        with self._lock:
+            entry = self._drivers.pop(driver_id, None)
+            if entry is not None:
+                self._discard_from_cell(entry)
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._drivers.clear()
+
+    def nearest(self, latitude, longitude, k=5, min_capacity=1, max_distance_km=None,
+                max_age=None, exclude=()):
+        """
+        k ближайших доступных водителей с вместимостью не меньше min_capacity.
+        Возвращает список (расстояние_км, driver_id), отсортированный по расстоянию.
+        """
+        if k <= 0:
+            return []
+
+        oldest = time.time() - max_age if max_age is not None else None
+        center_row, center_col = self.cell_for(latitude, longitude)
+
+        # Нижняя граница расстояния до ячеек кольца: по широте и по долготе
+        # (долгота сжимается к полюсам, берём самую северную/южную широту)
+        lat_km = self.cell_size * KM_PER_DEGREE
+        best = []  # max-heap по расстоянию: (-distance, driver_id)
+
+        with self._lock:
+            if not self._drivers:
+                return []
+
+            max_ring = self._max_ring(latitude, longitude, max_distance_km)
+            ring = 0
+            while ring <= max_ring:
+                for cell in self._ring_cells(center_row, center_col, ring):
+                    bucket = self._cells.get(cell)
+                    if not bucket:
+                        continue
+                    for entry in bucket.values():
+                        if not entry.available or entry.capacity < min_capacity:
+                            continue
+                        if oldest is not None and entry.updated_at < oldest:
+                            continue
+                        if entry.driver_id in exclude:
+                            continue
+                        distance = haversine_km(latitude, longitude, entry.latitude, entry.longitude)
+                        if max_distance_km is not None and distance > max_distance_km:
+                            continue
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, entry.driver_id))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, entry.driver_id))
+
+                if len(best) == k:
+                    edge_lat = min(89.9, abs(latitude) + (ring + 1) * self.cell_size)
+                    lon_km = lat_km * math.cos(math.radians(edge_lat))
+                    if ring * min(lat_km, lon_km) > -best[0][0]:
+                        break
+                ring += 1
+
+        return sorted((-distance, driver_id) for distance, driver_id in best)
+
+    def _max_ring(self, latitude, longitude, max_distance_km):
+        if max_distance_km is None:
+            # Без ограничения радиуса обходим всю занятую область
+            rows = [row for row, _ in self._cells]
+            cols = [col for _, col in self._cells]
+            row, col = self.cell_for(latitude, longitude)
+            return max(
+                abs(max(rows) - row), abs(min(rows) - row),
+                abs(max(cols) - col), abs(min(cols) - col),
+                1,
+            ) + 1
+
+        edge_lat = min(89.9, abs(latitude) + max_distance_km / KM_PER_DEGREE)
+        lon_km = self.cell_size * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+        return int(max_distance_km / lon_km) + 1
+
+    @staticmethod
+    def _ring_cells(row, col, ring):
+        if ring == 0:
+            yield row, col
+            return
+        for dc in range(-ring, ring + 1):
+            yield row - ring, col + dc
+            yield row + ring, col + dc
+        for dr in range(-ring + 1, ring):
+            yield row + dr, col - ring
+            yield row + dr, col + ring
+
+    def _discard_from_cell(self, entry):
+        bucket = self._cells.get(entry.cell)
+        if bucket is not None:
+            bucket.pop(entry.driver_id, None)
+            if not bucket:
+                del self._cells[entry.cell]
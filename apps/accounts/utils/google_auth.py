@@ -0,0 +1,140 @@
+"""
+Проверка Google ID-токенов без сетевого запроса на каждый вход
+
+id_token.verify_oauth2_token скачивает сертификаты Google при каждом
+вызове. Здесь сертификаты держатся в памяти процесса столько, сколько
+разрешает Cache-Control: max-age ответа, скачиваются через общую
+requests.Session (keep-alive), а подпись проверяется локально.
+
+Источник ключей подменяемый: в тестах GoogleCertCache.set_source
+получает StaticKeySource с локальным набором сертификатов.
+"""
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class HTTPKeySource:
+    """Сертификаты Google по HTTP: возвращает ({kid: pem}, max_age)"""
+
+    def __init__(self, url=GOOGLE_CERTS_URL):
+        self.url = url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+
+    def fetch(self):
+        response = self.session.get(self.url, timeout=settings.GOOGLE_OAUTH2_CERTS_TIMEOUT)
+        response.raise_for_status()
+        match = MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+        max_age = int(match.group(1)) if match else None
+        return response.json(), max_age
+
+
+class StaticKeySource:
+    """Фиксированный набор сертификатов (тесты, офлайн-окружения)"""
+
+    def __init__(self, certs, max_age=None):
+        self.certs = certs
+        self.max_age = max_age
+
+    def fetch(self):
+        return dict(self.certs), self.max_age
+
+
+class GoogleCertCache:
+    """Сертификаты в памяти процесса с учётом max-age"""
+    timer = time.monotonic
+
+    def __init__(self, source=None):
+        self._source = source
+        self._lock = threading.Lock()
+        self._certs = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = HTTPKeySource()
+        return self._source
+
+    def set_source(self, source):
+        """Подменить источник ключей и сбросить закэшированные сертификаты"""
+        with self._lock:
+            self._source = source
+            self._certs = None
+            self._expires_at = 0.0
+            self._retry_at = 0.0
+
+    def get_certs(self, kid=None):
+        """
+        Актуальные сертификаты. Неизвестный kid (Google сменил ключи раньше
+        истечения max-age) вызывает внеочередную загрузку, но не чаще раза
+        в GOOGLE_OAUTH2_CERTS_RETRY секунд.
+        """
+        certs = self._certs
+        now = self.timer()
+        if certs is not None and now < self._expires_at and (kid is None or kid in certs):
+            return certs
+
+        with self._lock:
+            now = self.timer()
+            expired = self._certs is None or now >= self._expires_at
+            unknown_kid = kid is not None and self._certs is not None and kid not in self._certs
+            if (expired or unknown_kid) and (self._certs is None or now >= self._retry_at):
+                self._refresh(now)
+            return self._certs
+
+    def _refresh(self, now):
+        self._retry_at = now + settings.GOOGLE_OAUTH2_CERTS_RETRY
+        try:
+            certs, max_age = self.source.fetch()
+        except (requests.RequestException, ValueError):
+            if self._certs is None:
+                raise
+            # Google недоступен: продолжаем со старыми ключами до следующей попытки
+            return
+        if max_age is None:
+            max_age = settings.GOOGLE_OAUTH2_CERTS_DEFAULT_MAX_AGE
+        self._certs = certs
+        self._expires_at = now + max_age
+
+
+google_certs = GoogleCertCache()
+
+
+def verify_google_id_token(token, audience, cert_cache=None):
+    """
+    Проверить подпись, срок, аудиторию и издателя Google ID-токена.
+    Возвращает claims; при неверном токене бросает ValueError,
+    как id_token.verify_oauth2_token.
+    """
+    cert_cache = cert_cache or google_certs
+    try:
+        header = jwt.decode_header(token)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f'Неверный формат токена: {exc}')
+
+    try:
+        idinfo = jwt.decode(
+            token,
+            certs=cert_cache.get_certs(header.get('kid')),
+            audience=audience,
+            clock_skew_in_seconds=settings.GOOGLE_OAUTH2_CLOCK_SKEW,
+        )
+    except google_exceptions.GoogleAuthError as exc:
+        raise ValueError(str(exc))
+
+    if idinfo.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"Неверный издатель токена: {idinfo.get('iss')}")
+    return idinfo
@@ -0,0 +1,149 @@
+"""
+Производные изображений автомобилей
+
+После загрузки CarImage в пуле потоков создаются WebP-миниатюра и среднее
+изображение, записываются размеры оригинала. Метаданные (EXIF, GPS)
+в производные не попадают, а из оригинала удаляются пересохранением.
+Повторно загруженный файл получает готовые производные без обработки.
+Pillow отпускает GIL при декодировании, масштабировании и кодировании,
+поэтому потоков достаточно. Обработка ставится в очередь после коммита.
+
+CAR_IMAGE_WORKERS = 0 — обрабатывать синхронно (тесты, команды).
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from ..cache import invalidate_profile
+from ..models import CarImage, ImageBlob
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELDS = ('image', 'thumbnail', 'medium')
+
+# Форматы, в которых оригинал пересохраняется без метаданных
+STRIP_FORMATS = {'JPEG': {'quality': 95}, 'PNG': {}, 'WEBP': {'quality': 95}}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.CAR_IMAGE_WORKERS,
+                thread_name_prefix='car-images'
+            )
+        return _executor
+
+
+def render_variants(source):
+    """
+    Открыть изображение и построить производные.
+    Возвращает (ширина, высота, {вариант: bytes WebP}, оригинал без метаданных или None).
+    """
+    with Image.open(source) as original:
+        original_format = original.format
+        has_metadata = bool(original.info.get('exif') or original.getexif())
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    width, height = image.size
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    variants = {}
+    for name, size in settings.CAR_IMAGE_VARIANTS.items():
+        variant = image.copy()
+        variant.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format='WEBP', quality=settings.CAR_IMAGE_WEBP_QUALITY, method=4)
+        variants[name] = buffer.getvalue()
+
+    stripped = None
+    if has_metadata and original_format in STRIP_FORMATS:
+        buffer = io.BytesIO()
+        save_image = image.convert('RGB') if original_format == 'JPEG' else image
+        save_image.save(buffer, format=original_format, **STRIP_FORMATS[original_format])
+        stripped = buffer.getvalue()
+
+    return width, height, variants, stripped
+
+
+def _render_fields(car_image):
+    """Отрисовать производные и сохранить их в хранилище"""
+    with car_image.image.open('rb') as source:
+        width, height, variants, stripped = render_variants(source)
+
+    storage = car_image.image.storage
+    base = os.path.splitext(os.path.basename(car_image.image.name))[0]
+    fields = {'width': width, 'height': height}
+    for name, content in variants.items():
+        field = CarImage._meta.get_field(name)
+        path = field.generate_filename(car_image, f'{base}_{name}.webp')
+        fields[name] = storage.save(path, ContentFile(content))
+
+    if stripped is not None:
+        # Оригинал без метаданных — новый файл, старый освободится по счётчику ссылок
+        fields['image'] = storage.save(car_image.image.name, ContentFile(stripped))
+    return fields
+
+
+def _processed_duplicate_fields(car_image):
+    """Готовые производные другой записи с тем же файлом (повторная загрузка)"""
+    return (
+        CarImage.objects
+        .filter(image=car_image.image.name, width__isnull=False)
+        .exclude(pk=car_image.pk)
+        .values('width', 'height', *FILE_FIELDS[1:])
+        .first()
+    )
+
+
+def process_car_image(image_id):
+    """Создать производные для CarImage и сохранить их размеры и пути"""
+    car_image = CarImage.objects.select_related('car__driver').filter(pk=image_id).first()
+    if car_image is None:
+        return False
+
+    fields = _processed_duplicate_fields(car_image) or _render_fields(car_image)
+
+    previous = {
+        name: getattr(car_image, name).name
+        for name in FILE_FIELDS if name in fields
+    }
+    with transaction.atomic():
+        # update без save: не трогаем is_primary/order, изменённые за время обработки
+        CarImage.objects.filter(pk=image_id).update(**fields)
+        changed = [name for name, old in previous.items() if fields[name] != old]
+        ImageBlob.retain(*(fields[name] for name in changed))
+        ImageBlob.release(*(previous[name] for name in changed))
+
+    invalidate_profile(car_image.car.driver.user_id)
+    return True
+
+
+def _run(image_id):
+    try:
+        process_car_image(image_id)
+    except Exception:
+        logger.exception('Не удалось обработать изображение %s', image_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_processing(image_id):
+    """Поставить изображение в очередь обработки после коммита транзакции"""
+    if settings.CAR_IMAGE_WORKERS <= 0:
+        transaction.on_commit(lambda: process_car_image(image_id))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, image_id))
@@ -0,0 +1,221 @@
+"""
+Буфер пингов местоположения
+
+Пинги копятся в памяти процесса, от каждого водителя остаётся только
+последний. Буфер сбрасывается в DriverLocation одним UPSERT раз в
+DRIVER_LOCATION_FLUSH_INTERVAL_MS или при DRIVER_LOCATION_FLUSH_MAX_PINGS
+накопленных пингах. Сброс по времени выполняет фоновый поток.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+
+from ..models import DriverLocation, DriverProfile
+
+logger = logging.getLogger(__name__)
+
+LOCATION_FIELDS = ('latitude', 'longitude', 'heading', 'speed')
+STATS_LOG_INTERVAL = 60  # секунд между записями статистики в лог
+
+
+class LocationPingBuffer:
+    """Коалесцирующий буфер пингов с периодическим сбросом в БД"""
+
+    def __init__(self, flush_interval_ms=None, max_pings=None, background=True):
+        self._flush_interval_ms = flush_interval_ms
+        self._max_pings = max_pings
+        self.background = background
+
+        self._pending = {}
+        self._pending_pings = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.reset_stats()
+
+    @property
+    def flush_interval(self):
+        interval = self._flush_interval_ms
+        if interval is None:
+            interval = settings.DRIVER_LOCATION_FLUSH_INTERVAL_MS
+        return interval / 1000
+
+    @property
+    def max_pings(self):
+        if self._max_pings is None:
+            return settings.DRIVER_LOCATION_FLUSH_MAX_PINGS
+        return self._max_pings
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, driver_id, latitude, longitude, heading=None, speed=None):
+        """Принять пинг. Более ранний несброшенный пинг водителя заменяется."""
+        with self._lock:
+            self._pending[driver_id] = (latitude, longitude, heading, speed)
+            self._pending_pings += 1
+            self._received += 1
+            full = self._pending_pings >= self.max_pings
+
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+
+        if self.background:
+            self._ensure_flusher()
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+
+    def flush(self):
+        """Записать накопленные позиции. Возвращает количество строк."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                pings, self._pending_pings = self._pending_pings, 0
+
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                try:
+                    self._upsert(pending)
+                except IntegrityError:
+                    # Водитель удалён между пингом и сбросом: его позиции
+                    # отбрасываем, остальные записываем повторно
+                    pending = self._drop_missing_drivers(pending)
+                    self._upsert(pending)
+            except Exception:
+                # Возвращаем позиции в буфер, не затирая более свежие пинги
+                with self._lock:
+                    for driver_id, values in pending.items():
+                        self._pending.setdefault(driver_id, values)
+                    self._pending_pings += pings
+                raise
+
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._flushes += 1
+                self._rows_written += len(pending)
+                self._flush_time += elapsed
+                self._last_flush_latency = elapsed
+                self._max_flush_latency = max(self._max_flush_latency, elapsed)
+
+            logger.debug(
+                "Сброс позиций: %s строк из %s пингов за %.1f мс",
+                len(pending), pings, elapsed * 1000
+            )
+            return len(pending)
+
+    def _upsert(self, pending):
+        if not pending:
+            return
+        DriverLocation.objects.bulk_create(
+            [
+                DriverLocation(
+                    driver_id=driver_id,
+                    **dict(zip(LOCATION_FIELDS, values))
+                )
+                for driver_id, values in pending.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['driver'],
+            update_fields=[*LOCATION_FIELDS, 'updated_at'],
+        )
+
+    def _drop_missing_drivers(self, pending):
+        existing = set(
+            DriverProfile.objects.filter(pk__in=pending).values_list('pk', flat=True)
+        )
+        missing = pending.keys() - existing
+        if missing:
+            logger.warning("Отброшены пинги удалённых водителей: %s", sorted(missing))
+        return {driver_id: values for driver_id, values in pending.items() if driver_id in existing}
+
+    def stats(self):
+        """Пропускная способность приёма и задержка сброса"""
+        with self._lock:
+            uptime = time.monotonic() - self._started_at
+            return {
+                'received': self._received,
+                'rows_written': self._rows_written,
+                'pending': len(self._pending),
+                'coalesced': self._received - self._rows_written - self._pending_pings,
+                'flushes': self._flushes,
+                'pings_per_second': self._received / uptime if uptime else 0.0,
+                'avg_flush_ms': self._flush_time / self._flushes * 1000 if self._flushes else 0.0,
+                'last_flush_ms': self._last_flush_latency * 1000,
+                'max_flush_ms': self._max_flush_latency * 1000,
+            }
+
+    def reset_stats(self):
+        self._started_at = time.monotonic()
+        self._received = 0
+        self._rows_written = 0
+        self._flushes = 0
+        self._flush_time = 0.0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+
+    def clear(self):
+        """Отбросить несброшенные пинги (для тестов)"""
+        with self._lock:
+            self._pending.clear()
+            self._pending_pings = 0
+
+    def _ensure_flusher(self):
+        # После fork воркера поток родителя не существует — запускаем свой
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='location-buffer-flusher',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        reported_at = time.monotonic()
+        while True:
+            self._wakeup.wait(max(self.flush_interval, 0.05))
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Ошибка сброса буфера позиций")
+            finally:
+                close_old_connections()
+
+            if time.monotonic() - reported_at >= STATS_LOG_INTERVAL:
+                reported_at = time.monotonic()
+                stats = self.stats()
+                logger.info(
+                    "Пинги: %(received)s (%(pings_per_second).1f/с), записано строк: "
+                    "%(rows_written)s, сбросов: %(flushes)s, задержка сброса: "
+                    "средняя %(avg_flush_ms).1f мс, макс. %(max_flush_ms).1f мс",
+                    stats
+                )
+
+
+location_buffer = LocationPingBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        location_buffer.flush()
+    except Exception:
+        logger.exception("Не удалось сбросить буфер позиций при завершении")
@@ -0,0 +1,239 @@
+"""
+SMTP бэкенд с пулом постоянных соединений
+
+Вместо установки нового TLS-сессии и авторизации на каждое письмо бэкенд
+берёт уже открытое соединение из пула процесса и возвращает его обратно
+после отправки. Соединение закрывается после EMAIL_POOL_MAX_MESSAGES писем
+или если оно простаивало дольше EMAIL_POOL_IDLE_TIMEOUT секунд.
+"""
+import os
+import smtplib
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend
+
+
+class PooledConnection:
+    """Открытое SMTP соединение и его счётчики"""
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.last_used_at = time.monotonic()
+        self.messages_sent = 0
+
+
+class SMTPConnectionPool:
+    """Пул соединений к одному SMTP серверу"""
+
+    def __init__(self, size, max_messages, idle_timeout, ping_after):
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.connections_closed = 0
+        self.messages_sent = 0
+
+    def acquire(self):
+        """Взять живое соединение из пула или None, если свободных нет"""
+        while True:
+            with self._lock:
+                self._check_fork()
+                if not self._idle:
+                    return None
+                pooled = self._idle.pop()
+
+            idle_for = time.monotonic() - pooled.last_used_at
+            if idle_for > self.idle_timeout:
+                self.retire(pooled)
+                continue
+
+            if idle_for > self.ping_after and not self._is_alive(pooled):
+                self.retire(pooled)
+                continue
+
+            with self._lock:
+                self.connections_reused += 1
+            return pooled
+
+    def release(self, pooled):
+        """Вернуть соединение в пул или закрыть его, если оно отработало своё"""
+        pooled.last_used_at = time.monotonic()
+
+        with self._lock:
+            self._check_fork()
+            if pooled.messages_sent < self.max_messages and len(self._idle) < self.size:
+                self._idle.append(pooled)
+                return
+
+        self.retire(pooled)
+
+    def retire(self, pooled):
+        """Закрыть соединение"""
+        try:
+            pooled.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pooled.smtp.close()
+
+        self.record_close()
+
+    def record_open(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_close(self):
+        with self._lock:
+            self.connections_closed += 1
+
+    def record_sent(self, pooled):
+        pooled.messages_sent += 1
+        with self._lock:
+            self.messages_sent += 1
+
+    def clear(self):
+        """Закрыть все свободные соединения"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+
+        for pooled in idle:
+            self.retire(pooled)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+                'connections_closed': self.connections_closed,
+                'connections_idle': len(self._idle),
+                'messages_sent': self.messages_sent,
+                'messages_per_connection': (
+                    self.messages_sent / self.connections_opened
+                    if self.connections_opened else 0.0
+                ),
+            }
+
+    def _check_fork(self):
+        # После fork сокеты родителя не должны использоваться в дочернем процессе
+        if self._pid != os.getpid():
+            self._idle.clear()
+            self._pid = os.getpid()
+
+    @staticmethod
+    def _is_alive(pooled):
+        try:
+            return pooled.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, size=None, max_messages=None, idle_timeout=None):
+    """Пул соединений для набора параметров SMTP (создаётся один раз на процесс)"""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SMTPConnectionPool(
+                size=size or settings.EMAIL_POOL_SIZE,
+                max_messages=max_messages or settings.EMAIL_POOL_MAX_MESSAGES,
+                idle_timeout=idle_timeout or settings.EMAIL_POOL_IDLE_TIMEOUT,
+                ping_after=settings.EMAIL_POOL_PING_AFTER,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_stats():
+    """Счётчики всех пулов процесса"""
+    with _pools_lock:
+        pools = list(_pools.items())
+
+    return {
+        f"{host}:{port}": pool.stats()
+        for (host, port, *_), pool in pools
+    }
+
+
+def close_pools():
+    """Закрыть все свободные соединения и забыть пулы"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.clear()
+
+
+class PooledEmailBackend(EmailBackend):
+    """
+    SMTP бэкенд, переиспользующий соединения между вызовами send_messages
+    """
+
+    def __init__(self, *args, pool_size=None, max_messages=None, idle_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        key = (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+        self.pool = get_pool(
+            key,
+            size=pool_size,
+            max_messages=max_messages,
+            idle_timeout=idle_timeout,
+        )
+        self._pooled = None
+        self._broken = False
+
+    def open(self):
+        if self.connection:
+            return False
+
+        pooled = self.pool.acquire()
+        if pooled is None:
+            opened = super().open()
+            if not self.connection:
+                return opened
+            pooled = PooledConnection(self.connection)
+            self.pool.record_open()
+        else:
+            self.connection = pooled.smtp
+
+        self._pooled = pooled
+        self._broken = False
+        return True
+
+    def close(self):
+        if self.connection is None:
+            return
+
+        pooled, self._pooled = self._pooled, None
+        if pooled is None or self._broken:
+            if pooled is not None:
+                self.pool.record_close()
+            super().close()
+            return
+
+        self.connection = None
+        self.pool.release(pooled)
+
+    def _send(self, email_message):
+        try:
+            sent = super()._send(email_message)
+        except (smtplib.SMTPException, OSError):
+            self._broken = True
+            raise
+
+        if not sent and email_message.recipients():
+            # Ошибка была подавлена fail_silently, соединению больше не доверяем
+            self._broken = True
+        elif sent and self._pooled is not None:
+            self.pool.record_sent(self._pooled)
+        return sent
@@ -0,0 +1,170 @@
+"""
+Быстрая проверка чёрного списка refresh-токенов
+
+Каждый процесс держит bloom-фильтр jti из BlacklistedToken. Отрицательный
+ответ фильтра точен, поэтому обычное обновление токена обходится без SQL;
+только при попадании в фильтр чёрный список проверяется в БД.
+
+Новые jti процесс сразу добавляет в свой фильтр и публикует в общем кэше:
+счётчик SEQ_KEY и ключ RECENT_KEY на каждый номер. Остальные воркеры по
+счётчику забирают недостающие jti через get_many, без запросов к БД.
+Если ключи уже вытеснены или отставание слишком велико, фильтр
+дозагружается из БД по первичному ключу BlacklistedToken. Та же
+дозагрузка идёт раз в TOKEN_BLACKLIST_SYNC_INTERVAL секунд — для
+процессов без общего кэша. Периодически фильтр перестраивается только
+по неистёкшим токенам.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+SEQ_KEY = 'jwt:blacklist:seq'
+RECENT_KEY = 'jwt:blacklist:recent:{seq}'
+RECENT_TIMEOUT = 10 * 60
+# Больше jti за раз дешевле дочитать из БД, чем из кэша
+MAX_RECENT_FETCH = 1000
+# Запас на транзакции, закоммиченные позже строк с большими id
+SYNC_ID_OVERLAP = 100
+
+
+class BloomFilter:
+    """Bloom-фильтр строк на bytearray с двойным хешированием blake2b"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        if item in self:
+            return
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenBlacklistIndex:
+    """Bloom-фильтр чёрного списка с синхронизацией через кэш и из БД"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._seq = 0
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def is_blacklisted(self, jti):
+        self._maybe_sync()
+        if jti not in self._bloom:
+            return False
+        # Положительный ответ фильтра может быть ложным — уточняем в БД
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def add(self, jti):
+        """Учесть токен, только что занесённый в чёрный список, и опубликовать его"""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+        try:
+            seq = cache.incr(SEQ_KEY)
+        except ValueError:
+            cache.add(SEQ_KEY, 0, None)
+            seq = cache.incr(SEQ_KEY)
+        cache.set(RECENT_KEY.format(seq=seq), jti, RECENT_TIMEOUT)
+
+        with self._lock:
+            # Свой jti уже в фильтре — не забирать его из кэша повторно
+            if seq == self._seq + 1:
+                self._seq = seq
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            self._seq = 0
+            self._last_id = 0
+
+    def _maybe_sync(self):
+        now = time.monotonic()
+        if self._bloom is None or now - self._built_at >= settings.TOKEN_BLACKLIST_REBUILD_INTERVAL:
+            self._sync(cache.get(SEQ_KEY) or 0, rebuild=True)
+            return
+
+        seq = cache.get(SEQ_KEY) or 0
+        if seq > self._seq:
+            self._merge_recent(seq)
+        elif seq < self._seq:
+            # Счётчик пропал из кэша (очистка, перезапуск Redis)
+            self._sync(seq)
+        elif now - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+            self._sync(seq)
+
+    def _merge_recent(self, seq):
+        """Добавить jti, опубликованные другими процессами, из кэша"""
+        if seq - self._seq > MAX_RECENT_FETCH:
+            self._sync(seq)
+            return
+
+        keys = [RECENT_KEY.format(seq=n) for n in range(self._seq + 1, seq + 1)]
+        recent = cache.get_many(keys)
+        with self._lock:
+            for jti in recent.values():
+                self._bloom.add(jti)
+            self._seq = max(self._seq, seq)
+
+        if len(recent) < len(keys):
+            # Часть ключей вытеснена или ещё не записана — дочитываем из БД
+            self._sync(seq)
+
+    def _sync(self, seq, rebuild=False):
+        with self._lock:
+            if rebuild or self._bloom is None:
+                blacklisted = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+                capacity = max(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, blacklisted.count() * 2)
+                bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+                self._built_at = time.monotonic()
+            else:
+                # Только новые строки, по индексу первичного ключа
+                bloom = self._bloom
+                blacklisted = BlacklistedToken.objects.filter(pk__gt=self._last_id - SYNC_ID_OVERLAP)
+
+            last_id = self._last_id
+            rows = blacklisted.values_list('pk', 'token__jti').iterator(chunk_size=5000)
+            for pk, jti in rows:
+                bloom.add(jti)
+                last_id = max(last_id, pk)
+
+            self._bloom = bloom
+            self._seq = seq
+            self._last_id = last_id
+            self._synced_at = time.monotonic()
+
+            overfilled = bloom.count > bloom.capacity
+
+        # Переполненный фильтр даёт много ложных срабатываний — перестраиваем
+        if overfilled:
+            self._sync(seq, rebuild=True)
+
+
+blacklist_index = TokenBlacklistIndex()
@@ -0,0 +1,53 @@
+"""
+Удаление истёкших refresh-токенов
+
+Строки OutstandingToken удаляются окнами по диапазону первичного ключа,
+каждое окно — отдельная короткая транзакция. Между окнами делается пауза,
+чтобы не держать блокировку записи SQLite и не мешать обычным запросам.
+"""
+import time
+
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+def purge_expired_tokens(batch_size=1000, sleep=0.0, now=None, progress=None):
+    """
+    Удалить истёкшие токены (и их записи в чёрном списке).
+    progress(deleted, elapsed) вызывается после каждого окна.
+    Возвращает (удалено строк, затраченное время в секундах).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size должен быть не меньше 1")
+    now = now or timezone.now()
+    expired = OutstandingToken.objects.filter(expires_at__lt=now)
+    bounds = expired.aggregate(low=Min('id'), high=Max('id'))
+
+    deleted = 0
+    started = time.monotonic()
+    if bounds['low'] is None:
+        return deleted, 0.0
+
+    low = bounds['low']
+    while low <= bounds['high']:
+        high = low + batch_size
+        with transaction.atomic():
+            # Чёрный список удаляем сами одним DELETE, тогда у токенов
+            # не остаётся связанных строк и каскад не нужен
+            BlacklistedToken.objects.filter(
+                token_id__gte=low,
+                token_id__lt=high,
+                token__expires_at__lt=now
+            ).delete()
+            count, _ = expired.filter(id__gte=low, id__lt=high).delete()
+
+        deleted += count
+        low = high
+        if progress is not None:
+            progress(deleted, time.monotonic() - started)
+        if sleep and low <= bounds['high']:
+            time.sleep(sleep)
+
+    return deleted, time.monotonic() - started
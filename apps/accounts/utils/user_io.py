@@ -0,0 +1,341 @@
+"""
+Потоковые импорт и экспорт пользователей (CSV / JSONL)
+
+Одна строка файла — один пользователь с профилем и, для водителей,
+автомобилем. Колонки профиля и авто плоские, поля авто с префиксом car_.
+
+Экспорт читает пользователей через iterator(chunk_size=...), импорт
+читает файл построчно и пишет пачками: bulk_create пользователей,
+профилей и авто в одной транзакции на пачку. Пароли можно хешировать
+в пуле процессов: пока пачка вставляется, следующая уже хешируется.
+В памяти одновременно не больше двух пачек, размер файла не важен.
+"""
+import csv
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+
+from ..models import User, DriverProfile, GuestProfile, Car
+from ..managers.user_manager import hash_passwords, hashing_pool
+from ..models.user import UserRole
+
+USER_FIELDS = ('email', 'first_name', 'last_name', 'role', 'auth_type', 'is_verified', 'is_active')
+DRIVER_FIELDS = (
+    'phone_number',
+    'bio',
+    'experience_years',
+    'verified_driver',
+    'driver_license_number',
+    'driver_license_category',
+    'driver_license_expiry',
+)
+GUEST_FIELDS = ('phone_number', 'bio', 'birth_date')
+CAR_FIELDS = (
+    'marka',
+    'model',
+    'color',
+    'year',
+    'number_plate',
+    'vin_code',
+    'fuel_type',
+    'max_passengers',
+    'is_active',
+)
+CAR_PREFIX = 'car_'
+
+FORMATS = ('csv', 'jsonl')
+BOOLEANS = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+
+
+class InvalidRow(ValueError):
+    """Строка файла не может быть импортирована"""
+
+
+def detect_format(path, default='csv'):
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        return 'jsonl'
+    if path.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def export_columns(include_password_hashes=False):
+    columns = list(USER_FIELDS)
+    if include_password_hashes:
+        columns.append('password_hash')
+    columns += [field for field in dict.fromkeys(DRIVER_FIELDS + GUEST_FIELDS)]
+    columns += [CAR_PREFIX + field for field in CAR_FIELDS]
+    return columns
+
+
+# --- Экспорт ---
+
+def _dump_fields(instance, fields, prefix=''):
+    row = {}
+    for name in fields:
+        value = getattr(instance, name)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        row[prefix + name] = value
+    return row
+
+
+def iter_export_rows(queryset=None, chunk_size=2000, include_password_hashes=False):
+    """Строки экспорта; пользователи читаются курсором пачками по chunk_size"""
+    if queryset is None:
+        queryset = User.objects.all()
+    queryset = (
+        queryset
+        .select_related('driver_profile__car', 'guest_profile')
+        .order_by('pk')
+    )
+    for user in queryset.iterator(chunk_size=chunk_size):
+        row = _dump_fields(user, USER_FIELDS)
+        if include_password_hashes:
+            row['password_hash'] = user.password
+
+        driver = getattr(user, 'driver_profile', None)
+        guest = getattr(user, 'guest_profile', None)
+        if driver is not None:
+            row.update(_dump_fields(driver, DRIVER_FIELDS))
+            car = getattr(driver, 'car', None)
+            if car is not None:
+                row.update(_dump_fields(car, CAR_FIELDS, CAR_PREFIX))
+        elif guest is not None:
+            row.update(_dump_fields(guest, GUEST_FIELDS))
+        yield row
+
+
+def write_rows(rows, stream, fmt, columns):
+    """Записать строки в поток; возвращает их количество"""
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: '' if value is None else value for key, value in row.items()})
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False))
+            stream.write('\n')
+            count += 1
+    return count
+
+
+# --- Импорт ---
+
+def read_rows(stream, fmt):
+    """Строки файла по одной: (номер строки, dict)"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_num, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_num, InvalidRow(f'неверный JSON: {e}')
+                continue
+            yield line_num, row
+
+
+def _load_fields(model, row, fields, prefix=''):
+    """Непустые значения строки, приведённые к типам полей модели"""
+    values = {}
+    for name in fields:
+        value = row.get(prefix + name)
+        if value is None or value == '':
+            continue
+        field = model._meta.get_field(name)
+        if isinstance(field, models.BooleanField) and isinstance(value, str):
+            value = BOOLEANS.get(value.strip().lower(), value)
+        try:
+            values[name] = field.clean(value, None)
+        except ValidationError as e:
+            raise InvalidRow(f"{prefix + name}: {'; '.join(e.messages)}")
+    return values
+
+
+def _check_required(model, values, fields, prefix=''):
+    """Поля модели без значения по умолчанию, которые нельзя оставить пустыми"""
+    missing = [
+        prefix + name for name in fields
+        if name not in values
+        and not model._meta.get_field(name).blank
+        and not model._meta.get_field(name).has_default()
+    ]
+    if missing:
+        raise InvalidRow(f"обязательны: {', '.join(missing)}")
+
+
+class UserImporter:
+    """
+    Импорт строк пачками по batch_size.
+    hash_workers > 0 — хешировать пароли в пуле процессов.
+    """
+
+    def __init__(self, batch_size=1000, hash_workers=0, progress=None):
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть не меньше 1")
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers
+        self.progress = progress
+        self.stats = Counter()
+        self.errors = []
+        self._executor = None
+
+    def run(self, rows):
+        """Импортировать строки; возвращает (stats, затраченное время)"""
+        started = time.monotonic()
+        if self.hash_workers:
+            self._executor = hashing_pool(self.hash_workers)
+        try:
+            pending = None
+            rows = iter(rows)
+            while True:
+                chunk = list(itertools.islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                prepared = self.prepare(chunk, pending)
+                if pending is not None:
+                    self.insert(*pending)
+                pending = prepared
+                if self.progress:
+                    self.progress(self.stats, time.monotonic() - started)
+            if pending is not None:
+                self.insert(*pending)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        return self.stats, time.monotonic() - started
+
+    def invalid(self, line_num, message):
+        self.stats['invalid'] += 1
+        # Все ошибки не держим: файл может быть огромным
+        if len(self.errors) < 100:
+            self.errors.append(f'строка {line_num}: {message}')
+
+    def parse(self, line_num, row):
+        if isinstance(row, InvalidRow):
+            raise row
+        if not isinstance(row, dict):
+            raise InvalidRow('ожидается объект')
+
+        user_values = _load_fields(User, row, USER_FIELDS)
+        if not user_values.get('email'):
+            raise InvalidRow('email обязателен')
+        user_values['email'] = User.objects.normalize_email(user_values['email'])
+        role = user_values.setdefault('role', UserRole.GUEST)
+
+        # Профиль — только тот, что соответствует роли, как при регистрации
+        profile = None
+        car = {}
+        if role == UserRole.DRIVER:
+            profile = _load_fields(DriverProfile, row, DRIVER_FIELDS)
+            _check_required(DriverProfile, profile, DRIVER_FIELDS)
+            car = _load_fields(Car, row, CAR_FIELDS, CAR_PREFIX)
+            if car:
+                _check_required(Car, car, CAR_FIELDS, CAR_PREFIX)
+        elif role == UserRole.GUEST:
+            profile = _load_fields(GuestProfile, row, GUEST_FIELDS)
+
+        return user_values, row.get('password_hash') or None, row.get('password') or None, profile, car
+
+    def prepare(self, chunk, pending=None):
+        """
+        Разобрать пачку, отбросить уже существующих и запустить хеширование.
+        pending — предыдущая пачка, ещё не вставленная в БД.
+        """
+        parsed = []
+        for line_num, row in chunk:
+            try:
+                parsed.append((line_num, *self.parse(line_num, row)))
+            except InvalidRow as e:
+                self.invalid(line_num, e)
+
+        # Одним IN на пачку; предыдущая пачка в БД ещё не попала — сверяемся с ней
+        taken_emails = set(User.objects.filter(
+            email__in=[user_values['email'] for _, user_values, *_ in parsed]
+        ).values_list('email', flat=True))
+        taken_plates = set(Car.objects.filter(
+            number_plate__in=[car['number_plate'] for *_, car in parsed if car]
+        ).values_list('number_plate', flat=True))
+        if pending is not None:
+            for _, user_values, _, car in pending[0]:
+                taken_emails.add(user_values['email'])
+                if car:
+                    taken_plates.add(car['number_plate'])
+
+        rows = []
+        passwords = []
+        for line_num, user_values, password_hash, password, profile, car in parsed:
+            if user_values['email'] in taken_emails:
+                self.stats['skipped'] += 1
+                continue
+            if car and car['number_plate'] in taken_plates:
+                self.invalid(line_num, f"номер {car['number_plate']} уже занят")
+                continue
+            taken_emails.add(user_values['email'])
+            if car:
+                taken_plates.add(car['number_plate'])
+            if password_hash is None:
+                # make_password(None) даёт непригодный пароль, как create_user без пароля
+                passwords.append(password)
+            else:
+                user_values['password'] = password_hash
+            rows.append((line_num, user_values, profile, car))
+
+        return rows, hash_passwords(passwords, self._executor, self.hash_workers)
+
+    def insert(self, rows, hashes):
+        """Вставить пачку: пользователи, профили, авто — одной транзакцией"""
+        if not rows:
+            return
+
+        hashes = iter(hashes)
+        users = []
+        for _, user_values, profile, car in rows:
+            user = User(**user_values)
+            if not user.password:
+                user.password = next(hashes)
+            users.append((user, profile, car))
+
+        with transaction.atomic():
+            User.objects.bulk_create([user for user, _, _ in users])
+            drivers = []
+            guests = []
+            for user, profile, car in users:
+                if user.role == UserRole.DRIVER:
+                    drivers.append((DriverProfile(user=user, **profile), car))
+                elif user.role == UserRole.GUEST:
+                    guests.append(GuestProfile(user=user, **profile))
+            GuestProfile.objects.bulk_create(guests)
+            DriverProfile.objects.bulk_create([driver for driver, _ in drivers])
+            Car.objects.bulk_create([Car(driver=driver, **car) for driver, car in drivers if car])
+
+        self.stats['created'] += len(users)
+        self.stats['drivers'] += len(drivers)
+        self.stats['cars'] += sum(1 for _, car in drivers if car)
+
+
+def open_input(path):
+    if path == '-':
+        return sys.stdin
+    return open(path, newline='', encoding='utf-8')
+
+
+def open_output(path):
+    if path == '-':
+        return sys.stdout
+    return open(path, 'w', newline='', encoding='utf-8')
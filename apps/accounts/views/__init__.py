@@ -11,11 +11,16 @@ from .auth_views import (
 from .profile_views import (
     GuestProfileViewSet,
     DriverProfileViewSet,
+    DriverPublicViewSet,
     MyProfileAPIView,
+    ProfileCacheStatsAPIView,
 )
 from .car_views import (
     CarViewSet,
 )
+from .location_views import (
+    DriverLocationAPIView,
+)
 
 __all__ = [
     # Auth
@@ -31,8 +36,13 @@ __all__ = [
     # Profile
     'GuestProfileViewSet',
     'DriverProfileViewSet',
+    'DriverPublicViewSet',
     'MyProfileAPIView',
+    'ProfileCacheStatsAPIView',
 
     # Car
     'CarViewSet',
+
+    # Location
+    'DriverLocationAPIView',
 ]
\ No newline at end of file
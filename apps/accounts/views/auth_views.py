@@ -6,13 +6,9 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from django.conf import settings
-from django.core.mail import send_mail
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
-from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode
+from django.utils.encoding import force_str
 from django.contrib.auth.tokens import default_token_generator
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from ..serializers import (
@@ -25,15 +21,19 @@ from ..serializers import (
     TokenSerializer,
     UserSerializer
 )
+from ..authentication import PorterRefreshToken
+from ..throttling import AuthIPThrottle, AuthEmailThrottle
 from ..models import GuestProfile
-from ..utils.email import send_verification_email
+from ..cache import get_cached_profile
+from ..utils.email import send_verification_email, send_password_reset_email
+from ..utils.google_auth import verify_google_id_token
 
 User = get_user_model()
 
 
 def get_tokens_for_user(user):
     """Генерация JWT токенов для пользователя"""
-    refresh = RefreshToken.for_user(user)
+    refresh = PorterRefreshToken.for_user(user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -42,6 +42,8 @@ def get_tokens_for_user(user):
 
 class RegisterAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
+    throttle_scope = 'register'
     serializer_class = UserRegistrationSerializer
 
     @extend_schema(
@@ -72,6 +74,8 @@ class RegisterAPIView(APIView):
 
 class LoginAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
+    throttle_scope = 'login'
     serializer_class = UserLoginSerializer
 
     @extend_schema(
@@ -118,7 +122,7 @@ class LogoutAPIView(APIView):
         try:
             refresh_token = request.data.get('refresh')
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = PorterRefreshToken(refresh_token)
                 token.blacklist()
 
             return Response({
@@ -132,6 +136,8 @@ class LogoutAPIView(APIView):
 
 class GoogleAuthAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
+    throttle_scope = 'google_auth'
     serializer_class = GoogleAuthSerializer
 
     @extend_schema(
@@ -150,11 +156,7 @@ class GoogleAuthAPIView(APIView):
                         'error': 'Google OAuth2 не настроен'
                     }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-                idinfo = id_token.verify_oauth2_token(
-                    token,
-                    requests.Request(),
-                    CLIENT_ID
-                )
+                idinfo = verify_google_id_token(token, CLIENT_ID)
 
                 email = idinfo['email']
                 first_name = idinfo.get('given_name', '')
@@ -238,6 +240,8 @@ class VerifyEmailAPIView(APIView):
 
 class PasswordResetRequestAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthEmailThrottle]
+    throttle_scope = 'password_reset'
 
     @extend_schema(
         request=PasswordResetRequestSerializer,
@@ -250,32 +254,7 @@ class PasswordResetRequestAPIView(APIView):
 
             try:
                 user = User.objects.get(email=email)
-
-                token = default_token_generator.make_token(user)
-                uid = urlsafe_base64_encode(force_bytes(user.pk))
-
-                reset_link = f"{request.scheme}://{request.get_host()}/api/auth/password-reset-confirm/?token={token}&uid={uid}"
-
-                subject = 'Сброс пароля - Porter Kg'
-                message = f'''
-Здравствуйте, {user.first_name}!
-
-Вы запросили сброс пароля. Перейдите по ссылке для создания нового пароля:
-{reset_link}
-
-Если вы не запрашивали сброс пароля, проигнорируйте это письмо.
-
-С уважением,
-Команда Porter Kg
-                '''
-
-                send_mail(
-                    subject,
-                    message,
-                    settings.EMAIL_HOST_USER,
-                    [user.email],
-                    fail_silently=False,
-                )
+                send_password_reset_email(user, request)
 
             except User.DoesNotExist:
                 pass  # Для безопасности не говорим, что пользователь не найден
@@ -336,5 +315,9 @@ class MeAPIView(APIView):
         description="Получение информации о текущем авторизованном пользователе"
     )
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        data = get_cached_profile(
+            request.user.pk,
+            'me',
+            lambda: UserSerializer(request.user).data
+        )
+        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
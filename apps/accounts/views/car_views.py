@@ -2,7 +2,6 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 from ..models import Car, CarImage, DriverProfile
 from ..serializers import (
@@ -10,12 +9,17 @@ from ..serializers import (
     CarDetailSerializer,
     CarCreateUpdateSerializer,
     CarImageSerializer,
-    CarImageUploadSerializer
+    CarImageUploadSerializer,
+    CarImageBulkUploadSerializer,
+    CarImageReorderSerializer,
 )
 from ..permissions import IsDriver
+from ..cache import invalidate_profile
+from ..utils.images import schedule_processing
+from .mixins import DriverProfileMixin, ImageUploadMixin
 
 
-class CarViewSet(viewsets.ModelViewSet):
+class CarViewSet(ImageUploadMixin, DriverProfileMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsDriver]
 
     def get_serializer_class(self):
@@ -26,20 +30,16 @@ class CarViewSet(viewsets.ModelViewSet):
         return CarSerializer
 
     def get_queryset(self):
-        try:
-            driver_profile = DriverProfile.objects.get(user=self.request.user)
-            return Car.objects.filter(driver=driver_profile)
-        except DriverProfile.DoesNotExist:
-            return Car.objects.none()
+        return Car.objects.filter(driver__user_id=self.request.user.pk)
 
     @extend_schema(
         description="Создать автомобиль водителя"
     )
     def create(self, request, *args, **kwargs):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
+            driver_profile = self.get_driver_profile()
 
-            if Car.objects.filter(driver=driver_profile).exists():
+            if hasattr(driver_profile, 'car'):
                 return Response({
                     'error': 'У водителя уже есть машина. Используйте UPDATE.'
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -64,8 +64,7 @@ class CarViewSet(viewsets.ModelViewSet):
     )
     def update(self, request, *args, **kwargs):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
+            car = self.get_driver_car(with_images=True)
 
             serializer = self.get_serializer(car, data=request.data)
             if serializer.is_valid():
@@ -84,8 +83,7 @@ class CarViewSet(viewsets.ModelViewSet):
     )
     def partial_update(self, request, *args, **kwargs):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
+            car = self.get_driver_car(with_images=True)
 
             serializer = self.get_serializer(car, data=request.data, partial=True)
             if serializer.is_valid():
@@ -104,8 +102,8 @@ class CarViewSet(viewsets.ModelViewSet):
     )
     def list(self, request, *args, **kwargs):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = Car.objects.filter(driver=driver_profile).first()
+            driver_profile = self.get_driver_profile(with_images=True)
+            car = getattr(driver_profile, 'car', None)
 
             if car:
                 serializer = CarDetailSerializer(car)
@@ -127,8 +125,7 @@ class CarViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def upload_image(self, request):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
+            car = self.get_driver_car()
 
             serializer = CarImageUploadSerializer(data=request.data)
             if not serializer.is_valid():
@@ -142,7 +139,9 @@ class CarViewSet(viewsets.ModelViewSet):
             )
 
             if car_image.is_primary:
-                CarImage.objects.filter(car=car).exclude(id=car_image.id).update(is_primary=False)
+                invalidate_profile(request.user.pk)
+
+            schedule_processing(car_image.pk)
 
             return Response(
                 CarImageSerializer(car_image).data,
@@ -154,15 +153,74 @@ class CarViewSet(viewsets.ModelViewSet):
                 'error': 'Только водители могут загружать изображения'
             }, status=status.HTTP_403_FORBIDDEN)
 
+    @extend_schema(
+        request=CarImageBulkUploadSerializer,
+        description="Загрузить несколько изображений автомобиля одним запросом"
+    )
+    @action(detail=False, methods=['post'], url_path='upload-images')
+    def upload_images(self, request):
+        try:
+            car = self.get_driver_car()
+
+            serializer = CarImageBulkUploadSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            images = CarImage.objects.bulk_upload(
+                car,
+                serializer.validated_data['images'],
+                primary_index=serializer.validated_data.get('primary_index')
+            )
+
+            # bulk_create не отправляет сигналы — кэш профиля сбрасываем сами
+            invalidate_profile(request.user.pk)
+            for image in images:
+                schedule_processing(image.pk)
+
+            return Response(
+                CarImageSerializer(images, many=True).data,
+                status=status.HTTP_201_CREATED
+            )
+
+        except DriverProfile.DoesNotExist:
+            return Response({
+                'error': 'Только водители могут загружать изображения'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+    @extend_schema(
+        request=CarImageReorderSerializer,
+        description="Задать порядок всех изображений автомобиля"
+    )
+    @action(detail=False, methods=['post'], url_path='reorder-images')
+    def reorder_images(self, request):
+        try:
+            car = self.get_driver_car()
+
+            serializer = CarImageReorderSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                images = CarImage.objects.reorder(car, serializer.validated_data['image_ids'])
+            except ValueError as e:
+                return Response({'image_ids': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+            invalidate_profile(request.user.pk)
+
+            return Response(CarImageSerializer(images, many=True).data)
+
+        except DriverProfile.DoesNotExist:
+            return Response({
+                'error': 'Только водители могут изменять порядок изображений'
+            }, status=status.HTTP_403_FORBIDDEN)
+
     @extend_schema(
         description="Удалить изображение автомобиля"
     )
     @action(detail=False, methods=['delete'], url_path='delete-image/(?P<image_id>[0-9]+)')
     def delete_image(self, request, image_id=None):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
-            car_image = get_object_or_404(CarImage, id=image_id, car=car)
+            car_image = self.get_driver_car_image(image_id)
 
             car_image.delete()
 
@@ -181,9 +239,7 @@ class CarViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'], url_path='set-primary-image/(?P<image_id>[0-9]+)')
     def set_primary_image(self, request, image_id=None):
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
-            car_image = get_object_or_404(CarImage, id=image_id, car=car)
+            car_image = self.get_driver_car_image(image_id)
 
             car_image.set_as_primary()
 
@@ -203,8 +259,7 @@ class CarViewSet(viewsets.ModelViewSet):
     def activate(self, request):
         """Активация автомобиля"""
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
+            car = self.get_driver_car()
 
             car.activate()
 
@@ -224,8 +279,7 @@ class CarViewSet(viewsets.ModelViewSet):
     def deactivate(self, request):
         """Деактивация автомобиля"""
         try:
-            driver_profile = DriverProfile.objects.get(user=request.user)
-            car = get_object_or_404(Car, driver=driver_profile)
+            car = self.get_driver_car()
 
             car.deactivate()
 
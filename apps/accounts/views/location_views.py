@@ -0,0 +1,35 @@
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+from ..models import DriverProfile
+from ..serializers import DriverLocationSerializer
+from ..permissions import IsDriver
+from ..utils.driver_locations import record_location
+
+
+class DriverLocationAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsDriver]
+
+    @extend_schema(
+        request=DriverLocationSerializer,
+        description="Передать текущие координаты водителя"
+    )
+    def post(self, request):
+        serializer = DriverLocationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            profile = DriverProfile.objects.select_related('user', 'car').get(user_id=request.user.pk)
+        except DriverProfile.DoesNotExist:
+            return Response({
+                'error': 'Только водители могут передавать координаты'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        record_location(profile, **serializer.validated_data)
+
+        return Response({
+            'message': 'Координаты обновлены'
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,78 @@
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
+from ..models import Car, CarImage, DriverProfile
+from ..uploads import ImageUploadHandler
+
+
+class DriverProfileMixin:
+    """
+    Загрузка профиля водителя вместе с автомобилем (и его фото) одним запросом.
+    Результат запоминается на объекте запроса, поэтому повторные вызовы
+    в рамках одного запроса не обращаются к базе.
+    """
+
+    def get_driver_profile(self, with_images=False):
+        """Профиль текущего водителя или DriverProfile.DoesNotExist"""
+        request = self.request
+        cached = getattr(request, '_driver_profile_cache', None)
+
+        if cached is None or (with_images and not cached[1]):
+            queryset = DriverProfile.objects.select_related('user', 'car')
+            if with_images:
+                queryset = queryset.prefetch_related('car__images')
+            profile = queryset.filter(user_id=request.user.pk).first()
+            cached = (profile, with_images)
+            request._driver_profile_cache = cached
+
+        if cached[0] is None:
+            raise DriverProfile.DoesNotExist
+        return cached[0]
+
+    def get_driver_car(self, with_images=False):
+        """Автомобиль текущего водителя или Http404"""
+        profile = self.get_driver_profile(with_images)
+        try:
+            return profile.car
+        except Car.DoesNotExist:
+            raise Http404
+
+    def get_driver_car_image(self, image_id):
+        """
+        Изображение автомобиля текущего водителя одним запросом.
+        Профиль и автомобиль при этом тоже попадают в кэш запроса.
+        """
+        image = (
+            CarImage.objects
+            .select_related('car__driver__user')
+            .filter(pk=image_id, car__driver__user_id=self.request.user.pk)
+            .first()
+        )
+        if image is None:
+            # Различаем «нет профиля водителя» (403) и «нет изображения» (404)
+            self.get_driver_car()
+            raise Http404
+
+        if getattr(self.request, '_driver_profile_cache', None) is None:
+            self.request._driver_profile_cache = (image.car.driver, False)
+        return image
+
+
+class ImageUploadMixin:
+    """
+    Multipart-запросы разбираются ImageUploadHandler: формат, размер и SHA-256
+    проверяются при чтении потока. Тело разбирается до вызова обработчика,
+    чтобы отклонённая загрузка сразу вернула 400.
+    """
+    upload_max_size = None
+
+    def initial(self, request, *args, **kwargs):
+        request._request.upload_handlers = [
+            ImageUploadHandler(request._request, max_size=self.upload_max_size)
+        ]
+        super().initial(request, *args, **kwargs)
+
+        if (request.content_type or '').startswith('multipart/form-data'):
+            request.data
+            errors = getattr(request._request, 'upload_errors', None)
+            if errors:
+                raise ValidationError(errors)
@@ -1,7 +1,7 @@
 from rest_framework import status, viewsets
 from rest_framework.views import APIView
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
@@ -11,11 +11,53 @@ from ..serializers import (
     GuestProfileDetailSerializer,
     DriverProfileSerializer,
     DriverProfileDetailSerializer,
+    DriverPublicSerializer,
+    DriverPublicFilterSerializer,
+    NearbyDriversQuerySerializer,
 )
-from ..permissions import IsOwnerOrReadOnly
+from ..cache import get_cached_profile, get_profile_cache_stats
+from ..pagination import DriverKeysetPagination
+from ..permissions import IsOwnerOrReadOnly, IsAdmin
+from ..utils.driver_locations import find_nearest_drivers
+from .mixins import ImageUploadMixin
 
 
-class GuestProfileViewSet(viewsets.ModelViewSet):
+def _url_variant(request):
+    """С request URL файлов абсолютные — кэшируются отдельно для каждого хоста"""
+    if request is None:
+        return ''
+    return request.build_absolute_uri('/')
+
+
+def get_guest_profile_data(user, request=None):
+    """Сериализованный профиль гостя из кэша; None, если профиля нет"""
+    def build():
+        profile = GuestProfile.objects.filter(user=user).first()
+        if profile is None:
+            return None
+        return GuestProfileDetailSerializer(profile, context={'request': request}).data
+
+    return get_cached_profile(user.pk, 'guest', build, _url_variant(request))
+
+
+def get_driver_profile_data(user, request=None):
+    """Сериализованный профиль водителя с авто и фото из кэша; None, если профиля нет"""
+    def build():
+        profile = (
+            DriverProfile.objects
+            .select_related('user', 'car')
+            .prefetch_related('car__images')
+            .filter(user=user)
+            .first()
+        )
+        if profile is None:
+            return None
+        return DriverProfileDetailSerializer(profile, context={'request': request}).data
+
+    return get_cached_profile(user.pk, 'driver', build, _url_variant(request))
+
+
+class GuestProfileViewSet(ImageUploadMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_serializer_class(self):
@@ -33,14 +75,12 @@ class GuestProfileViewSet(viewsets.ModelViewSet):
         description="Получить профиль текущего гостя"
     )
     def list(self, request, *args, **kwargs):
-        try:
-            profile = GuestProfile.objects.get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data)
-        except GuestProfile.DoesNotExist:
+        data = get_guest_profile_data(request.user, request)
+        if data is None:
             return Response({
                 'error': 'Профиль гостя не найден'
             }, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
 
     @extend_schema(
         description="Обновить профиль гостя"
@@ -90,14 +130,12 @@ class DriverProfileViewSet(viewsets.ModelViewSet):
     )
     def list(self, request, *args, **kwargs):
         """Возвращаем только профиль текущего пользователя"""
-        try:
-            profile = DriverProfile.objects.get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data)
-        except DriverProfile.DoesNotExist:
+        data = get_driver_profile_data(request.user, request)
+        if data is None:
             return Response({
                 'error': 'Профиль водителя не найден'
             }, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
 
     @extend_schema(
         description="Обновить профиль водителя"
@@ -147,6 +185,79 @@ class DriverProfileViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_404_NOT_FOUND)
 
 
+class DriverPublicViewSet(viewsets.ReadOnlyModelViewSet):
+    """Публичный каталог водителей"""
+    permission_classes = [AllowAny]
+    serializer_class = DriverPublicSerializer
+    pagination_class = DriverKeysetPagination
+
+    def get_queryset(self):
+        queryset = (
+            DriverProfile.objects
+            .filter(user__is_active=True)
+            .select_related('user', 'car')
+            .prefetch_related('car__images')
+        )
+        if self.action != 'list':
+            return queryset
+
+        filters = DriverPublicFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        data = filters.validated_data
+
+        if data.get('verified') is not None:
+            queryset = queryset.filter(verified_driver=data['verified'])
+        if data.get('min_rating') is not None:
+            queryset = queryset.filter(rating__gte=data['min_rating'])
+        if data.get('fuel_type'):
+            queryset = queryset.filter(car__fuel_type=data['fuel_type'])
+        if data.get('passengers') is not None:
+            queryset = queryset.filter(car__max_passengers__gte=data['passengers'])
+        if data.get('car_active') is not None:
+            queryset = queryset.filter(car__is_active=data['car_active'])
+
+        return queryset
+
+    @extend_schema(
+        parameters=[DriverPublicFilterSerializer],
+        description="Список водителей с фильтрами, отсортированный по рейтингу"
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        description="Публичная информация о водителе"
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[NearbyDriversQuerySerializer],
+        description="Ближайшие свободные верифицированные водители"
+    )
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def nearby(self, request):
+        query = NearbyDriversQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
+
+        nearest = find_nearest_drivers(
+            data['latitude'],
+            data['longitude'],
+            limit=data['limit'],
+            passengers=data['passengers'],
+            radius_km=data.get('radius_km'),
+        )
+
+        return Response([
+            {
+                'distance_km': round(distance, 3),
+                'driver': DriverPublicSerializer(profile).data,
+            }
+            for profile, distance in nearest
+        ])
+
+
 class MyProfileAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -157,31 +268,37 @@ class MyProfileAPIView(APIView):
         user = request.user
 
         if user.role == 'guest':
-            try:
-                profile = GuestProfile.objects.get(user=user)
-                serializer = GuestProfileDetailSerializer(profile)
-                return Response({
-                    'role': 'guest',
-                    'profile': serializer.data
-                })
-            except GuestProfile.DoesNotExist:
+            data = get_guest_profile_data(user)
+            if data is None:
                 return Response({
                     'error': 'Профиль гостя не найден'
                 }, status=status.HTTP_404_NOT_FOUND)
+            return Response({
+                'role': 'guest',
+                'profile': data
+            })
 
         elif user.role == 'driver':
-            try:
-                profile = DriverProfile.objects.get(user=user)
-                serializer = DriverProfileDetailSerializer(profile)
-                return Response({
-                    'role': 'driver',
-                    'profile': serializer.data
-                })
-            except DriverProfile.DoesNotExist:
+            data = get_driver_profile_data(user)
+            if data is None:
                 return Response({
                     'error': 'Профиль водителя не найден'
                 }, status=status.HTTP_404_NOT_FOUND)
+            return Response({
+                'role': 'driver',
+                'profile': data
+            })
 
         return Response({
             'error': 'Неизвестная роль пользователя'
-        }, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProfileCacheStatsAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    @extend_schema(
+        description="Попадания и промахи кэша профилей в текущем процессе"
+    )
+    def get(self, request):
+        return Response(get_profile_cache_stats())
@@ -0,0 +1,43 @@
+from django.contrib import admin
+from .models import Trip, TripReview
+
+
+@admin.register(Trip)
+class TripAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'passenger',
+        'driver',
+        'status',
+        'passengers',
+        'created_at',
+        'completed_at'
+    ]
+    list_filter = ['status', 'created_at']
+    list_select_related = ['passenger', 'driver__user']
+    search_fields = ['passenger__email', 'driver__user__email']
+    raw_id_fields = ['passenger', 'driver']
+    readonly_fields = [
+        'created_at',
+        'assigned_at',
+        'started_at',
+        'completed_at',
+        'cancelled_at'
+    ]
+    date_hierarchy = 'created_at'
+
+
+@admin.register(TripReview)
+class TripReviewAdmin(admin.ModelAdmin):
+    list_display = [
+        'trip',
+        'driver',
+        'author',
+        'score',
+        'created_at'
+    ]
+    list_select_related = ['trip', 'driver__user', 'author']
+    search_fields = ['driver__user__email', 'author__email']
+    raw_id_fields = ['trip', 'driver', 'author']
+    readonly_fields = ['created_at']
+    date_hierarchy = 'created_at'
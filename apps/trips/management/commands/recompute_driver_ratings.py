@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.trips.utils import recompute_driver_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт агрегатов рейтинга водителей по таблице отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Размер пачки чтения и bulk_update'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = recompute_driver_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Обновлено водителей: {updated} за {time.monotonic() - started:.2f} с"
+        ))
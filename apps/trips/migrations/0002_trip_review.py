@@ -0,0 +1,36 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:01
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_driver_rating_aggregates'),
+        ('trips', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(100.0)], verbose_name='Оценка')),
+                ('comment', models.TextField(blank=True, max_length=1000, verbose_name='Комментарий')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trip_reviews', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='accounts.driverprofile', verbose_name='Водитель')),
+                ('trip', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review', to='trips.trip', verbose_name='Поездка')),
+            ],
+            options={
+                'verbose_name': 'Отзыв о поездке',
+                'verbose_name_plural': 'Отзывы о поездках',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['driver', 'created_at'], name='trips_tripr_driver__a2994b_idx')],
+            },
+        ),
+    ]
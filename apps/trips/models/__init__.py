@@ -0,0 +1,8 @@
+from .trip import Trip, TripStatus
+from .review import TripReview
+
+__all__ = [
+    'Trip',
+    'TripStatus',
+    'TripReview',
+]
@@ -0,0 +1,55 @@
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from apps.accounts.models import User, DriverProfile
+from .trip import Trip
+
+
+class TripReview(models.Model):
+    """Оценка водителя пассажиром по итогам поездки"""
+    trip = models.OneToOneField(
+        Trip,
+        on_delete=models.CASCADE,
+        related_name='review',
+        verbose_name='Поездка'
+    )
+    driver = models.ForeignKey(
+        DriverProfile,
+        on_delete=models.CASCADE,
+        related_name='reviews',
+        verbose_name='Водитель'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='trip_reviews',
+        verbose_name='Автор'
+    )
+
+    score = models.FloatField(
+        validators=[
+            MinValueValidator(0.0),
+            MaxValueValidator(100.0)
+        ],
+        verbose_name='Оценка'
+    )
+    comment = models.TextField(
+        max_length=1000,
+        blank=True,
+        verbose_name='Комментарий'
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        verbose_name = 'Отзыв о поездке'
+        verbose_name_plural = 'Отзывы о поездках'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['driver', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Отзыв о поездке #{self.trip_id}: {self.score}"
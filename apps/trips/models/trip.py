@@ -0,0 +1,116 @@
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from apps.accounts.models import User, DriverProfile
+
+
+class TripStatus(models.TextChoices):
+    """Статусы поездки"""
+    REQUESTED = 'requested', 'Ожидает водителя'
+    ASSIGNED = 'assigned', 'Водитель назначен'
+    STARTED = 'started', 'В пути'
+    COMPLETED = 'completed', 'Завершена'
+    CANCELLED = 'cancelled', 'Отменена'
+
+
+class Trip(models.Model):
+    passenger = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='trips',
+        verbose_name='Пассажир'
+    )
+    driver = models.ForeignKey(
+        DriverProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trips',
+        verbose_name='Водитель'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=TripStatus.choices,
+        default=TripStatus.REQUESTED,
+        verbose_name='Статус'
+    )
+
+    passengers = models.PositiveIntegerField(
+        default=1,
+        validators=[
+            MinValueValidator(1),
+            MaxValueValidator(50)
+        ],
+        verbose_name='Количество пассажиров'
+    )
+    pickup_latitude = models.FloatField(
+        validators=[
+            MinValueValidator(-90.0),
+            MaxValueValidator(90.0)
+        ],
+        verbose_name='Широта посадки'
+    )
+    pickup_longitude = models.FloatField(
+        validators=[
+            MinValueValidator(-180.0),
+            MaxValueValidator(180.0)
+        ],
+        verbose_name='Долгота посадки'
+    )
+    dropoff_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[
+            MinValueValidator(-90.0),
+            MaxValueValidator(90.0)
+        ],
+        verbose_name='Широта высадки'
+    )
+    dropoff_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[
+            MinValueValidator(-180.0),
+            MaxValueValidator(180.0)
+        ],
+        verbose_name='Долгота высадки'
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    assigned_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата назначения'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата начала'
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата завершения'
+    )
+    cancelled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отмены'
+    )
+
+    class Meta:
+        verbose_name = 'Поездка'
+        verbose_name_plural = 'Поездки'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Поездка #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_active(self):
+        return self.status in (TripStatus.REQUESTED, TripStatus.ASSIGNED, TripStatus.STARTED)
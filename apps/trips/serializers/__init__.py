@@ -0,0 +1,11 @@
+from .trip_serializers import (
+    TripSerializer,
+    TripCreateSerializer,
+    TripReviewSerializer,
+)
+
+__all__ = [
+    'TripSerializer',
+    'TripCreateSerializer',
+    'TripReviewSerializer',
+]
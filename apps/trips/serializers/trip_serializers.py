@@ -0,0 +1,57 @@
+from rest_framework import serializers
+from ..models import Trip, TripReview
+
+
+class TripSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    passenger_name = serializers.CharField(source='passenger.full_name', read_only=True)
+    driver_name = serializers.CharField(source='driver.user.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Trip
+        fields = [
+            'id',
+            'status',
+            'status_display',
+            'passenger',
+            'passenger_name',
+            'driver',
+            'driver_name',
+            'passengers',
+            'pickup_latitude',
+            'pickup_longitude',
+            'dropoff_latitude',
+            'dropoff_longitude',
+            'created_at',
+            'assigned_at',
+            'started_at',
+            'completed_at',
+            'cancelled_at'
+        ]
+        read_only_fields = fields
+
+
+class TripCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Trip
+        fields = [
+            'passengers',
+            'pickup_latitude',
+            'pickup_longitude',
+            'dropoff_latitude',
+            'dropoff_longitude'
+        ]
+
+
+class TripReviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TripReview
+        fields = [
+            'id',
+            'trip',
+            'driver',
+            'score',
+            'comment',
+            'created_at'
+        ]
+        read_only_fields = ['id', 'trip', 'driver', 'created_at']
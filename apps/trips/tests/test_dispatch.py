@@ -0,0 +1,257 @@
+import threading
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+from apps.accounts.models import DriverProfile, Car
+from apps.accounts.utils.driver_locations import reset_index
+from apps.trips.models import Trip, TripStatus
+from apps.trips.utils import (
+    TripTransitionError,
+    assign_driver,
+    start_trip,
+    complete_trip,
+    cancel_trip,
+)
+
+User = get_user_model()
+
+
+def create_driver(i, verified=True):
+    user = User.objects.create_user(
+        email=f'driver{i}@example.com',
+        first_name='Driver',
+        last_name=str(i),
+        password='testpass123',
+        role='driver'
+    )
+    profile = DriverProfile.objects.create(
+        user=user,
+        phone_number='+996555123456',
+        driver_license_number=f'ABC{i}',
+        driver_license_category='B',
+        verified_driver=verified
+    )
+    Car.objects.create(
+        driver=profile,
+        marka='Toyota',
+        model='Camry',
+        color='Черный',
+        year=2020,
+        number_plate=f'01ABC{i}'
+    )
+    return profile
+
+
+def create_passenger(email='guest@example.com'):
+    return User.objects.create_user(
+        email=email,
+        first_name='Guest',
+        last_name='User',
+        password='testpass123',
+        role='guest'
+    )
+
+
+def create_trip(passenger):
+    return Trip.objects.create(
+        passenger=passenger,
+        pickup_latitude=42.87,
+        pickup_longitude=74.59
+    )
+
+
+class TripLifecycleTest(TestCase):
+
+    def setUp(self):
+        self.driver = create_driver(0)
+        self.passenger = create_passenger()
+
+    def test_full_lifecycle_updates_counters(self):
+        trip = create_trip(self.passenger)
+
+        self.assertEqual(assign_driver(trip, [self.driver.pk]), self.driver.pk)
+        start_trip(trip)
+        complete_trip(trip)
+
+        trip.refresh_from_db()
+        self.driver.refresh_from_db()
+        self.assertEqual(trip.status, TripStatus.COMPLETED)
+        self.assertEqual(self.driver.total_trips, 1)
+        self.assertFalse(self.driver.is_busy)
+
+    def test_complete_after_driver_profile_deleted(self):
+        trip = create_trip(self.passenger)
+        assign_driver(trip, [self.driver.pk])
+        start_trip(trip)
+        self.driver.delete()
+
+        complete_trip(trip)
+
+        trip.refresh_from_db()
+        self.assertEqual(trip.status, TripStatus.COMPLETED)
+        self.assertIsNone(trip.driver_id)
+
+        # Заявка, загруженная уже без водителя
+        other = create_trip(self.passenger)
+        Trip.objects.filter(pk=other.pk).update(status=TripStatus.STARTED)
+        complete_trip(Trip.objects.get(pk=other.pk))
+        self.assertEqual(Trip.objects.get(pk=other.pk).status, TripStatus.COMPLETED)
+
+    def test_busy_driver_is_not_assigned_twice(self):
+        first, second = create_trip(self.passenger), create_trip(self.passenger)
+
+        self.assertEqual(assign_driver(first, [self.driver.pk]), self.driver.pk)
+        self.assertIsNone(assign_driver(second, [self.driver.pk]))
+        self.assertEqual(Trip.objects.get(pk=second.pk).status, TripStatus.REQUESTED)
+
+    def test_cancel_releases_driver(self):
+        trip = create_trip(self.passenger)
+        assign_driver(trip, [self.driver.pk])
+
+        cancel_trip(trip)
+
+        self.driver.refresh_from_db()
+        self.assertFalse(self.driver.is_busy)
+        self.assertEqual(self.driver.total_trips, 0)
+        with self.assertRaises(TripTransitionError):
+            start_trip(trip)
+
+    def test_assign_to_cancelled_trip_keeps_driver_free(self):
+        trip = create_trip(self.passenger)
+        cancel_trip(create_trip(self.passenger))
+        Trip.objects.filter(pk=trip.pk).update(status=TripStatus.CANCELLED)
+
+        with self.assertRaises(TripTransitionError):
+            assign_driver(trip, [self.driver.pk])
+
+        self.driver.refresh_from_db()
+        self.assertFalse(self.driver.is_busy)
+
+
+@override_settings(DRIVER_LOCATION_FLUSH_INTERVAL_MS=0)
+class TripAPITest(APITestCase):
+
+    def setUp(self):
+        reset_index()
+        self.driver = create_driver(0)
+        self.passenger = create_passenger()
+
+    def tearDown(self):
+        reset_index()
+
+    def test_request_assigns_nearest_driver_and_driver_completes(self):
+        self.client.force_authenticate(self.driver.user)
+        self.client.post('/api/auth/location/', {'latitude': 42.871, 'longitude': 74.591})
+
+        self.client.force_authenticate(self.passenger)
+        response = self.client.post('/api/trips/', {
+            'pickup_latitude': 42.87,
+            'pickup_longitude': 74.59,
+            'passengers': 2,
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], TripStatus.ASSIGNED)
+        self.assertEqual(response.data['driver'], self.driver.pk)
+        trip_id = response.data['id']
+
+        # Пассажир не может начать поездку за водителя
+        response = self.client.post(f'/api/trips/{trip_id}/start/')
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(self.driver.user)
+        self.assertEqual(self.client.post(f'/api/trips/{trip_id}/start/').status_code, 200)
+        response = self.client.post(f'/api/trips/{trip_id}/complete/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], TripStatus.COMPLETED)
+
+        response = self.client.post(f'/api/trips/{trip_id}/cancel/')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.passenger)
+        response = self.client.post(f'/api/trips/{trip_id}/review/', {'score': 90})
+        self.assertEqual(response.status_code, 201)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.rating_count, 1)
+
+    def test_request_without_drivers_stays_requested(self):
+        self.client.force_authenticate(self.passenger)
+        response = self.client.post('/api/trips/', {
+            'pickup_latitude': 42.87,
+            'pickup_longitude': 74.59,
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], TripStatus.REQUESTED)
+        response = self.client.post(f"/api/trips/{response.data['id']}/assign/")
+        self.assertEqual(response.status_code, 409)
+
+
+class DispatchConcurrencyTest(TransactionTestCase):
+    """Много диспетчеров одновременно разбирают один пул водителей"""
+    drivers_count = 5
+    threads_count = 16
+
+    def setUp(self):
+        self.drivers = [create_driver(i) for i in range(self.drivers_count)]
+        passenger = create_passenger()
+        self.trips = [create_trip(passenger) for _ in range(self.threads_count)]
+
+    def test_each_driver_assigned_once(self):
+        candidate_ids = [driver.pk for driver in self.drivers]
+        barrier = threading.Barrier(self.threads_count)
+        errors = []
+
+        def dispatch(trip):
+            try:
+                barrier.wait()
+                assign_driver(trip, candidate_ids)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=dispatch, args=(trip,)) for trip in self.trips]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        assigned = Counter(
+            Trip.objects.filter(status=TripStatus.ASSIGNED).values_list('driver_id', flat=True)
+        )
+        self.assertEqual(set(assigned), set(candidate_ids))
+        self.assertTrue(all(count == 1 for count in assigned.values()))
+        self.assertEqual(DriverProfile.objects.filter(is_busy=True).count(), self.drivers_count)
+
+    def test_concurrent_completions_do_not_lose_trips(self):
+        driver = self.drivers[0]
+        Trip.objects.filter(pk__in=[trip.pk for trip in self.trips]).update(
+            status=TripStatus.STARTED,
+            driver=driver
+        )
+        trips = list(Trip.objects.all())
+        barrier = threading.Barrier(self.threads_count)
+        errors = []
+
+        def finish(trip):
+            try:
+                barrier.wait()
+                complete_trip(trip)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=finish, args=(trip,)) for trip in trips]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        driver.refresh_from_db()
+        self.assertEqual(driver.total_trips, self.threads_count)
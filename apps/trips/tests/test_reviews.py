@@ -0,0 +1,138 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from apps.accounts.models import DriverProfile
+from apps.trips.models import Trip, TripStatus, TripReview
+from apps.trips.utils import TripTransitionError, submit_review, recompute_driver_ratings
+
+User = get_user_model()
+
+
+def create_driver():
+    user = User.objects.create_user(
+        email='driver@example.com',
+        first_name='Driver',
+        last_name='User',
+        password='testpass123',
+        role='driver'
+    )
+    return DriverProfile.objects.create(
+        user=user,
+        phone_number='+996555123456',
+        driver_license_number='ABC123456',
+        driver_license_category='B'
+    )
+
+
+def create_completed_trips(driver, count):
+    passenger = User.objects.create_user(
+        email='guest@example.com',
+        first_name='Guest',
+        last_name='User',
+        password='testpass123',
+        role='guest'
+    )
+    Trip.objects.bulk_create([
+        Trip(
+            passenger=passenger,
+            driver=driver,
+            status=TripStatus.COMPLETED,
+            pickup_latitude=42.87,
+            pickup_longitude=74.59
+        )
+        for _ in range(count)
+    ])
+    return list(Trip.objects.select_related('driver', 'passenger').order_by('id'))
+
+
+class TripReviewTest(TestCase):
+
+    def setUp(self):
+        self.driver = create_driver()
+        self.trips = create_completed_trips(self.driver, 3)
+
+    def test_reviews_update_aggregates(self):
+        for trip, score in zip(self.trips, [100.0, 80.0, 60.0]):
+            submit_review(trip, trip.passenger, score)
+
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.rating_count, 3)
+        self.assertAlmostEqual(self.driver.rating_sum, 240.0)
+        self.assertAlmostEqual(self.driver.rating, 80.0)
+        self.assertAlmostEqual(self.driver.rating_ewma, (100 * 0.9 + 80 * 0.1) * 0.9 + 60 * 0.1)
+
+    def test_one_review_per_trip(self):
+        trip = self.trips[0]
+        submit_review(trip, trip.passenger, 90.0)
+
+        with self.assertRaises(TripTransitionError):
+            submit_review(trip, trip.passenger, 10.0)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.rating_count, 1)
+
+    def test_only_completed_trip(self):
+        trip = self.trips[0]
+        trip.status = TripStatus.STARTED
+
+        with self.assertRaises(TripTransitionError):
+            submit_review(trip, trip.passenger, 90.0)
+
+    def test_recompute_matches_incremental(self):
+        for trip, score in zip(self.trips, [70.0, 90.0, 50.0]):
+            submit_review(trip, trip.passenger, score)
+        self.driver.refresh_from_db()
+        expected = (self.driver.rating, self.driver.rating_sum, self.driver.rating_count, self.driver.rating_ewma)
+
+        DriverProfile.objects.update(rating=0, rating_sum=0, rating_count=0, rating_ewma=None)
+        self.assertEqual(recompute_driver_ratings(batch_size=2), 1)
+
+        self.driver.refresh_from_db()
+        actual = (self.driver.rating, self.driver.rating_sum, self.driver.rating_count, self.driver.rating_ewma)
+        for value, expected_value in zip(actual, expected):
+            self.assertAlmostEqual(value, expected_value)
+
+    def test_recompute_resets_driver_without_reviews(self):
+        submit_review(self.trips[0], self.trips[0].passenger, 40.0)
+        TripReview.objects.all().delete()
+
+        recompute_driver_ratings()
+
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.rating, 100.0)
+        self.assertEqual(self.driver.rating_count, 0)
+        self.assertIsNone(self.driver.rating_ewma)
+
+
+class ConcurrentReviewTest(TransactionTestCase):
+
+    def test_concurrent_reviews_are_not_lost(self):
+        driver = create_driver()
+        trips = create_completed_trips(driver, 12)
+        barrier = threading.Barrier(len(trips))
+        errors = []
+
+        def review(trip, score):
+            try:
+                barrier.wait()
+                submit_review(trip, trip.passenger, score)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=review, args=(trip, float(50 + i)))
+            for i, trip in enumerate(trips)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        driver.refresh_from_db()
+        self.assertEqual(driver.rating_count, len(trips))
+        self.assertAlmostEqual(driver.rating_sum, sum(50 + i for i in range(len(trips))))
+        self.assertAlmostEqual(driver.rating, driver.rating_sum / driver.rating_count)
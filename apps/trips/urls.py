@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import TripViewSet
+
+app_name = 'trips'
+
+router = DefaultRouter()
+router.register(r'', TripViewSet, basename='trip')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,23 @@
+from .dispatch import (
+    TripTransitionError,
+    request_trip,
+    assign_driver,
+    start_trip,
+    complete_trip,
+    cancel_trip,
+)
+from .reviews import (
+    submit_review,
+    recompute_driver_ratings,
+)
+
+__all__ = [
+    'TripTransitionError',
+    'request_trip',
+    'assign_driver',
+    'start_trip',
+    'complete_trip',
+    'cancel_trip',
+    'submit_review',
+    'recompute_driver_ratings',
+]
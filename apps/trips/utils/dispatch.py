@@ -0,0 +1,160 @@
+"""
+Жизненный цикл поездки и назначение водителя
+
+Каждый переход статуса — условный UPDATE «WHERE status = <ожидаемый>»,
+поэтому два одновременных запроса не могут выполнить один переход дважды.
+Водитель захватывается так же: строки кандидатов блокируются
+SELECT ... FOR UPDATE SKIP LOCKED (занятые другим диспетчером пропускаются),
+а флаг is_busy ставится условным UPDATE — это защищает и на СУБД без
+FOR UPDATE (SQLite).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.accounts.cache import invalidate_profile
+from apps.accounts.models import DriverProfile
+from apps.accounts.utils.driver_locations import find_nearest_drivers, mark_driver_busy
+from ..models import Trip, TripStatus
+
+
+class TripTransitionError(Exception):
+    """Поездку нельзя перевести в запрошенный статус"""
+
+
+def _transition(trip, from_statuses, to_status, **extra):
+    """Условный переход статуса; обновляет и объект trip"""
+    updated = Trip.objects.filter(
+        pk=trip.pk,
+        status__in=from_statuses
+    ).update(status=to_status, **extra)
+
+    if not updated:
+        raise TripTransitionError(
+            f"Поездку нельзя перевести в статус «{TripStatus(to_status).label}»"
+        )
+
+    trip.status = to_status
+    for field, value in extra.items():
+        setattr(trip, field, value)
+
+
+def _release_driver(driver, completed=False):
+    fields = {'is_busy': False}
+    if completed:
+        fields['total_trips'] = F('total_trips') + 1
+    DriverProfile.objects.filter(pk=driver.pk).update(**fields)
+    if completed:
+        invalidate_profile(driver.user_id)
+
+
+def request_trip(passenger, pickup_latitude, pickup_longitude, passengers=1, **extra):
+    """Создать заявку и сразу попытаться назначить ближайшего водителя"""
+    trip = Trip.objects.create(
+        passenger=passenger,
+        pickup_latitude=pickup_latitude,
+        pickup_longitude=pickup_longitude,
+        passengers=passengers,
+        **extra
+    )
+    assign_driver(trip)
+    return trip
+
+
+def find_candidates(trip):
+    """id ближайших подходящих водителей, от ближнего к дальнему"""
+    nearest = find_nearest_drivers(
+        trip.pickup_latitude,
+        trip.pickup_longitude,
+        limit=settings.TRIP_DISPATCH_CANDIDATES,
+        passengers=trip.passengers,
+    )
+    return [profile.pk for profile, _ in nearest]
+
+
+def assign_driver(trip, candidate_ids=None):
+    """
+    Назначить на заявку первого свободного водителя из candidate_ids
+    (по умолчанию — ближайшие по индексу). Возвращает id водителя или None.
+    """
+    if candidate_ids is None:
+        candidate_ids = find_candidates(trip)
+    if not candidate_ids:
+        return None
+
+    with transaction.atomic():
+        free = set(
+            DriverProfile.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(
+                pk__in=candidate_ids,
+                is_busy=False,
+                verified_driver=True,
+                car__is_active=True,
+                car__max_passengers__gte=trip.passengers,
+            )
+            .values_list('pk', flat=True)
+        )
+
+        driver_id = None
+        for candidate_id in candidate_ids:
+            if candidate_id not in free:
+                continue
+            if DriverProfile.objects.filter(pk=candidate_id, is_busy=False).update(is_busy=True):
+                driver_id = candidate_id
+                break
+
+        if driver_id is None:
+            return None
+
+        # Если заявку успели отменить, откат транзакции освободит водителя
+        _transition(
+            trip,
+            [TripStatus.REQUESTED],
+            TripStatus.ASSIGNED,
+            driver_id=driver_id,
+            assigned_at=timezone.now()
+        )
+
+    mark_driver_busy(driver_id)
+    return driver_id
+
+
+def start_trip(trip):
+    _transition(trip, [TripStatus.ASSIGNED], TripStatus.STARTED, started_at=timezone.now())
+
+
+def complete_trip(trip):
+    """Завершить поездку, освободить водителя и увеличить счётчик поездок"""
+    with transaction.atomic():
+        _transition(trip, [TripStatus.STARTED], TripStatus.COMPLETED, completed_at=timezone.now())
+        # Профиль водителя могли удалить во время поездки (driver = NULL)
+        trip.driver = (
+            DriverProfile.objects
+            .filter(trips__pk=trip.pk)
+            .only('pk', 'user_id')
+            .first()
+        )
+        if trip.driver is not None:
+            _release_driver(trip.driver, completed=True)
+
+
+def cancel_trip(trip):
+    """Отменить заявку до начала поездки"""
+    with transaction.atomic():
+        _transition(
+            trip,
+            [TripStatus.REQUESTED, TripStatus.ASSIGNED],
+            TripStatus.CANCELLED,
+            cancelled_at=timezone.now()
+        )
+        # После отмены назначение невозможно, поэтому водитель уже не изменится
+        trip.driver = (
+            DriverProfile.objects
+            .filter(trips__pk=trip.pk)
+            .only('pk', 'user_id')
+            .first()
+        )
+        if trip.driver is not None:
+            _release_driver(trip.driver)
@@ -0,0 +1,97 @@
+"""
+Отзывы о поездках и агрегаты рейтинга водителя
+
+Отзыв вставляется отдельной строкой, а агрегаты водителя (сумма, количество,
+средний и сглаженный рейтинг) меняются одним UPDATE с F()-выражениями —
+без чтения в Python и без блокировок дольше одного оператора.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from apps.accounts.cache import invalidate_profile
+from apps.accounts.models import DriverProfile
+from ..models import TripReview, TripStatus
+from .dispatch import TripTransitionError
+
+
+def submit_review(trip, author, score, comment=''):
+    """Оставить отзыв о завершённой поездке (один на поездку)"""
+    if trip.status != TripStatus.COMPLETED or trip.driver_id is None:
+        raise TripTransitionError('Оценить можно только завершённую поездку')
+
+    try:
+        with transaction.atomic():
+            review = TripReview.objects.create(
+                trip=trip,
+                driver_id=trip.driver_id,
+                author=author,
+                score=score,
+                comment=comment
+            )
+            trip.driver.update_rating(score)
+    except IntegrityError:
+        raise TripTransitionError('Поездка уже оценена')
+
+    return review
+
+
+def recompute_driver_ratings(batch_size=1000):
+    """
+    Пересчитать агрегаты рейтинга всех водителей по таблице отзывов.
+    Отзывы читаются одним потоковым запросом, упорядоченным по водителю,
+    обновления пишутся пачками через bulk_update.
+    Возвращает количество обновлённых водителей.
+    """
+    alpha = settings.DRIVER_RATING_EWMA_ALPHA
+    fields = ['rating', 'rating_sum', 'rating_count', 'rating_ewma']
+    default_rating = DriverProfile._meta.get_field('rating').default
+
+    batch = []
+    updated = 0
+
+    def flush():
+        nonlocal updated
+        if batch:
+            DriverProfile.objects.bulk_update(batch, fields)
+            invalidate_profile(*(profile.user_id for profile in batch))
+            updated += len(batch)
+            batch.clear()
+
+    def add(driver_id, user_id, total, count, ewma):
+        batch.append(DriverProfile(
+            pk=driver_id,
+            user_id=user_id,
+            rating=total / count,
+            rating_sum=total,
+            rating_count=count,
+            rating_ewma=ewma,
+        ))
+        if len(batch) >= batch_size:
+            flush()
+
+    reviews = (
+        TripReview.objects
+        .order_by('driver_id', 'created_at', 'id')
+        .values_list('driver_id', 'driver__user_id', 'score')
+        .iterator(chunk_size=batch_size)
+    )
+
+    current, current_user, total, count, ewma = None, None, 0.0, 0, None
+    for driver_id, user_id, score in reviews:
+        if driver_id != current:
+            if current is not None:
+                add(current, current_user, total, count, ewma)
+            current, current_user, total, count, ewma = driver_id, user_id, 0.0, 0, None
+        total += score
+        count += 1
+        ewma = score if ewma is None else ewma * (1 - alpha) + score * alpha
+    if current is not None:
+        add(current, current_user, total, count, ewma)
+    flush()
+
+    # Водители без отзывов возвращаются к начальному рейтингу
+    stale = DriverProfile.objects.filter(rating_count__gt=0).exclude(reviews__isnull=False)
+    stale_users = list(stale.values_list('user_id', flat=True))
+    updated += stale.update(rating=default_rating, rating_sum=0.0, rating_count=0, rating_ewma=None)
+    invalidate_profile(*stale_users)
+    return updated
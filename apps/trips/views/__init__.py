@@ -0,0 +1,7 @@
+from .trip_views import (
+    TripViewSet,
+)
+
+__all__ = [
+    'TripViewSet',
+]
@@ -0,0 +1,142 @@
+from django.db.models import Q
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+from ..models import Trip
+from ..serializers import TripSerializer, TripCreateSerializer, TripReviewSerializer
+from ..utils import (
+    TripTransitionError,
+    request_trip,
+    assign_driver,
+    start_trip,
+    complete_trip,
+    cancel_trip,
+    submit_review,
+)
+
+
+class TripViewSet(mixins.CreateModelMixin,
+                  mixins.ListModelMixin,
+                  mixins.RetrieveModelMixin,
+                  viewsets.GenericViewSet):
+    """Поездки текущего пользователя — как пассажира или как водителя"""
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return TripCreateSerializer
+        if self.action == 'review':
+            return TripReviewSerializer
+        return TripSerializer
+
+    def get_queryset(self):
+        user_id = self.request.user.pk
+        return (
+            Trip.objects
+            .filter(Q(passenger_id=user_id) | Q(driver__user_id=user_id))
+            .select_related('passenger', 'driver__user')
+        )
+
+    def run_transition(self, trip, transition, *args):
+        try:
+            transition(trip, *args)
+        except TripTransitionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TripSerializer(trip).data)
+
+    def is_trip_driver(self, trip):
+        return trip.driver is not None and trip.driver.user_id == self.request.user.pk
+
+    @extend_schema(
+        request=TripCreateSerializer,
+        responses=TripSerializer,
+        description="Заказать поездку. Ближайший свободный водитель назначается сразу, если он есть"
+    )
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        trip = request_trip(request.user, **serializer.validated_data)
+        return Response(TripSerializer(trip).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        request=None,
+        description="Повторить поиск водителя для ожидающей заявки"
+    )
+    @action(detail=True, methods=['post'])
+    def assign(self, request, pk=None):
+        trip = self.get_object()
+        if trip.passenger_id != request.user.pk:
+            return Response({
+                'error': 'Искать водителя может только пассажир'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            driver_id = assign_driver(trip)
+        except TripTransitionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if driver_id is None:
+            return Response({
+                'error': 'Свободных водителей рядом нет'
+            }, status=status.HTTP_409_CONFLICT)
+        return Response(TripSerializer(trip).data)
+
+    @extend_schema(
+        request=None,
+        description="Начать поездку (водитель)"
+    )
+    @action(detail=True, methods=['post'])
+    def start(self, request, pk=None):
+        trip = self.get_object()
+        if not self.is_trip_driver(trip):
+            return Response({
+                'error': 'Начать поездку может только назначенный водитель'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return self.run_transition(trip, start_trip)
+
+    @extend_schema(
+        request=None,
+        description="Завершить поездку (водитель)"
+    )
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        trip = self.get_object()
+        if not self.is_trip_driver(trip):
+            return Response({
+                'error': 'Завершить поездку может только назначенный водитель'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return self.run_transition(trip, complete_trip)
+
+    @extend_schema(
+        request=None,
+        description="Отменить поездку до её начала"
+    )
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        return self.run_transition(self.get_object(), cancel_trip)
+
+    @extend_schema(
+        request=TripReviewSerializer,
+        responses=TripReviewSerializer,
+        description="Оценить водителя после завершённой поездки (пассажир)"
+    )
+    @action(detail=True, methods=['post'])
+    def review(self, request, pk=None):
+        trip = self.get_object()
+        if trip.passenger_id != request.user.pk:
+            return Response({
+                'error': 'Оценить поездку может только пассажир'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            review = submit_review(trip, request.user, **serializer.validated_data)
+        except TripTransitionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(TripReviewSerializer(review).data, status=status.HTTP_201_CREATED)
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
 
     'apps.accounts',
+    'apps.trips',
 ]
 
 MIDDLEWARE = [
@@ -77,22 +78,86 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# --- Cache ---
+# Redis в продакшене (REDIS_URL=redis://host:6379/0), иначе память процесса
+REDIS_URL = env('REDIS_URL', default=None)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'porterkg',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'porterkg',
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+        }
+    }
+
+PROFILE_CACHE_TIMEOUT = env.int('PROFILE_CACHE_TIMEOUT', default=300)
+PROFILE_CACHE_VERSION_TIMEOUT = 24 * 60 * 60  # дольше данных, чтобы версия не терялась раньше
+
 # --- Custom User Model ---
 AUTH_USER_MODEL = "accounts.User"
 
+# --- Password Hashing ---
+# pbkdf2 | scrypt | argon2 (для argon2 нужен пакет argon2-cffi).
+# Хеши со старым алгоритмом или стоимостью обновляются при входе.
+PASSWORD_HASHER = env('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', default=870000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int('PASSWORD_SCRYPT_BLOCK_SIZE', default=8)
+PASSWORD_SCRYPT_PARALLELISM = env.int('PASSWORD_SCRYPT_PARALLELISM', default=1)
+PASSWORD_ARGON2_TIME_COST = env.int('PASSWORD_ARGON2_TIME_COST', default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int('PASSWORD_ARGON2_MEMORY_COST', default=102400)  # КиБ
+PASSWORD_ARGON2_PARALLELISM = env.int('PASSWORD_ARGON2_PARALLELISM', default=8)
+
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'apps.accounts.hashers.TunablePBKDF2PasswordHasher',
+    'scrypt': 'apps.accounts.hashers.TunableScryptPasswordHasher',
+    'argon2': 'apps.accounts.hashers.TunableArgon2PasswordHasher',
+}
+# Выбранный алгоритм первым, остальные — для проверки уже сохранённых хешей
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+
 # --- DRF Settings ---
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.accounts.pagination.EstimatedCountPagination",
     "PAGE_SIZE": 20,
+    # Лимиты эндпоинтов аутентификации, см. apps.accounts.throttling
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": env.str('THROTTLE_LOGIN_IP', default='30/m'),
+        "login_email": env.str('THROTTLE_LOGIN_EMAIL', default='10/15m'),
+        "register_ip": env.str('THROTTLE_REGISTER_IP', default='10/h'),
+        "password_reset_ip": env.str('THROTTLE_PASSWORD_RESET_IP', default='10/h'),
+        "password_reset_email": env.str('THROTTLE_PASSWORD_RESET_EMAIL', default='3/h'),
+        "google_auth_ip": env.str('THROTTLE_GOOGLE_AUTH_IP', default='30/m'),
+    },
+    "NUM_PROXIES": env.int('NUM_PROXIES', default=None),
 }
 
+# --- Pagination ---
+# Выборки больше порога считаются приблизительно, см. apps.accounts.pagination
+ESTIMATED_COUNT_THRESHOLD = env.int('ESTIMATED_COUNT_THRESHOLD', default=10000)
+ESTIMATED_COUNT_REFRESH = 5 * 60  # секунд до фонового пересчёта закэшированного количества
+ESTIMATED_COUNT_TIMEOUT = 24 * 60 * 60
+ESTIMATED_COUNT_WORKERS = 1  # 0 — пересчитывать синхронно
+
 # --- JWT Settings ---
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -114,11 +179,65 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.PorterTokenRefreshSerializer',
 }
 
+# --- JWT Blacklist ---
+TOKEN_BLACKLIST_SYNC_INTERVAL = env.int('TOKEN_BLACKLIST_SYNC_INTERVAL', default=5)  # макс. задержка без общего кэша
+TOKEN_BLACKLIST_REBUILD_INTERVAL = 60 * 60  # перестройка фильтра без истёкших токенов
+TOKEN_BLACKLIST_BLOOM_CAPACITY = 100000
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+TOKEN_PURGE_BATCH_SIZE = 1000  # ширина окна id для purge_expired_tokens
+TOKEN_PURGE_SLEEP = 0.05
+TOKEN_PURGE_INTERVAL = 60 * 60
+
+# --- Email Queue ---
+EMAIL_QUEUE_BATCH_SIZE = env.int('EMAIL_QUEUE_BATCH_SIZE', default=50)
+EMAIL_QUEUE_MAX_ATTEMPTS = env.int('EMAIL_QUEUE_MAX_ATTEMPTS', default=5)
+EMAIL_QUEUE_RETRY_DELAY = 60  # секунд, удваивается с каждой попыткой
+EMAIL_QUEUE_MAX_RETRY_DELAY = 60 * 60
+EMAIL_QUEUE_LOCK_TIMEOUT = 10 * 60
+EMAIL_QUEUE_POLL_INTERVAL = 2.0
+
+# --- SMTP Connection Pool ---
+EMAIL_POOL_SIZE = env.int('EMAIL_POOL_SIZE', default=4)
+EMAIL_POOL_MAX_MESSAGES = env.int('EMAIL_POOL_MAX_MESSAGES', default=100)
+EMAIL_POOL_IDLE_TIMEOUT = env.int('EMAIL_POOL_IDLE_TIMEOUT', default=60)  # секунд
+EMAIL_POOL_PING_AFTER = 10  # проверять соединение NOOP после такого простоя
+
+# --- Uploads ---
+IMAGE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+IMAGE_UPLOAD_CHUNK_SIZE = 64 * 1024  # памяти на одну загрузку, остальное во временном файле
+IMAGE_BLOB_SWEEP_GRACE_PERIOD = 24 * 60 * 60  # файлы без ссылок моложе не удаляются
+
+# --- Car Images ---
+CAR_IMAGE_WORKERS = env.int('CAR_IMAGE_WORKERS', default=2)  # 0 — обработка синхронно после коммита
+CAR_IMAGE_VARIANTS = {
+    'thumbnail': (320, 320),
+    'medium': (1280, 1280),
+}
+CAR_IMAGE_WEBP_QUALITY = 80
+CAR_IMAGE_BATCH_MAX_FILES = 10  # файлов в одном запросе upload-images
+
+# --- Driver Locations ---
+DRIVER_INDEX_CELL_SIZE = 0.01  # градусов, ~1 км
+DRIVER_INDEX_SYNC_INTERVAL = 2  # секунд между дозагрузками позиций из БД
+DRIVER_LOCATION_TTL = 120  # позиции старше считаются устаревшими
+DRIVER_SEARCH_RADIUS_KM = 15
+DRIVER_LOCATION_FLUSH_INTERVAL_MS = env.int('DRIVER_LOCATION_FLUSH_INTERVAL_MS', default=1000)  # 0 — писать сразу
+DRIVER_LOCATION_FLUSH_MAX_PINGS = env.int('DRIVER_LOCATION_FLUSH_MAX_PINGS', default=1000)
+
+# --- Trips ---
+TRIP_DISPATCH_CANDIDATES = 10  # сколько ближайших водителей пробовать при назначении
+DRIVER_RATING_EWMA_ALPHA = 0.1  # вес новой оценки в сглаженном рейтинге
+
 # --- Google OAuth2 Settings ---
 GOOGLE_OAUTH2_CLIENT_ID = env('GOOGLE_OAUTH2_CLIENT_ID', default='')
 GOOGLE_OAUTH2_CLIENT_SECRET = env('GOOGLE_OAUTH2_CLIENT_SECRET', default='')
+GOOGLE_OAUTH2_CERTS_TIMEOUT = 5
+GOOGLE_OAUTH2_CERTS_DEFAULT_MAX_AGE = 60 * 60  # если в ответе нет Cache-Control
+GOOGLE_OAUTH2_CERTS_RETRY = 60  # минимальный интервал внеочередных загрузок
+GOOGLE_OAUTH2_CLOCK_SKEW = 10
 
 # --- Spectacular Settings ---
 SPECTACULAR_SETTINGS = {
@@ -2,6 +2,9 @@ from .base import *
 
 DEBUG = False
 
+# Дешёвое хеширование паролей в тестах
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', default=10000)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
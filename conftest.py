@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+# Тесты запускаются с настройками development (pytest.ini), но хешировать
+# пароли с полной стоимостью им незачем. Процессы пула хеширования
+# получают значение через окружение.
+TEST_PBKDF2_ITERATIONS = 10000
+os.environ.setdefault('PASSWORD_PBKDF2_ITERATIONS', str(TEST_PBKDF2_ITERATIONS))
+
+
+@pytest.fixture(autouse=True)
+def cheap_password_hashing(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = TEST_PBKDF2_ITERATIONS